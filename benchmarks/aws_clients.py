@@ -0,0 +1,94 @@
+"""
+Benchmark for the shared AWS client and secret registry.
+
+Times the cold path (new boto3 client and Secrets Manager call, as before) against the
+warm path served from the registry, the way `setup_mlflow` and the Lambda handlers
+use it on warm invocations. Runs against real AWS credentials, or against moto when
+installed and `--moto` is given.
+
+Example:
+    python -m benchmarks.aws_clients --repeat 20 --moto
+"""
+
+import argparse
+import contextlib
+import json
+import statistics
+import time
+
+import boto3
+
+from src.components import aws_clients
+
+SECRET_NAME = "mlflow-basic-auth"
+REGION = "eu-central-1"
+
+
+def time_calls(func, repeat: int) -> list:
+    """
+    Time repeated calls of a function.
+
+    Returns:
+        list: Elapsed seconds per call.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def uncached_setup():
+    """
+    Previous behaviour: a new session and client, then a Secrets Manager call.
+    """
+    session = boto3.session.Session()
+    client = session.client(service_name="secretsmanager", region_name=REGION)
+    json.loads(client.get_secret_value(SecretId=SECRET_NAME)["SecretString"])
+    boto3.client("s3")
+    boto3.client("sns")
+
+
+def cached_setup():
+    """
+    Registry behaviour used by setup_mlflow, DataManagement and monitoring.
+    """
+    json.loads(aws_clients.get_secret(SECRET_NAME, region_name=REGION))
+    aws_clients.get_client("s3")
+    aws_clients.get_client("sns")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--moto", action="store_true", help="Use moto's mock AWS")
+    args = parser.parse_args()
+
+    backend = contextlib.nullcontext()
+    if args.moto:
+        from moto import mock_aws  # pylint: disable=import-outside-toplevel
+
+        backend = mock_aws()
+
+    with backend:
+        if args.moto:
+            boto3.client("secretsmanager", region_name=REGION).create_secret(
+                Name=SECRET_NAME,
+                SecretString=json.dumps({"username": "u", "password": "p"}),
+            )
+
+        uncached = time_calls(uncached_setup, args.repeat)
+        aws_clients.clear()
+        cold = time_calls(cached_setup, 1)[0]
+        warm = time_calls(cached_setup, args.repeat)
+
+    print(f"{'path':>10} {'median [ms]':>12}")
+    print(f"{'uncached':>10} {statistics.median(uncached) * 1000:>12.2f}")
+    print(f"{'cold':>10} {cold * 1000:>12.2f}")
+    print(f"{'warm':>10} {statistics.median(warm) * 1000:>12.2f}")
+    print(aws_clients.stats())
+
+
+if __name__ == "__main__":
+    main()
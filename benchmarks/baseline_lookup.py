@@ -0,0 +1,124 @@
+"""
+Benchmark for finding and loading the monitoring baseline statistics.
+
+Creates a local MLflow file store with one run carrying baseline statistics followed
+by `--runs` newer runs without them, then counts the MLflow client calls and measures
+the time of:
+
+- legacy: searching 50 runs and listing artifacts run by run (the previous lookup),
+- cold: the tagged search plus a download into the local cache,
+- warm: a second invocation served from the cached run id and the cached file.
+
+On a remote tracking server every call is at least one HTTP round trip.
+
+Example:
+    python -m benchmarks.baseline_lookup --runs 30
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+import mlflow
+from mlflow.tracking import MlflowClient
+
+from src.components.drift_stats import BASELINE_ARTIFACT, BASELINE_TAG
+from src.lambda_functions import monitoring
+
+CLIENT_CALLS = ("get_experiment_by_name", "search_runs", "list_artifacts")
+
+
+def legacy_lookup():
+    """
+    Previous `get_latest_run_with_baseline`: artifact listing of the 50 latest runs.
+    """
+    client = MlflowClient()
+    experiment_id = client.get_experiment_by_name("Default").experiment_id
+    runs = client.search_runs(
+        experiment_ids=[experiment_id],
+        filter_string="attributes.status = 'FINISHED'",
+        order_by=["start_time DESC"],
+        max_results=50,
+    )
+    for run in runs:
+        if BASELINE_ARTIFACT in [
+            f.path for f in client.list_artifacts(run.info.run_id)
+        ]:
+            return run.info.run_id
+    raise Exception("No baseline run")
+
+
+def invocation():
+    run_id = monitoring.get_latest_run_with_baseline()
+    return monitoring.load_baseline_stats_from_mlflow(run_id)
+
+
+def counted(func) -> tuple:
+    """
+    Run `func` and return (MLflow calls, milliseconds).
+    """
+    calls = []
+
+    def counting(name, method):
+        def wrapper(*args, **kwargs):
+            calls.append(name)
+            return method(*args, **kwargs)
+
+        return wrapper
+
+    patches = [
+        mock.patch.object(
+            MlflowClient, name, counting(name, getattr(MlflowClient, name))
+        )
+        for name in CLIENT_CALLS
+    ]
+    patches.append(
+        mock.patch.object(
+            mlflow.artifacts,
+            "download_artifacts",
+            counting("download_artifacts", mlflow.artifacts.download_artifacts),
+        )
+    )
+    with contextlib.ExitStack() as stack:
+        for patch in patches:
+            stack.enter_context(patch)
+        start = time.perf_counter()
+        func()
+        return len(calls), (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp()
+    mlflow.set_tracking_uri(f"file://{root}/mlruns")
+    monitoring.BASELINE_CACHE_DIR = os.path.join(root, "cache")
+
+    with mlflow.start_run():
+        path = os.path.join(root, BASELINE_ARTIFACT)
+        with open(path, "w") as f:
+            json.dump({"mean": [0.0], "std": [1.0], "feature_names": ["UIn"]}, f)
+        mlflow.log_artifact(path)
+        mlflow.set_tag(BASELINE_TAG, "true")
+    for _ in range(args.runs):
+        with mlflow.start_run():
+            mlflow.log_param("n_samples_train", 1)
+
+    print(f"{'lookup':>8} {'MLflow calls':>13} {'time [ms]':>10}")
+    for name, func in (
+        ("legacy", legacy_lookup),
+        ("cold", invocation),
+        ("warm", invocation),
+    ):
+        calls, elapsed = counted(func)
+        print(f"{name:>8} {calls:>13} {elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark for uploading the pre-processing split chunks to S3.
+
+Compares the previous loop (write each chunk to /tmp, `upload_file`, then a separate
+`put_object_tagging` call, one chunk after the other) with
+`DataManagement.upload_dataframes`, which serializes chunks in memory and uploads
+them concurrently with the tag set in the same PUT. Runs against the configured
+bucket with real AWS credentials, or against moto when `--moto` is given; there a
+fixed delay per request can be added to emulate the S3 round trip.
+
+Example:
+    python -m benchmarks.chunk_upload --moto --chunks 1000 --latency-ms 20
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.components import aws_clients
+from src.components.data_management import DataManagement
+
+REGION = "eu-central-1"
+
+
+def legacy_upload(data_manager, chunks, bucket, version_id):
+    """
+    Previous `process_file` upload loop.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    for df, key in chunks:
+        path = os.path.join(tmp_dir, os.path.basename(key))
+        data_manager.write_dataframe(df, path)
+        data_manager.s3_client.upload_file(path, bucket, key)
+        data_manager.s3_client.put_object_tagging(
+            Bucket=bucket,
+            Key=key,
+            Tagging={"TagSet": [{"Key": "source_raw_version_id", "Value": version_id}]},
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunks", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=10, help="Rows per chunk")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--moto", action="store_true", help="Use moto's mock AWS")
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Delay per request with moto"
+    )
+    args = parser.parse_args()
+
+    backend = contextlib.nullcontext()
+    if args.moto:
+        from moto import mock_aws  # pylint: disable=import-outside-toplevel
+
+        backend = mock_aws()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        rng.random((args.chunks * args.rows, 6)),
+        columns=["UIn", "p", "T", "rho", "U_x", "U_y"],
+    )
+    chunks = [
+        (df.iloc[i * args.rows : (i + 1) * args.rows], f"benchmark/chunk_{i+1:03d}.csv")
+        for i in range(args.chunks)
+    ]
+
+    with backend:
+        aws_clients.clear()
+        data_manager = DataManagement()
+        bucket = data_manager.management_config["s3_bucket_name"]
+        s3 = data_manager.s3_client
+        if args.moto:
+            s3.create_bucket(
+                Bucket=bucket,
+                CreateBucketConfiguration={"LocationConstraint": REGION},
+            )
+            if args.latency_ms:
+                s3.meta.events.register_first(
+                    "before-send.s3.*",
+                    lambda **kwargs: time.sleep(args.latency_ms / 1000),
+                )
+
+        print(f"{args.chunks} chunks of {args.rows} rows")
+        print(f"{'upload':>10} {'time [s]':>9} {'chunks/s':>9}")
+        for name, upload in (
+            ("legacy", lambda: legacy_upload(data_manager, chunks, bucket, "v1")),
+            (
+                "parallel",
+                lambda: data_manager.upload_dataframes(
+                    chunks, bucket, "v1", max_workers=args.workers
+                ),
+            ),
+        ):
+            start = time.perf_counter()
+            upload()
+            elapsed = time.perf_counter() - start
+            print(f"{name:>10} {elapsed:>9.2f} {args.chunks / elapsed:>9.0f}")
+
+        tags = s3.get_object_tagging(Bucket=bucket, Key=chunks[-1][1])["TagSet"]
+        assert tags == [{"Key": "source_raw_version_id", "Value": "v1"}], tags
+
+
+if __name__ == "__main__":
+    main()
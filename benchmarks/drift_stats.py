@@ -0,0 +1,117 @@
+"""
+Benchmark for the vectorized drift statistics of the monitoring Lambda.
+
+Compares the original per-feature loop (a pandas mean and one log line per feature),
+a per-feature loop computing the same statistics as the drift engine with NumPy
+histogram and quantile calls, and `drift_statistics`, which computes moments, PSI, KS
+and quantiles for all features in one pass, on prediction frames of different sizes.
+
+Example:
+    python -m benchmarks.drift_stats --rows 100000 1000000 --features 27 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.components.drift_stats import baseline_statistics, drift_statistics
+from src.logger import logging
+
+
+def legacy_compare(baseline_stats, pred_df, feature_names, drift_threshold=2.0):
+    """
+    Original `monitoring.compare_distributions`: mean z-score only, feature by feature.
+    """
+    drifted_features = []
+    for i, feat in enumerate(feature_names):
+        baseline_mean = baseline_stats["mean"][i]
+        baseline_std = baseline_stats["std"][i]
+        pred_mean = pred_df[feat].mean()
+        z_score = (
+            abs(pred_mean - baseline_mean) / (baseline_std + 1e-8)
+            if baseline_std > 0
+            else 0
+        )
+        logging.info(
+            f"Feature: {feat}, baseline_mean: {baseline_mean}, "
+            f"pred_mean: {pred_mean}, z_score: {z_score}"
+        )
+        if z_score > drift_threshold:
+            drifted_features.append(feat)
+    return drifted_features
+
+
+def looped_statistics(baseline_stats, pred_df, feature_names):
+    """
+    Moments, PSI, KS and exact quantiles computed feature by feature.
+    """
+    histogram = baseline_stats["histogram"]
+    levels = baseline_stats["quantiles"]["levels"]
+    rows = []
+    for i, feat in enumerate(feature_names):
+        values = pred_df[feat].to_numpy()
+        inner = np.linspace(
+            histogram["lo"][i], histogram["hi"][i], histogram["n_bins"] + 1
+        )
+        edges = np.concatenate([[-np.inf], inner, [np.inf]])
+        actual = np.histogram(values, edges)[0] / len(values)
+        expected = np.asarray(histogram["proportions"][i])
+        a, e = np.maximum(actual, 1e-4), np.maximum(expected, 1e-4)
+        rows.append(
+            {
+                "mean": values.mean(),
+                "std": values.std(),
+                "psi": ((a - e) * np.log(a / e)).sum(),
+                "ks": np.abs(np.cumsum(actual) - np.cumsum(expected)).max(),
+                "quantiles": np.quantile(values, levels),
+            }
+        )
+    return rows
+
+
+def timed(func) -> float:
+    """
+    Best of three wall-clock timings of `func()` in milliseconds.
+    """
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--features", type=int, nargs="+", default=[27, 200])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(
+        f"{'rows':>9} {'features':>9} {'legacy [ms]':>12} {'looped [ms]':>12} "
+        f"{'vectorized [ms]':>16} {'ms per 1M values':>17}"
+    )
+    for n_features in args.features:
+        names = [f"feature_{i}" for i in range(n_features)]
+        baseline = baseline_statistics(rng.normal(size=(50_000, n_features)), names)
+        for n_rows in args.rows:
+            pred_df = pd.DataFrame(
+                rng.normal(0.1, 1.2, size=(n_rows, n_features)), columns=names
+            )
+            legacy = timed(lambda: legacy_compare(baseline, pred_df, names))
+            looped = timed(lambda: looped_statistics(baseline, pred_df, names))
+            vectorized = timed(
+                lambda: drift_statistics(baseline, pred_df[names].to_numpy())
+            )
+            print(
+                f"{n_rows:>9} {n_features:>9} {legacy:>12.1f} {looped:>12.1f} "
+                f"{vectorized:>16.1f} "
+                f"{vectorized / (n_rows * n_features / 1e6):>17.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
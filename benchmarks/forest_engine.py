@@ -0,0 +1,74 @@
+"""
+Benchmark for the compiled tree-ensemble inference engine.
+
+Compares sklearn's `predict_proba` with `CompiledForest.predict_proba` on a forest
+shaped like the production model, for single-row requests and large batches, and
+checks that both return identical probabilities.
+
+Example:
+    python -m benchmarks.forest_engine --rows 1 100 100000 --trees 10 --max-depth 5
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+from src.sagemaker.forest_engine import CompiledForest
+
+
+def per_call(func, x, min_seconds: float) -> float:
+    """
+    Median seconds per call of `func(x)`, repeated for at least `min_seconds`.
+    """
+    timings = []
+    deadline = time.perf_counter() + min_seconds
+    while not timings or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        func(x)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 100, 100_000])
+    parser.add_argument("--trees", type=int, default=10)
+    parser.add_argument("--max-depth", type=int, default=5)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    x, y = make_classification(
+        n_samples=max(args.rows + [20_000]),
+        n_features=27,
+        n_informative=10,
+        n_classes=3,
+        random_state=0,
+    )
+    model = RandomForestClassifier(
+        n_estimators=args.trees, max_depth=args.max_depth, random_state=42
+    ).fit(x[:20_000], y[:20_000])
+
+    start = time.perf_counter()
+    compiled = CompiledForest(model)
+    compile_time = time.perf_counter() - start
+    print(f"compiled {compiled.n_trees} trees in {compile_time * 1000:.1f} ms")
+
+    print(f"{'rows':>8} {'sklearn [ms]':>13} {'compiled [ms]':>14} {'speedup':>8}")
+    for n_rows in args.rows:
+        batch = x[:n_rows]
+        np.testing.assert_array_equal(
+            compiled.predict_proba(batch), model.predict_proba(batch)
+        )
+        sklearn_time = per_call(model.predict_proba, batch, args.seconds)
+        compiled_time = per_call(compiled.predict_proba, batch, args.seconds)
+        print(
+            f"{n_rows:>8} {sklearn_time * 1000:>13.3f} {compiled_time * 1000:>14.3f} "
+            f"{sklearn_time / compiled_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
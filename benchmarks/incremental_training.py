@@ -0,0 +1,88 @@
+"""
+Benchmark for incremental (warm-start) retraining.
+
+Simulates a sequence of training runs where each run brings a new batch of data.
+The full strategy refits a forest on all data accumulated so far, as a full retrain
+does; the incremental strategy adds trees fitted on the new batch to the previous
+forest, as `ModelTrainer.extend_model` does. Reports the training time of each run
+and the macro F1 of both models on a common test set.
+
+Example:
+    python -m benchmarks.incremental_training --batch-size 20000 --runs 4
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import f1_score
+from sklearn.model_selection import train_test_split
+
+PARAMS = {
+    "n_estimators": 10,
+    "max_depth": 5,
+    "min_samples_split": 10,
+    "min_samples_leaf": 5,
+    "max_features": 0.5,
+    "bootstrap": True,
+    "random_state": 42,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument("--runs", type=int, default=4)
+    parser.add_argument("--trees", type=int, default=5, help="Trees added per run")
+    args = parser.parse_args()
+
+    x, y = make_classification(
+        n_samples=args.batch_size * (args.runs + 1) * 5 // 4,
+        n_features=27,
+        n_informative=10,
+        n_classes=3,
+        random_state=0,
+    )
+    x_pool, x_test, y_pool, y_test = train_test_split(
+        x, y, test_size=0.2, stratify=y, random_state=0
+    )
+    batches = [
+        (x_pool[i : i + args.batch_size], y_pool[i : i + args.batch_size])
+        for i in range(0, args.batch_size * (args.runs + 1), args.batch_size)
+    ]
+
+    # Run 0 is the initial full training both strategies start from
+    incremental = RandomForestClassifier(**PARAMS).fit(*batches[0])
+
+    print(
+        f"{'run':>4} {'rows':>8} {'full [s]':>9} {'incr [s]':>9} "
+        f"{'full F1':>8} {'incr F1':>8} {'trees':>6}"
+    )
+    for run in range(1, args.runs + 1):
+        x_seen = np.concatenate([b[0] for b in batches[: run + 1]])
+        y_seen = np.concatenate([b[1] for b in batches[: run + 1]])
+
+        start = time.perf_counter()
+        full = RandomForestClassifier(**PARAMS).fit(x_seen, y_seen)
+        full_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        incremental.set_params(
+            warm_start=True, n_estimators=incremental.n_estimators + args.trees
+        )
+        incremental.fit(*batches[run])
+        incremental.set_params(warm_start=False)
+        incr_time = time.perf_counter() - start
+
+        full_f1 = f1_score(y_test, full.predict(x_test), average="macro")
+        incr_f1 = f1_score(y_test, incremental.predict(x_test), average="macro")
+        print(
+            f"{run:>4} {len(x_seen):>8} {full_time:>9.3f} {incr_time:>9.3f} "
+            f"{full_f1:>8.4f} {incr_f1:>8.4f} {incremental.n_estimators:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
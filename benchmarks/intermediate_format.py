@@ -0,0 +1,98 @@
+"""
+Benchmark for the intermediate artifact format.
+
+Compares bytes stored and parse time of CSV and Parquet for the tables written to
+splits/, simulated/ and combined/ by the pipeline stages.
+
+Example:
+    python -m benchmarks.intermediate_format --rows 100000 --chunk-size 10
+"""
+
+import argparse
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.transform_data import make_sheet
+from src.components.data_transformation import transform_data
+from src.components.table_io import read_table, write_table
+
+OUTPUTS = {"p": 2, "magU": 2}
+
+
+def simulate(splits: pd.DataFrame, seed: int = 42) -> pd.DataFrame:
+    """
+    Append synthetic probe outputs shaped like `OpenFoamHandler.simulate` results.
+
+    Probe values are strings, as they are when read from the probe files.
+
+    Args:
+        splits (pd.DataFrame): Transformed input rows.
+        seed (int, optional): Random seed. Defaults to 42.
+
+    Returns:
+        pd.DataFrame: The input rows with OUT_<field>_<probe> columns.
+    """
+    rng = np.random.default_rng(seed)
+    simulated = splits.copy()
+    for field, n_probes in OUTPUTS.items():
+        for probe in range(1, n_probes + 1):
+            values = rng.random(len(splits)) * 10
+            simulated[f"OUT_{field}_{probe}"] = [f"{v:.6g}" for v in values]
+    return simulated
+
+
+def measure(df: pd.DataFrame, file_format: str, name: str) -> tuple:
+    """
+    Serialize a table in memory and time parsing it back.
+
+    Returns:
+        tuple: (bytes stored, parse seconds)
+    """
+    buffer = io.BytesIO()
+    write_table(df, buffer, file_format)
+    payload = buffer.getvalue()
+
+    start = time.perf_counter()
+    read_table(io.BytesIO(payload), f"{name}.{file_format}")
+    return len(payload), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=10,
+        help="Rows per split chunk, as in .cfg/lambda/pre_processing.yaml",
+    )
+    args = parser.parse_args()
+
+    splits = transform_data(make_sheet(args.rows))
+    simulated = simulate(splits)
+    chunk = simulated.iloc[: args.chunk_size]
+    # Per-file tables for splits/ and simulated/, the full run for combined/
+    stages = {
+        "splits": splits.iloc[: args.chunk_size],
+        "simulated": chunk,
+        "combined": simulated,
+    }
+
+    print(
+        f"{'stage':>10} {'rows':>9} {'csv [B]':>12} {'parquet [B]':>12} "
+        f"{'csv [ms]':>10} {'parquet [ms]':>13}"
+    )
+    for stage, df in stages.items():
+        csv_bytes, csv_time = measure(df, "csv", stage)
+        parquet_bytes, parquet_time = measure(df, "parquet", stage)
+        print(
+            f"{stage:>10} {len(df):>9} {csv_bytes:>12} {parquet_bytes:>12} "
+            f"{csv_time * 1000:>10.2f} {parquet_time * 1000:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark for the Optuna hyperparameter search in ModelTrainer.
+
+Runs the original serial search (one trial at a time, folds in sequence, no pruning)
+and the parallel search with concurrent folds and median pruning on the same
+synthetic data, and reports the wall-clock time each needs to reach the best CV F1
+of the serial search.
+
+Example:
+    python -m benchmarks.optuna_search --samples 20000 --trials 100
+"""
+
+import argparse
+import time
+
+import numpy as np
+import optuna
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+from src.sagemaker.train import ModelTrainer, TrainTestData
+
+
+def make_data(n_samples: int, seed: int = 0) -> TrainTestData:
+    """
+    Build a synthetic 3-class problem shaped like the combined simulation results.
+    """
+    X, y = make_classification(
+        n_samples=n_samples,
+        n_features=27,
+        n_informative=10,
+        n_classes=3,
+        random_state=seed,
+    )
+    x_train, x_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+    return TrainTestData(
+        x_train, x_test, y_train, y_test, [f"f{i}" for i in range(X.shape[1])]
+    )
+
+
+def legacy_objective(data: TrainTestData):
+    """
+    Original objective: the five folds are fitted one after another.
+    """
+
+    def objective(trial):
+        params = {
+            "n_estimators": trial.suggest_int("n_estimators", 2, 10),
+            "max_depth": trial.suggest_int("max_depth", 2, 5),
+            "min_samples_split": trial.suggest_int("min_samples_split", 2, 30),
+            "min_samples_leaf": trial.suggest_int("min_samples_leaf", 1, 15),
+            "max_features": trial.suggest_float("max_features", 0.1, 1),
+            "bootstrap": trial.suggest_categorical("bootstrap", [True, False]),
+            "random_state": 42,
+        }
+        skf = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+        f1_scores = []
+        for train_idx, val_idx in skf.split(data.x_train, data.y_train):
+            model = RandomForestClassifier(**params)
+            model.fit(data.x_train[train_idx], data.y_train[train_idx])
+            preds = model.predict(data.x_train[val_idx])
+            f1_scores.append(f1_score(data.y_train[val_idx], preds, average="macro"))
+        return np.mean(f1_scores)
+
+    return objective
+
+
+class TimeToTarget:
+    """
+    Optuna callback recording when the best value first reaches a target.
+    """
+
+    def __init__(self, target: float, stop: bool):
+        self.target = target
+        self.stop = stop
+        self.start = time.perf_counter()
+        self.reached_after = None
+
+    def __call__(self, study, trial):
+        try:
+            best = study.best_value
+        except ValueError:
+            return
+        if self.reached_after is None and best >= self.target:
+            self.reached_after = time.perf_counter() - self.start
+            if self.stop:
+                study.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=20_000)
+    parser.add_argument("--trials", type=int, default=100)
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.002,
+        help="F1 below the serial best that still counts as reaching it",
+    )
+    args = parser.parse_args()
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    data = make_data(args.samples)
+
+    print(f"{'seed':>5} {'target F1':>10} {'serial [s]':>11} {'parallel [s]':>13}")
+    for seed in args.seeds:
+        serial = optuna.create_study(
+            direction="maximize", sampler=optuna.samplers.TPESampler(seed=seed)
+        )
+        start = time.perf_counter()
+        serial.optimize(legacy_objective(data), n_trials=args.trials)
+        serial_total = time.perf_counter() - start
+        target = serial.best_value - args.tolerance
+
+        # Time at which the serial search itself first reached the target
+        best, serial_reached = -np.inf, serial_total
+        for trial in serial.trials:
+            best = max(best, trial.value)
+            if best >= target:
+                serial_reached = (
+                    trial.datetime_complete - serial.trials[0].datetime_start
+                ).total_seconds()
+                break
+
+        trainer = ModelTrainer(data, n_trials=args.trials)
+        parallel_timer = TimeToTarget(target, stop=True)
+        trainer.run_study(callbacks=[parallel_timer])
+        parallel = parallel_timer.reached_after
+
+        print(
+            f"{seed:>5} {target:>10.4f} {serial_reached:>11.2f} "
+            f"{parallel if parallel is not None else float('nan'):>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark for rendering the training visualizations off the critical path.
+
+Measures how long `ModelTrainer.create_visualizations` blocks the training run before
+the model can be logged and promoted, and how long until all plots are written, with
+inline rendering (PLOT_WORKERS=0) and with the background process pool, for several
+DPI settings.
+
+Example:
+    python -m benchmarks.plot_rendering --dpi 100 300 --workers 0 2 5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+
+from src.sagemaker.train import ModelTrainer, TrainTestData
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dpi", type=int, nargs="+", default=[100, 300])
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 5])
+    parser.add_argument("--format", default="png")
+    args = parser.parse_args()
+
+    x, y = make_classification(
+        n_samples=5_000, n_features=27, n_informative=10, n_classes=3, random_state=0
+    )
+    x_train, x_test, y_train, y_test = train_test_split(x, y, random_state=0)
+    data = TrainTestData(
+        x_train, x_test, y_train, y_test, [f"feature_{i}" for i in range(27)]
+    )
+    model = RandomForestClassifier(n_estimators=10, random_state=42).fit(
+        x_train, y_train
+    )
+    preds = model.predict(x_test)
+
+    os.chdir(tempfile.mkdtemp())
+    print(f"{'dpi':>5} {'workers':>8} {'blocking [s]':>13} {'all plots [s]':>14}")
+    for dpi in args.dpi:
+        for workers in args.workers:
+            os.environ.update(
+                PLOT_DPI=str(dpi), PLOT_WORKERS=str(workers), PLOT_FORMAT=args.format
+            )
+            trainer = ModelTrainer(data)
+
+            start = time.perf_counter()
+            plots = trainer.create_visualizations(model, y_test, preds)
+            blocking = time.perf_counter() - start
+            for future in plots:
+                future.result()
+            total = time.perf_counter() - start
+            if trainer.plot_pool is not None:
+                trainer.plot_pool.shutdown()
+
+            print(f"{dpi:>5} {workers:>8} {blocking:>13.3f} {total:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
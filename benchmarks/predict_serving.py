@@ -0,0 +1,157 @@
+"""
+Load test for the predict server.
+
+Sends concurrent small /invocations requests and reports p50/p99 latency and
+throughput. Without `--url` the Flask app is driven in-process with a locally trained
+model in the model cache, once per batching setting, to show the effect of
+micro-batching. With `--url` a running server (e.g. the gunicorn container) is tested.
+
+Example:
+    python -m benchmarks.predict_serving --requests 2000 --concurrency 32
+    python -m benchmarks.predict_serving --url http://localhost:8080
+    python -m benchmarks.predict_serving --rows 10000 --content-type application/x-npy
+"""
+
+import argparse
+import io
+import time
+import types
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+N_FEATURES = 27
+CONTENT_TYPES = ["text/csv", "application/x-parquet", "application/x-npy"]
+
+
+def make_payload(rows: int, content_type: str = "text/csv", seed: int = 0) -> bytes:
+    """
+    Build a request body with `rows` random feature rows in the given content type.
+    """
+    rng = np.random.default_rng(seed)
+    features = rng.random((rows, N_FEATURES))
+    buffer = io.BytesIO()
+    if content_type == "application/x-npy":
+        np.save(buffer, features, allow_pickle=False)
+    else:
+        df = pd.DataFrame(features, columns=[f"f{i}" for i in range(N_FEATURES)])
+        if content_type == "application/x-parquet":
+            df.to_parquet(buffer, index=False)
+        else:
+            buffer.write(df.to_csv(index=False).encode("utf-8"))
+    return buffer.getvalue()
+
+
+def load_test(send, payload: bytes, n_requests: int, concurrency: int) -> dict:
+    """
+    Send `n_requests` requests from `concurrency` threads.
+
+    Returns:
+        dict: p50 and p99 latency in ms and throughput in requests per second.
+    """
+
+    def timed(_):
+        start = time.perf_counter()
+        send(payload)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = np.array(list(executor.map(timed, range(n_requests))))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "p50_ms": np.percentile(latencies, 50) * 1000,
+        "p99_ms": np.percentile(latencies, 99) * 1000,
+        "throughput_rps": n_requests / elapsed,
+    }
+
+
+def http_sender(url: str, content_type: str):
+    def send(payload):
+        headers = {"Content-Type": content_type, "Accept": content_type}
+        request = urllib.request.Request(
+            f"{url}/invocations", data=payload, headers=headers
+        )
+        with urllib.request.urlopen(request) as response:
+            response.read()
+
+    return send
+
+
+def in_process_sender(max_wait_ms: float, content_type: str):
+    """
+    Drive the Flask app directly with a locally trained model.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from src.sagemaker import predict
+
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(
+        rng.random((2000, N_FEATURES)), columns=[f"f{i}" for i in range(N_FEATURES)]
+    )
+    model = RandomForestClassifier(n_estimators=100, random_state=0)
+    model.fit(X, rng.integers(0, 3, len(X)))
+
+    predict.model_cache._entry = (model, types.SimpleNamespace(version="benchmark"))
+    predict._initialized = True
+    predict.batcher.max_wait = max_wait_ms / 1000
+    client = predict.app.test_client()
+
+    def send(payload):
+        response = client.post(
+            "/invocations",
+            data=payload,
+            content_type=content_type,
+            headers={"Accept": content_type},
+        )
+        assert response.status_code == 200, response.status_code
+
+    return send
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rows", type=int, default=1, help="Rows per request")
+    parser.add_argument(
+        "--content-type",
+        choices=CONTENT_TYPES,
+        default="text/csv",
+        help="Request and response format",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        nargs="+",
+        default=[0, 2, 5],
+        help="Batching windows to compare in-process; 0 disables batching",
+    )
+    args = parser.parse_args()
+    payload = make_payload(args.rows, args.content_type)
+
+    print(f"{'setup':>14} {'p50 [ms]':>10} {'p99 [ms]':>10} {'req/s':>9}")
+    if args.url:
+        setups = {args.url: lambda: http_sender(args.url, args.content_type)}
+    else:
+        setups = {
+            f"wait {w:g} ms": lambda w=w: in_process_sender(w, args.content_type)
+            for w in args.max_wait_ms
+        }
+
+    for name, make_sender in setups.items():
+        send = make_sender()
+        result = load_test(send, payload, args.requests, args.concurrency)
+        print(
+            f"{name:>14} {result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f} "
+            f"{result['throughput_rps']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
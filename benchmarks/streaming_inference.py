@@ -0,0 +1,121 @@
+"""
+Benchmark for streaming chunked inference.
+
+Writes a large synthetic prediction input to disk, then scores it once with
+`predict_stream` in bounded chunks and once as a single DataFrame, each in a fresh
+process, reporting rows/sec and peak RSS. About 4M rows make a ~2 GB CSV.
+
+Example:
+    python -m benchmarks.streaming_inference --rows 4000000 --chunk-size 100000
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import resource
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+N_FEATURES = 27
+COLUMNS = [f"f{i}" for i in range(N_FEATURES)]
+
+
+def write_input(path: str, rows: int, block: int = 200_000) -> None:
+    """
+    Write `rows` random feature rows to a CSV file block by block.
+    """
+    rng = np.random.default_rng(0)
+    for start in range(0, rows, block):
+        n = min(block, rows - start)
+        df = pd.DataFrame(rng.random((n, N_FEATURES)), columns=COLUMNS)
+        df.to_csv(path, mode="a" if start else "w", header=start == 0, index=False)
+
+
+def run_mode(mode, input_path, model_path, output_path, chunk_size, results):
+    """
+    Score the input in a fresh process and report throughput and peak RSS.
+    """
+    # pylint: disable=import-outside-toplevel
+    from src.components.table_io import iter_table, read_table, write_table
+    from src.sagemaker.predict import predict_stream, score
+
+    with open(model_path, "rb") as model_file:
+        model = pickle.load(model_file)
+
+    if mode == "stream":
+        stats = predict_stream(
+            iter_table(input_path, chunksize=chunk_size), output_path, model=model
+        )
+    else:
+        start = time.perf_counter()
+        df = read_table(input_path)
+        scored = pd.concat([df, score(model, df)], axis=1)
+        write_table(scored, output_path, "csv")
+        elapsed = time.perf_counter() - start
+        stats = {
+            "rows": len(df),
+            "rows_per_second": len(df) / elapsed,
+            "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+    results.put((mode, stats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument(
+        "--skip-monolithic",
+        action="store_true",
+        help="Only run the streaming mode, e.g. when the input does not fit in memory",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, "combined_results.csv")
+        model_path = os.path.join(tmp_dir, "model.pkl")
+        write_input(input_path, args.rows)
+        size_mb = os.path.getsize(input_path) / 1024**2
+
+        rng = np.random.default_rng(1)
+        model = RandomForestClassifier(n_estimators=20, max_depth=8, random_state=0)
+        model.fit(rng.random((5000, N_FEATURES)), rng.integers(0, 3, 5000))
+        with open(model_path, "wb") as model_file:
+            pickle.dump(model, model_file)
+
+        modes = ["stream"] if args.skip_monolithic else ["stream", "monolithic"]
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+
+        print(f"input: {args.rows} rows, {size_mb:.0f} MB")
+        print(f"{'mode':>11} {'rows/s':>10} {'peak RSS [MB]':>14}")
+        for mode in modes:
+            output_path = os.path.join(tmp_dir, f"{mode}.csv")
+            process = context.Process(
+                target=run_mode,
+                args=(
+                    mode,
+                    input_path,
+                    model_path,
+                    output_path,
+                    args.chunk_size,
+                    results,
+                ),
+            )
+            process.start()
+            _, stats = results.get()
+            process.join()
+            os.remove(output_path)
+            print(
+                f"{mode:>11} {stats['rows_per_second']:>10.0f} "
+                f"{stats['peak_rss_mb']:>14.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
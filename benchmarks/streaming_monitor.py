@@ -0,0 +1,97 @@
+"""
+Benchmark for the streaming drift monitor.
+
+Writes a synthetic prediction CSV, then runs the monitoring checks on it twice: once
+by loading the whole file into a DataFrame (`compare_distributions` and
+`check_confidence`) and once by streaming it in row chunks (`stream_statistics`).
+Reports the time and peak traced memory of each mode and checks that both reach the
+same drift and low-confidence decisions.
+
+Example:
+    python -m benchmarks.streaming_monitor --rows 1000000 --chunk-size 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.components.drift_stats import baseline_statistics
+from src.components.table_io import iter_table
+from src.lambda_functions.monitoring import (
+    check_confidence,
+    compare_distributions,
+    flag_drift,
+    stream_statistics,
+)
+
+
+def full_mode(path, baseline, names):
+    pred_df = pd.read_csv(path)
+    drifted, _, _ = compare_distributions(baseline, pred_df, names)
+    return drifted, check_confidence(pred_df)
+
+
+def stream_mode(path, baseline, names, chunk_size):
+    stats, confidence = stream_statistics(
+        baseline, iter_table(path, chunksize=chunk_size), names
+    )
+    drifted, _ = flag_drift(stats)
+    return drifted, confidence.check()
+
+
+def measure(func) -> tuple:
+    """
+    Run `func` and return (seconds, peak MB traced, result).
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024**2
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--features", type=int, default=27)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    names = [f"feature_{i}" for i in range(args.features)]
+    baseline = baseline_statistics(rng.normal(size=(50_000, args.features)), names)
+
+    pred_df = pd.DataFrame(rng.normal(size=(args.rows, args.features)), columns=names)
+    pred_df[names[0]] += 1.0
+    pred_df["Predicted_Class"] = rng.integers(0, 3, args.rows)
+    pred_df["Confidence"] = rng.uniform(0.3, 1.0, args.rows)
+    path = os.path.join(tempfile.mkdtemp(), "predictions.csv")
+    pred_df.to_csv(path, index=False)
+    size = os.path.getsize(path) / 1024**2
+    del pred_df
+
+    print(f"{args.rows} rows, {size:.0f} MB CSV")
+    print(f"{'mode':>8} {'time [s]':>9} {'peak [MB]':>10}")
+    results = {}
+    for mode, func in (
+        ("full", lambda: full_mode(path, baseline, names)),
+        ("stream", lambda: stream_mode(path, baseline, names, args.chunk_size)),
+    ):
+        elapsed, peak, results[mode] = measure(func)
+        print(f"{mode:>8} {elapsed:>9.2f} {peak:>10.1f}")
+
+    (full_drifted, full_conf), (stream_drifted, stream_conf) = results.values()
+    assert full_drifted == stream_drifted, (full_drifted, stream_drifted)
+    assert full_conf[0] == stream_conf[0], (full_conf, stream_conf)
+    print(f"same decisions: drifted={stream_drifted}, low confidence={stream_conf[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark for the pre-processing transformation step.
+
+Compares the original row-by-row implementation of `transform_data` with the
+vectorized one on synthetic experiment sheets of increasing size.
+
+Example:
+    python -m benchmarks.transform_data --sizes 1000 100000 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.components.data_transformation import transform_data
+
+COLUMNS = (
+    ["Sample", "Stream"]
+    + [f"Feature {i}" for i in range(7)]
+    + ["Velocity Input Sim l/min", "Pressure Input Sim bar", "Agglomeration class"]
+)
+
+
+def legacy_transform_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Original loop-based transformation, kept here as the reference implementation.
+
+    Args:
+        df (pd.DataFrame): The raw experiment sheet.
+
+    Returns:
+        pd.DataFrame: The transformed dataframe.
+    """
+    df = df[1:].reset_index(drop=True)
+
+    expanded_data = []
+    for i in range(0, len(df), 3):
+        feed = df.iloc[i, 2:11].values
+        permeat = df.iloc[i + 1, 2:11].values
+        retentat = df.iloc[i + 2, 2:11].values
+
+        row_data = list(feed) + list(permeat) + list(retentat)
+        if len(df.columns) > 11 and pd.notna(df.iloc[i + 2, 11]):
+            row_data.append(int(df.iloc[i + 2, 11]))
+        expanded_data.append(row_data)
+
+    columns = [
+        f"{label}_{col}"
+        for label in ["Feed", "Permeat", "Retentat"]
+        for col in df.columns[2:11]
+    ]
+    if len(df.columns) > 11:
+        columns.append(df.columns[11])
+
+    expanded_df = pd.DataFrame(expanded_data, columns=columns)
+    expanded_df.rename(
+        columns={
+            "Feed_Velocity Input Sim l/min": "UIn",
+            "Feed_Pressure Input Sim bar": "p",
+        },
+        inplace=True,
+    )
+    return expanded_df
+
+
+def make_sheet(n_triplets: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Build a synthetic sheet shaped like the Excel workbooks read by pre-processing.
+
+    Args:
+        n_triplets (int): Number of Feed/Permeat/Retentat triplets.
+        seed (int, optional): Random seed. Defaults to 42.
+
+    Returns:
+        pd.DataFrame: Object-typed sheet with a leading units row.
+    """
+    rng = np.random.default_rng(seed)
+    n_rows = 3 * n_triplets
+
+    data = {
+        "Sample": np.repeat(np.arange(n_triplets), 3).astype(object),
+        "Stream": np.tile(np.arange(3), n_triplets).astype(object),
+    }
+    for i in range(7):
+        data[f"Feature {i}"] = rng.random(n_rows).astype(object)
+    data["Velocity Input Sim l/min"] = rng.integers(1, 10, n_rows).astype(object)
+    data["Pressure Input Sim bar"] = rng.random(n_rows).astype(object)
+    target = np.full(n_rows, np.nan, dtype=object)
+    target[2::3] = rng.integers(0, 3, n_triplets)
+    data["Agglomeration class"] = target
+
+    units = pd.DataFrame([["unit"] * len(COLUMNS)], columns=COLUMNS)
+    return pd.concat([units, pd.DataFrame(data, columns=COLUMNS)], ignore_index=True)
+
+
+def time_call(func, df: pd.DataFrame):
+    """
+    Time a single call of a transformation function.
+
+    Returns:
+        tuple: (elapsed seconds, result)
+    """
+    start = time.perf_counter()
+    result = func(df)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=None,
+        help="Skip the legacy loop above this many triplets",
+    )
+    args = parser.parse_args()
+
+    print(f"{'triplets':>10} {'legacy [s]':>12} {'vectorized [s]':>15} {'speedup':>9}")
+    for size in args.sizes:
+        sheet = make_sheet(size)
+        new_time, new_df = time_call(transform_data, sheet)
+
+        if args.legacy_max is not None and size > args.legacy_max:
+            print(f"{size:>10} {'skipped':>12} {new_time:>15.4f} {'-':>9}")
+            continue
+
+        old_time, old_df = time_call(legacy_transform_data, sheet)
+        pd.testing.assert_frame_equal(old_df, new_df)
+        print(
+            f"{size:>10} {old_time:>12.4f} {new_time:>15.4f} "
+            f"{old_time / new_time:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
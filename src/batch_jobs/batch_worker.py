@@ -44,10 +44,11 @@ def batch_worker():
         openfoam_handler = OpenFoamHandler(df)
         simulation_results = openfoam_handler.simulate()
 
-        output_path = f"/tmp/simulation_result_{run_id}_job_{job_number}.csv"
-        simulation_results.to_csv(output_path, index=False)
+        extension = data_management.file_extension
+        output_path = f"/tmp/simulation_result_{run_id}_job_{job_number}{extension}"
+        data_management.write_dataframe(simulation_results, output_path)
 
-        result_key = f"simulated/{run_id}/job_{job_number}.csv"
+        result_key = f"simulated/{run_id}/job_{job_number}{extension}"
         data_management.upload_csv(output_path, bucket, result_key, version_id)
 
         logging.info(
@@ -0,0 +1,118 @@
+"""
+AWS Clients Module.
+
+Module-level registry of boto3 clients and Secrets Manager secrets with TTL-based
+expiry. Entries live for the lifetime of the process, so warm Lambda invocations and
+the requests of the predict server reuse clients and credentials instead of building
+a new session and calling Secrets Manager every time.
+
+Example:
+    from src.components.aws_clients import get_client, get_secret
+
+    s3_client = get_client("s3")
+    secret = get_secret("mlflow-basic-auth", region_name="eu-central-1")
+"""
+
+import threading
+import time
+from typing import Optional
+
+import boto3
+from botocore.config import Config
+
+# Clients hold no credentials of their own beyond the session, so they may live long
+CLIENT_TTL_SECONDS = 3600
+# Secrets are re-fetched regularly so rotated credentials are picked up
+SECRET_TTL_SECONDS = 300
+
+_lock = threading.Lock()
+_clients = {}
+_secrets = {}
+_stats = {"client_hits": 0, "client_misses": 0, "secret_hits": 0, "secret_misses": 0}
+
+
+def get_client(
+    service_name: str,
+    region_name: Optional[str] = None,
+    max_pool_connections: Optional[int] = None,
+    ttl: float = CLIENT_TTL_SECONDS,
+):
+    """
+    Return a shared boto3 client, creating it if missing or expired.
+
+    Args:
+        service_name (str): AWS service, e.g. "s3" or "sns".
+        region_name (str, optional): Region of the client. Defaults to the session region.
+        max_pool_connections (int, optional): Size of the HTTP connection pool.
+        ttl (float, optional): Seconds a client is reused. Defaults to 3600.
+
+    Returns:
+        The boto3 client.
+    """
+    key = (service_name, region_name, max_pool_connections)
+    with _lock:
+        entry = _clients.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            _stats["client_hits"] += 1
+            return entry[0]
+
+        _stats["client_misses"] += 1
+        config = None
+        if max_pool_connections is not None:
+            config = Config(max_pool_connections=max_pool_connections)
+        # boto3.client shares the default session, whose creation is not thread-safe
+        client = boto3.client(service_name, region_name=region_name, config=config)
+        _clients[key] = (client, time.monotonic() + ttl)
+        return client
+
+
+def get_secret(
+    secret_id: str, region_name: Optional[str] = None, ttl: float = SECRET_TTL_SECONDS
+) -> str:
+    """
+    Return a Secrets Manager secret string, fetching it if missing or expired.
+
+    Args:
+        secret_id (str): Name or ARN of the secret.
+        region_name (str, optional): Region of the secret. Defaults to the session region.
+        ttl (float, optional): Seconds the secret is reused. Defaults to 300.
+
+    Returns:
+        str: The SecretString of the secret.
+    """
+    key = (secret_id, region_name)
+    with _lock:
+        entry = _secrets.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            _stats["secret_hits"] += 1
+            return entry[0]
+
+    client = get_client("secretsmanager", region_name=region_name)
+    secret = client.get_secret_value(SecretId=secret_id)["SecretString"]
+
+    with _lock:
+        _stats["secret_misses"] += 1
+        _secrets[key] = (secret, time.monotonic() + ttl)
+    return secret
+
+
+def clear() -> None:
+    """
+    Drop all cached clients and secrets and reset the counters.
+    """
+    with _lock:
+        _clients.clear()
+        _secrets.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
+def stats() -> dict:
+    """
+    Return the hit and miss counters of the registry.
+
+    Returns:
+        dict: Client and secret hits and misses, and the number of cached entries.
+    """
+    with _lock:
+        return dict(_stats, clients=len(_clients), secrets=len(_secrets))
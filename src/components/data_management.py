@@ -4,12 +4,24 @@ Data Management Module.
 This module provides a class with methods for data management tasks.
 """
 
+import io
 import os
-from typing import Optional, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
 
-import boto3
 import pandas as pd
+from botocore.response import StreamingBody
 
+from src.components.aws_clients import get_client
+from src.components.table_io import (
+    content_type,
+    file_extension,
+    iter_table,
+    read_table,
+    write_table,
+)
 from src.errors.data_management_errors import VersioningError
 from src.logger import logging
 from src.utility import get_cfg
@@ -33,7 +45,124 @@ class DataManagement:
             self.management_config (dict): Configuration settings for data management tasks.
         """
         self.management_config = get_cfg("components/data_management.yaml")
-        self.s3_client = boto3.client("s3")
+        self.s3_client = get_client(
+            "s3",
+            max_pool_connections=self.management_config.get(
+                "s3_max_pool_connections", 10
+            ),
+        )
+        self.intermediate_format = self.management_config.get(
+            "intermediate_format", "csv"
+        )
+
+    @property
+    def file_extension(self) -> str:
+        """
+        File extension of the configured intermediate format, e.g. ".parquet".
+        """
+        return file_extension(self.intermediate_format)
+
+    def write_dataframe(self, df: pd.DataFrame, file_path: str) -> None:
+        """
+        Writes a DataFrame to a local file in the configured intermediate format.
+
+        Args:
+            df (pd.DataFrame): The data to write.
+            file_path (str): Destination path, normally ending with `file_extension`.
+        """
+        write_table(
+            df,
+            file_path,
+            self.intermediate_format,
+            compression=self.management_config.get("parquet_compression", "zstd"),
+        )
+
+    def serialize_dataframe(self, df: pd.DataFrame) -> bytes:
+        """
+        Serializes a DataFrame in memory in the configured intermediate format.
+
+        Args:
+            df (pd.DataFrame): The data to serialize.
+
+        Returns:
+            bytes: The file content, as `write_dataframe` would write it.
+        """
+        buffer = io.BytesIO()
+        write_table(
+            df,
+            buffer,
+            self.intermediate_format,
+            compression=self.management_config.get("parquet_compression", "zstd"),
+        )
+        return buffer.getvalue()
+
+    def upload_dataframes(
+        self,
+        chunks: List[Tuple[pd.DataFrame, str]],
+        bucket_name: str,
+        version_id: str,
+        max_workers: int = 32,
+    ) -> List[str]:
+        """
+        Serializes DataFrames in memory and uploads them to S3 concurrently.
+
+        Each object is written with a single `put_object` call that also sets the
+        source_raw_version_id tag, without local files or a separate tagging call.
+        Serialization happens on the upload threads, so at most `max_workers` buffers
+        are held at once.
+
+        Args:
+            chunks (list): (DataFrame, object name) pairs to upload.
+            bucket_name (str): The name of the S3 bucket.
+            version_id (str): The version ID of the raw data to be used as a tag.
+            max_workers (int, optional): Maximum number of concurrent uploads. Defaults to 32.
+
+        Returns:
+            list: The object names, in the order of `chunks`.
+
+        Raises:
+            Exception: The first upload error, after all uploads have finished.
+        """
+        if not chunks:
+            return []
+
+        def upload(chunk: Tuple[pd.DataFrame, str]) -> str:
+            df, object_name = chunk
+            self.upload_bytes(
+                self.serialize_dataframe(df), bucket_name, object_name, version_id
+            )
+            return object_name
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            keys = list(executor.map(upload, chunks))
+
+        logging.info(
+            f"Uploaded {len(keys)} objects to {bucket_name} "
+            f"in {(time.perf_counter() - start) * 1000:.0f} ms"
+        )
+        return keys
+
+    def upload_bytes(
+        self, data: bytes, bucket_name: str, object_name: str, version_id: str
+    ) -> None:
+        """
+        Uploads an in-memory object to an S3 bucket, tagged with the raw data version
+        ID in the same request.
+
+        Args:
+            data (bytes): The object content, in the configured intermediate format.
+            bucket_name (str): The name of the S3 bucket.
+            object_name (str): The name of the object in S3.
+            version_id (str): The version ID of the raw data to be used as a tag.
+        """
+        self.s3_client.put_object(
+            Bucket=bucket_name,
+            Key=object_name,
+            Body=data,
+            ContentType=content_type(self.intermediate_format),
+            Tagging=urlencode({"source_raw_version_id": version_id}),
+        )
 
     def load_s3_file(
         self, bucket: str, key: str, version_id: Optional[str] = None
@@ -42,6 +171,11 @@ class DataManagement:
         Loads a file from S3, optionally with a version_id.
         If version_id is not provided, fetches the latest version.
 
+        In the default "stream" read mode the object body is parsed straight from the
+        `get_object` response without touching local storage, and the version id of the
+        latest object is taken from that response instead of listing versions. The
+        "download" mode keeps the previous behaviour of downloading to /tmp first.
+
         Args:
             bucket (str): The name of the S3 bucket.
             key (str): The S3 object key.
@@ -54,6 +188,196 @@ class DataManagement:
             FileNotFoundError: If the file or version information cannot be found
             VersioningError: If versioning issues occur
         """
+        if self.management_config.get("s3_read_mode", "stream") == "download":
+            return self._download_s3_file(bucket, key, version_id)
+
+        start = time.perf_counter()
+        body, version_id, content_length = self._get_object(bucket, key, version_id)
+        with body:
+            df = self._parse(body, key)
+        self._record_transfer(key, content_length, start)
+
+        return df, version_id
+
+    def load_s3_files(
+        self, bucket: str, keys: List[str], max_workers: int = 16
+    ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Exception]]:
+        """
+        Loads many files from S3 concurrently with a bounded thread pool.
+
+        Each file is fetched and parsed by `load_s3_file` on its own thread; a failing
+        file does not stop the others.
+
+        Args:
+            bucket (str): The name of the S3 bucket.
+            keys (list): The S3 object keys to load.
+            max_workers (int, optional): Maximum number of concurrent loads. Defaults to 16.
+
+        Returns:
+            tuple: (dict of key to loaded DataFrame, dict of key to the raised exception)
+        """
+        loaded, failed = {}, {}
+        if not keys:
+            return loaded, failed
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+            futures = {
+                executor.submit(self.load_s3_file, bucket, key): key for key in keys
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    loaded[key], _ = future.result()
+                except Exception as e:  # pylint: disable=broad-except
+                    failed[key] = e
+
+        return loaded, failed
+
+    def list_s3_keys(self, bucket: str, prefix: str, suffix: str = "") -> List[str]:
+        """
+        Lists all object keys under a prefix, following every page of results.
+
+        The listing runs sequentially rather than fanning out over sub-prefixes: the
+        pipeline writes results flat under `simulated/<run_id>/`, so there are no
+        sub-prefixes to list concurrently, and one paginated listing returns 1000 keys
+        per request.
+
+        Args:
+            bucket (str): The name of the S3 bucket.
+            prefix (str): The key prefix to list, e.g. "simulated/<run_id>/".
+            suffix (str, optional): Only keep keys ending with this suffix. Defaults to "".
+
+        Returns:
+            list: The matching keys in lexicographic order.
+        """
+        keys = []
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            keys.extend(obj["Key"] for obj in page.get("Contents", []))
+
+        return sorted(key for key in keys if key.endswith(suffix))
+
+    def iter_s3_file(
+        self,
+        bucket: str,
+        key: str,
+        version_id: Optional[str] = None,
+        chunksize: int = 100_000,
+    ) -> Tuple[Iterator[pd.DataFrame], str]:
+        """
+        Streams a file from S3 as an iterator of DataFrame chunks.
+
+        CSV objects are parsed incrementally from the response body and Parquet objects
+        are read one record batch at a time. Excel workbooks cannot be parsed incrementally
+        and are read at once, then yielded in slices.
+
+        Args:
+            bucket (str): The name of the S3 bucket.
+            key (str): The S3 object key.
+            version_id (str, optional): The version ID of the S3 object. Defaults to None.
+            chunksize (int, optional): Number of rows per chunk. Defaults to 100000.
+
+        Returns:
+            tuple: (iterator over DataFrame chunks, version_id of the file)
+        """
+        start = time.perf_counter()
+        body, version_id, content_length = self._get_object(bucket, key, version_id)
+
+        def chunks():
+            with body:
+                if key.endswith((".csv", ".parquet")):
+                    yield from iter_table(body, key, chunksize=chunksize)
+                else:
+                    df = self._parse(body, key)
+                    for offset in range(0, len(df), chunksize):
+                        yield df.iloc[offset : offset + chunksize]
+            self._record_transfer(key, content_length, start)
+
+        return chunks(), version_id
+
+    def _get_object(
+        self, bucket: str, key: str, version_id: Optional[str]
+    ) -> Tuple[StreamingBody, str, int]:
+        """
+        Requests an S3 object, resolving the latest version id from the response itself.
+
+        Args:
+            bucket (str): The name of the S3 bucket.
+            key (str): The S3 object key.
+            version_id (str, optional): The version ID of the S3 object.
+
+        Returns:
+            tuple: (response body stream, version_id of the object, content length in bytes)
+
+        Raises:
+            FileNotFoundError: If the object does not exist
+            VersioningError: If the bucket does not version its objects
+        """
+        request = {"Bucket": bucket, "Key": key}
+        if version_id is not None:
+            request["VersionId"] = version_id
+
+        try:
+            response = self.s3_client.get_object(**request)
+        except self.s3_client.exceptions.NoSuchKey as e:
+            raise FileNotFoundError(f"Unable to fetch s3://{bucket}/{key}") from e
+
+        resolved_version = response.get("VersionId")
+        if resolved_version in (None, "null"):
+            response["Body"].close()
+            raise VersioningError(bucket)
+
+        return response["Body"], resolved_version, response.get("ContentLength", 0)
+
+    @staticmethod
+    def _parse(body, key: str) -> pd.DataFrame:
+        """
+        Parses a CSV, Parquet or Excel object body into a DataFrame.
+
+        Args:
+            body: File-like object holding the object content.
+            key (str): The S3 object key, used to pick the parser.
+
+        Returns:
+            pd.DataFrame: The parsed data.
+        """
+        if key.endswith((".csv", ".parquet")):
+            return read_table(body, key)
+        # The Excel reader needs a seekable file, so the workbook is buffered in memory
+        return pd.read_excel(io.BytesIO(body.read()))
+
+    @staticmethod
+    def _record_transfer(key: str, content_length: int, start: float) -> None:
+        """
+        Logs the bytes transferred and the latency of a read.
+
+        Nothing is stored on the instance, as `load_s3_files` reads from many threads.
+
+        Args:
+            key (str): The S3 object key.
+            content_length (int): Size of the object body in bytes.
+            start (float): `time.perf_counter()` value taken before the request.
+        """
+        elapsed = time.perf_counter() - start
+        logging.info(
+            f"Read {content_length} bytes from {key} in {elapsed * 1000:.0f} ms"
+        )
+
+    def _download_s3_file(
+        self, bucket: str, key: str, version_id: Optional[str] = None
+    ) -> Tuple[pd.DataFrame, str]:
+        """
+        Loads a file from S3 by downloading it to /tmp first.
+
+        Args:
+            bucket (str): The name of the S3 bucket.
+            key (str): The S3 object key.
+            version_id (str, optional): The version ID of the S3 object. Defaults to None.
+
+        Returns:
+            tuple: (DataFrame with the loaded data, version_id of the file)
+        """
+        start = time.perf_counter()
         if not os.path.exists("/tmp"):
             os.makedirs("/tmp")
         local_file_path = os.path.join("/tmp", os.path.basename(key))
@@ -75,33 +399,33 @@ class DataManagement:
             bucket, key, local_file_path, ExtraArgs={"VersionId": version_id}
         )
 
-        if key.endswith(".csv"):
-            df = pd.read_csv(local_file_path)
+        if key.endswith((".csv", ".parquet")):
+            df = read_table(local_file_path)
         else:
             df = pd.read_excel(local_file_path)
 
+        self._record_transfer(key, os.path.getsize(local_file_path), start)
         return df, version_id
 
     def upload_csv(
         self, file_path: str, bucket_name: str, object_name: str, version_id: str
     ) -> None:
         """
-        Uploads a CSV file to an S3 bucket and tags it with the raw data version ID.
+        Uploads a CSV or Parquet file to an S3 bucket and tags it with the raw data
+        version ID in the same request.
 
         Args:
-            file_path (str): The path to the csv file.
+            file_path (str): The path to the csv or parquet file.
             bucket_name (str): The name of the S3 bucket.
             object_name (str): The name of the object in S3.
             version_id (str): The version ID of the raw data to be used as a tag.
         """
         try:
-            self.s3_client.upload_file(file_path, bucket_name, object_name)
-
-            tagging = {
-                "TagSet": [{"Key": "source_raw_version_id", "Value": version_id}]
-            }
-            self.s3_client.put_object_tagging(
-                Bucket=bucket_name, Key=object_name, Tagging=tagging
+            self.s3_client.upload_file(
+                file_path,
+                bucket_name,
+                object_name,
+                ExtraArgs={"Tagging": urlencode({"source_raw_version_id": version_id})},
             )
 
             logging.info(
@@ -5,57 +5,58 @@ This module provides functionality to transform raw experimental data into a str
 format suitable for machine learning and to split the data into training and testing sets.
 """
 
-from dataclasses import dataclass
-from typing import List
-
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 
 from src.logger import logging
 
-def transform_data(  # pylint: disable=R0914
+STREAM_LABELS = ["Feed", "Permeat", "Retentat"]
+FEATURE_COLUMNS = slice(2, 11)
+TARGET_COLUMN = 11
+
+
+def transform_data(
     df: pd.DataFrame,
-):
+) -> pd.DataFrame:
     """
-    Transforms the dataframe and splits it into training and testing data.
+    Transforms the raw experiment sheet into one wide row per Feed/Permeat/Retentat triplet.
+
+    The feature block (columns 2:11) is reshaped in a single NumPy call, so the cost
+    grows with the size of the sheet rather than with the number of Python iterations.
 
     Args:
-        df (pd.DataFrame): The input dataframe.
+        df (pd.DataFrame): The input dataframe. The first row holds units and is dropped.
 
     Returns:
         pd.DataFrame: The transformed dataframe with or without target column.
+
+    Raises:
+        ValueError: If the number of data rows is not a multiple of three.
     """
     logging.info("Starting data transformation")
     df = df[1:].reset_index(drop=True)
 
-    expanded_data = []
-
-    for i in range(0, len(df), 3):
-        feed = df.iloc[i, 2:11].values
-        permeat = df.iloc[i + 1, 2:11].values
-        retentat = df.iloc[i + 2, 2:11].values
-        
-        # Check if target column exists (training data) or not (prediction data)
-        row_data = list(feed) + list(permeat) + list(retentat)
-        if len(df.columns) > 11 and pd.notna(df.iloc[i + 2, 11]):
-            sample_value = int(df.iloc[i + 2, 11])
-            row_data.append(sample_value)
-        
-        expanded_data.append(row_data)
-
-    # Create column names
-    columns = [
-        f"{label}_{col}"
-        for label in ["Feed", "Permeat", "Retentat"]
-        for col in df.columns[2:11]
-    ]
-    
-    # Add target column name only if we have target data
-    if len(df.columns) > 11:
-        columns.append(df.columns[11])
-
-    expanded_df = pd.DataFrame(expanded_data, columns=columns)
+    n_streams = len(STREAM_LABELS)
+    if len(df) % n_streams:
+        raise ValueError(
+            f"Expected Feed/Permeat/Retentat triplets, got {len(df)} data rows"
+        )
+    n_samples = len(df) // n_streams
+
+    feature_names = df.columns[FEATURE_COLUMNS]
+    columns = [f"{label}_{col}" for label in STREAM_LABELS for col in feature_names]
+
+    block = df.iloc[:, FEATURE_COLUMNS].to_numpy()
+    wide = block.reshape(n_samples, n_streams * len(feature_names))
+    expanded_df = pd.DataFrame(wide, columns=columns)
+    if wide.dtype == object:
+        expanded_df = expanded_df.infer_objects()
+
+    # Check if target column exists (training data) or not (prediction data)
+    if len(df.columns) > TARGET_COLUMN:
+        target = df.iloc[n_streams - 1 :: n_streams, TARGET_COLUMN]
+        expanded_df[df.columns[TARGET_COLUMN]] = _target_values(target)
+
     expanded_df.rename(
         columns={
             "Feed_Velocity Input Sim l/min": "UIn",
@@ -66,4 +67,20 @@ def transform_data(  # pylint: disable=R0914
 
     logging.info("Data transformation completed successfully")
 
-    return expanded_df
\ No newline at end of file
+    return expanded_df
+
+
+def _target_values(target: pd.Series) -> np.ndarray:
+    """
+    Converts the target column of the Retentat rows into integer class labels.
+
+    Args:
+        target (pd.Series): Target values taken from every Retentat row.
+
+    Returns:
+        np.ndarray: int64 labels, or float64 with NaN where a triplet has no label.
+    """
+    values = np.trunc(pd.to_numeric(target).to_numpy(dtype=np.float64))
+    if np.isnan(values).any():
+        return values
+    return values.astype(np.int64)
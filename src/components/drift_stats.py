@@ -0,0 +1,435 @@
+"""
+Drift Statistics Module.
+
+Computes the per-feature distribution statistics stored as the training baseline and
+compares prediction data against them. All features are processed together: every
+chunk of rows is read once to accumulate moments, extremes and histogram counts in a
+mergeable `DriftAccumulator`, from which the z-score of the mean, the population
+stability index (PSI), a histogram-based Kolmogorov-Smirnov (KS) statistic and
+approximate quantiles are derived.
+
+Histograms use `n_bins` equal-width bins starting at the baseline minimum, an underflow
+bin below it and an overflow bin from the baseline maximum upwards, so the bin of every
+value is found with arithmetic instead of a per-feature search.
+
+Example:
+    from src.components.drift_stats import baseline_statistics, drift_statistics
+
+    baseline = baseline_statistics(x_train, feature_names)
+    report = drift_statistics(baseline, pred_df[feature_names].to_numpy())
+"""
+
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+QUANTILE_LEVELS = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+# MLflow artifact holding the baseline statistics, and the tag marking runs that have it
+BASELINE_ARTIFACT = "baseline_stats.json"
+BASELINE_TAG = "baseline_stats"
+
+# Floor for empty bins, which would otherwise make the PSI infinite
+_PSI_EPSILON = 1e-4
+
+
+class DriftAccumulator:
+    """
+    Mergeable running statistics of feature columns.
+
+    Chunks of rows can be added in any number and size with `update`, and
+    accumulators of disjoint parts of the data combined with `merge`, so large inputs
+    are summarised with bounded memory. Moments are combined with the parallel
+    Welford (Chan) update; the histogram counts also serve as a mergeable sketch for
+    quantiles.
+
+    Attributes:
+        lo (np.ndarray): Per-feature lower edge of the first regular bin.
+        hi (np.ndarray): Per-feature upper edge of the last regular bin; values from
+            `hi` upwards are counted in the overflow bin.
+        n_bins (int): Number of equal-width bins between `lo` and `hi`.
+        chunk_size (int): Rows processed at once inside `update`.
+    """
+
+    def __init__(
+        self, lo: np.ndarray, hi: np.ndarray, n_bins: int, chunk_size: int = 16384
+    ):
+        self.lo = np.asarray(lo, dtype=np.float64)
+        self.hi = np.asarray(hi, dtype=np.float64)
+        self.n_bins = n_bins
+        self.chunk_size = chunk_size
+
+        n_features = len(self.lo)
+        span = self.hi - self.lo
+        # Bins per unit of value; constant features get unit-width bins
+        self._scale = n_bins / np.where(span > 0, span, n_bins)
+        # Bin n_bins + 2 collects missing values and is dropped from the histogram
+        self._offsets = np.arange(n_features) * (n_bins + 3)
+
+        self.rows = 0
+        self._counts = np.zeros(n_features * (n_bins + 3), dtype=np.int64)
+        self._n = np.zeros(n_features)
+        self._mean = np.zeros(n_features)
+        self._m2 = np.zeros(n_features)
+        self._min = np.full(n_features, np.inf)
+        self._max = np.full(n_features, -np.inf)
+
+    @classmethod
+    def for_baseline(cls, baseline: dict, **kwargs) -> "DriftAccumulator":
+        """
+        Create an accumulator with the histogram bins of a baseline.
+
+        Args:
+            baseline (dict): Statistics from `baseline_statistics`, as loaded from
+                JSON. Older baselines without histograms get 20 bins between their
+                minimum and maximum.
+
+        Returns:
+            DriftAccumulator: An empty accumulator.
+        """
+        histogram = baseline.get("histogram")
+        if histogram is None:
+            return cls(baseline["min"], baseline["max"], 20, **kwargs)
+        return cls(histogram["lo"], histogram["hi"], histogram["n_bins"], **kwargs)
+
+    @classmethod
+    def from_baseline(cls, baseline: dict, **kwargs) -> "DriftAccumulator":
+        """
+        Create an accumulator holding the statistics of a baseline's training data.
+
+        Rows added with `update` then extend the data the baseline describes. The
+        histogram counts are restored from the stored proportions and row count, so
+        missing values of the baseline data are not known and count as present.
+
+        Args:
+            baseline (dict): Statistics from `baseline_statistics`, with histograms.
+
+        Returns:
+            DriftAccumulator: An accumulator with the baseline's bins and statistics.
+        """
+        histogram = baseline["histogram"]
+        accumulator = cls(
+            histogram["lo"], histogram["hi"], histogram["n_bins"], **kwargs
+        )
+        rows = baseline["shape"][0]
+        proportions = np.asarray(histogram["proportions"])
+        counts = np.zeros((len(proportions), accumulator.n_bins + 3), dtype=np.int64)
+        counts[:, :-1] = np.rint(proportions * rows)
+
+        accumulator.rows = rows
+        accumulator._counts = counts.ravel()
+        accumulator._combine(
+            np.full(len(proportions), float(rows)),
+            np.asarray(baseline["mean"], dtype=np.float64),
+            np.asarray(baseline["std"], dtype=np.float64) ** 2 * rows,
+            np.asarray(baseline["min"], dtype=np.float64),
+            np.asarray(baseline["max"], dtype=np.float64),
+        )
+        return accumulator
+
+    def update(self, x: np.ndarray) -> "DriftAccumulator":
+        """
+        Add rows to the statistics.
+
+        Args:
+            x (np.ndarray): 2D array of shape (rows, features); NaN marks missing
+                values.
+
+        Returns:
+            DriftAccumulator: self, to allow chaining.
+        """
+        for start in range(0, len(x), self.chunk_size):
+            self._update_chunk(
+                np.asarray(x[start : start + self.chunk_size], dtype=np.float64)
+            )
+        return self
+
+    def _update_chunk(self, chunk: np.ndarray) -> None:
+        n_bins = self.n_bins
+        missing = np.isnan(chunk)
+        has_missing = missing.any()
+
+        # Shifted by one so the underflow bin is 0; after clipping to [0, n_bins + 1]
+        # the integer cast truncates, which is the floor for non-negative values
+        position = chunk - self.lo
+        position *= self._scale
+        position += 1
+        np.maximum(position, 0, out=position)
+        np.minimum(position, n_bins + 1, out=position)
+        if has_missing:
+            position[missing] = n_bins + 2
+        index = position.astype(np.intp)
+        index += self._offsets
+        self._counts += np.bincount(index.ravel(), minlength=len(self._counts))
+
+        if has_missing:
+            n = (~missing).sum(axis=0).astype(np.float64)
+            mean = np.nansum(chunk, axis=0) / np.maximum(n, 1)
+            centered = chunk - mean
+            centered[missing] = 0.0
+            minimum = np.fmin.reduce(chunk, axis=0)
+            maximum = np.fmax.reduce(chunk, axis=0)
+        else:
+            n = np.full(chunk.shape[1], float(len(chunk)))
+            mean = chunk.mean(axis=0)
+            centered = chunk - mean
+            minimum, maximum = chunk.min(axis=0), chunk.max(axis=0)
+        m2 = np.einsum("ij,ij->j", centered, centered)
+
+        self.rows += len(chunk)
+        self._combine(n, mean, m2, minimum, maximum)
+
+    def merge(self, other: "DriftAccumulator") -> "DriftAccumulator":
+        """
+        Add the statistics of another accumulator with the same bins.
+
+        Args:
+            other (DriftAccumulator): Statistics of a disjoint part of the data.
+
+        Returns:
+            DriftAccumulator: self, to allow chaining.
+        """
+        state = other.state()
+        self.rows += state["rows"]
+        self._counts += state["counts"]
+        self._combine(
+            state["n"], state["mean"], state["m2"], state["min"], state["max"]
+        )
+        return self
+
+    def state(self) -> Dict[str, Union[int, np.ndarray]]:
+        """
+        Raw running statistics, as combined by `merge`.
+
+        Returns:
+            dict: "rows", the flat histogram "counts" of all features including their
+                missing-value bins, and per-feature "n" (non-missing values), "mean",
+                "m2" (sum of squared deviations), "min" and "max".
+        """
+        return {
+            "rows": self.rows,
+            "counts": self._counts,
+            "n": self._n,
+            "mean": self._mean,
+            "m2": self._m2,
+            "min": self._min,
+            "max": self._max,
+        }
+
+    def _combine(self, n, mean, m2, minimum, maximum) -> None:
+        total = self._n + n
+        safe_total = np.maximum(total, 1)
+        delta = mean - self._mean
+        self._mean = self._mean + delta * n / safe_total
+        self._m2 = self._m2 + m2 + delta**2 * self._n * n / safe_total
+        self._n = total
+        self._min = np.fmin(self._min, minimum)
+        self._max = np.fmax(self._max, maximum)
+
+    def summary(self) -> Dict[str, np.ndarray]:
+        """
+        Current statistics.
+
+        Returns:
+            dict: "counts" of shape (features, n_bins + 2) with the underflow bin first
+                and the overflow bin last, and per-feature "count", "missing",
+                "mean", "std", "min" and "max".
+        """
+        counts = self._counts.reshape(-1, self.n_bins + 3)
+        return {
+            "counts": counts[:, :-1],
+            "count": self._n.astype(np.int64),
+            "missing": counts[:, -1],
+            "mean": self._mean,
+            "std": np.sqrt(self._m2 / np.maximum(self._n, 1)),
+            "min": self._min,
+            "max": self._max,
+        }
+
+
+def baseline_statistics(
+    x: np.ndarray, feature_names: List[str], n_bins: int = 20
+) -> dict:
+    """
+    Build the JSON-serialisable baseline statistics of the training features.
+
+    Args:
+        x (np.ndarray): Training features of shape (rows, features).
+        feature_names (list): Names of the feature columns, in column order.
+        n_bins (int, optional): Number of regular histogram bins. Defaults to 20.
+
+    Returns:
+        dict: Mean, std, min, max and shape as before, plus the exact quantiles at
+            `QUANTILE_LEVELS` and the histogram proportions used for PSI and KS.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    lo, hi = np.nanmin(x, axis=0), np.nanmax(x, axis=0)
+    accumulator = DriftAccumulator(lo, hi, n_bins).update(x)
+    quantiles = np.nanquantile(x, QUANTILE_LEVELS, axis=0).T
+    return _baseline_from_accumulator(accumulator, feature_names, quantiles)
+
+
+def extend_baseline_statistics(baseline: dict, x: np.ndarray) -> dict:
+    """
+    Build the baseline statistics of a baseline's data together with more rows.
+
+    Used when a model is trained further on new data, so that the baseline keeps
+    describing everything the model was trained on. The histogram bins of `baseline`
+    are kept, and as the earlier rows are no longer available, the quantiles are
+    estimated from the combined histogram.
+
+    Args:
+        baseline (dict): Statistics from `baseline_statistics`, with histograms.
+        x (np.ndarray): The new training features of shape (rows, features).
+
+    Returns:
+        dict: Statistics in the format of `baseline_statistics`.
+    """
+    accumulator = DriftAccumulator.from_baseline(baseline).update(x)
+    summary = accumulator.summary()
+    quantiles = histogram_quantiles(
+        summary["counts"],
+        accumulator.lo,
+        accumulator.hi,
+        summary["min"],
+        summary["max"],
+    )
+    return _baseline_from_accumulator(accumulator, baseline["feature_names"], quantiles)
+
+
+def _baseline_from_accumulator(
+    accumulator: DriftAccumulator, feature_names: List[str], quantiles: np.ndarray
+) -> dict:
+    summary = accumulator.summary()
+    proportions = summary["counts"] / np.maximum(summary["count"], 1)[:, np.newaxis]
+
+    return {
+        "mean": summary["mean"].tolist(),
+        "std": summary["std"].tolist(),
+        "min": summary["min"].tolist(),
+        "max": summary["max"].tolist(),
+        "shape": [accumulator.rows, len(feature_names)],
+        "feature_names": list(feature_names),
+        "quantiles": {
+            "levels": list(QUANTILE_LEVELS),
+            "values": quantiles.tolist(),
+        },
+        "histogram": {
+            "n_bins": accumulator.n_bins,
+            "lo": accumulator.lo.tolist(),
+            "hi": accumulator.hi.tolist(),
+            "proportions": proportions.tolist(),
+        },
+    }
+
+
+def histogram_quantiles(
+    counts: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    minimum: np.ndarray,
+    maximum: np.ndarray,
+    levels: Sequence[float] = QUANTILE_LEVELS,
+) -> np.ndarray:
+    """
+    Estimate quantiles of every feature by linear interpolation within its histogram.
+
+    Args:
+        counts (np.ndarray): Counts from `DriftAccumulator`, underflow and overflow
+            bins included.
+        lo (np.ndarray): Per-feature lower edge of the first regular bin.
+        hi (np.ndarray): Per-feature upper edge of the last regular bin.
+        minimum (np.ndarray): Observed per-feature minimum, bounding the underflow bin.
+        maximum (np.ndarray): Observed per-feature maximum, bounding the overflow bin.
+        levels (sequence, optional): Quantile levels. Defaults to `QUANTILE_LEVELS`.
+
+    Returns:
+        np.ndarray: Array of shape (features, levels).
+    """
+    n_bins = counts.shape[1] - 2
+    inner = lo[:, np.newaxis] + (hi - lo)[:, np.newaxis] * np.linspace(0, 1, n_bins + 1)
+    bounds = np.column_stack([np.fmin(minimum, lo), inner, np.fmax(maximum, hi)])
+
+    cdf = np.cumsum(counts, axis=1) / np.maximum(counts.sum(axis=1), 1)[:, np.newaxis]
+    cdf = np.column_stack([np.zeros(len(counts)), cdf])
+
+    levels = np.asarray(levels)
+    # First bound where the cumulative share reaches each level, at least 1
+    upper = np.maximum((cdf[:, np.newaxis, :] < levels[:, np.newaxis]).sum(axis=2), 1)
+    upper = np.minimum(upper, cdf.shape[1] - 1)
+    rows = np.arange(len(counts))[:, np.newaxis]
+    cdf_low, cdf_high = cdf[rows, upper - 1], cdf[rows, upper]
+    fraction = np.where(
+        cdf_high > cdf_low, (levels - cdf_low) / (cdf_high - cdf_low), 0.0
+    )
+    low, high = bounds[rows, upper - 1], bounds[rows, upper]
+    return low + np.clip(fraction, 0.0, 1.0) * (high - low)
+
+
+def drift_statistics(
+    baseline: dict, x: Union[np.ndarray, DriftAccumulator]
+) -> pd.DataFrame:
+    """
+    Compare prediction features against baseline statistics.
+
+    Baselines created before histograms were stored only get the z-score of the mean.
+
+    Args:
+        baseline (dict): Statistics from `baseline_statistics`, as loaded from JSON.
+        x (np.ndarray or DriftAccumulator): Prediction features of shape (rows,
+            features), in the order of `baseline["feature_names"]`, or their running
+            statistics accumulated with `DriftAccumulator.for_baseline(baseline)`.
+
+    Returns:
+        pd.DataFrame: One row per feature with the baseline and current mean, the
+            current std, z_score, psi, ks, missing_ratio and one column per quantile.
+    """
+    baseline_mean = np.asarray(baseline["mean"], dtype=np.float64)
+    baseline_std = np.asarray(baseline["std"], dtype=np.float64)
+    histogram = baseline.get("histogram")
+    accumulator = x
+    if not isinstance(accumulator, DriftAccumulator):
+        accumulator = DriftAccumulator.for_baseline(baseline).update(x)
+
+    summary = accumulator.summary()
+    z_score = np.where(
+        baseline_std > 0,
+        np.abs(summary["mean"] - baseline_mean) / (baseline_std + 1e-8),
+        0.0,
+    )
+    report = pd.DataFrame(
+        {
+            "baseline_mean": baseline_mean,
+            "mean": summary["mean"],
+            "std": summary["std"],
+            "z_score": z_score,
+            "psi": np.nan,
+            "ks": np.nan,
+            "missing_ratio": summary["missing"] / max(accumulator.rows, 1),
+        },
+        index=pd.Index(baseline["feature_names"], name="feature"),
+    )
+
+    if histogram is not None:
+        expected = np.asarray(histogram["proportions"], dtype=np.float64)
+        actual = summary["counts"] / np.maximum(summary["count"], 1)[:, np.newaxis]
+        expected_floor = np.maximum(expected, _PSI_EPSILON)
+        actual_floor = np.maximum(actual, _PSI_EPSILON)
+        report["psi"] = (
+            (actual_floor - expected_floor) * np.log(actual_floor / expected_floor)
+        ).sum(axis=1)
+        report["ks"] = np.abs(
+            np.cumsum(actual, axis=1) - np.cumsum(expected, axis=1)
+        ).max(axis=1)
+
+    quantiles = histogram_quantiles(
+        summary["counts"],
+        accumulator.lo,
+        accumulator.hi,
+        summary["min"],
+        summary["max"],
+    )
+    for i, level in enumerate(QUANTILE_LEVELS):
+        report[f"q{level * 100:g}"] = quantiles[:, i]
+    return report
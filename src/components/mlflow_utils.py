@@ -1,24 +1,24 @@
 import os
 import json
-import boto3
+import threading
+import time
 import mlflow
 import mlflow.sklearn
 import pandas as pd
 import numpy as np
 from typing import Tuple, Optional, List, Dict
+from src.components.aws_clients import get_secret
+from src.components.table_io import iter_table, read_table
 from src.logger import logging
 
 def get_mlflow_credentials() -> Tuple[str, str]:
-    """Get MLflow credentials from AWS Secrets Manager"""
+    """Get MLflow credentials from AWS Secrets Manager, cached for the secret TTL"""
     
     secret_name = "mlflow-basic-auth"
     region_name = "eu-central-1"
     
-    logging.info(f"Retrieving secret '{secret_name}' from Secrets Manager...")
-    session = boto3.session.Session()
-    client = session.client(service_name="secretsmanager", region_name=region_name)
-    get_secret_value_response = client.get_secret_value(SecretId=secret_name)
-    secret = get_secret_value_response["SecretString"]
+    logging.info(f"Retrieving secret '{secret_name}'...")
+    secret = get_secret(secret_name, region_name=region_name)
     secret_dict = json.loads(secret)
     logging.info("Secret retrieved successfully.")
     return secret_dict["username"], secret_dict["password"]
@@ -35,41 +35,63 @@ def setup_mlflow():
     mlflow.set_tracking_uri(mlflow_uri)
     logging.info(f"MLflow tracking URI set to: {mlflow_uri}")
 
+def _find_combined_results(directory):
+    """Return the combined results file in a directory, preferring parquet over csv"""
+    for extension in (".parquet", ".csv"):
+        path = os.path.join(directory, f"combined_results{extension}")
+        if os.path.exists(path):
+            return path
+    return None
+
+def find_training_input():
+    """Locate the training data file in the SageMaker train channel"""
+    train_dir = "/opt/ml/input/data/train"
+    return _find_combined_results(train_dir) or os.path.join(train_dir, "combined_results.csv")
+
 def load_data_from_sagemaker():
     """Load data from SageMaker input path"""
     logging.info("Loading data from SageMaker...")
-    df = pd.read_csv("/opt/ml/input/data/train/combined_results.csv")
-    logging.info(f"Loaded data with shape: {df.shape}")
+    path = find_training_input()
+    df = read_table(path)
+    logging.info(f"Loaded data from {path} with shape: {df.shape}")
     return df
 
-def load_prediction_data_from_sagemaker():
-    """Load data for prediction from SageMaker input path"""
-    logging.info("Loading prediction data from SageMaker...")
-    
+def find_prediction_input():
+    """Locate the prediction input file in the SageMaker input data directory"""
     # Check if running in batch transform mode (no subfolder)
-    batch_transform_path = "/opt/ml/input/data/combined_results.csv"
-    training_predict_path = "/opt/ml/input/data/predict/combined_results.csv"
+    batch_transform_path = _find_combined_results("/opt/ml/input/data")
+    training_predict_path = _find_combined_results("/opt/ml/input/data/predict")
     
-    if os.path.exists(batch_transform_path):
+    if batch_transform_path:
         # Batch transform mode - data is directly in /opt/ml/input/data/
-        df = pd.read_csv(batch_transform_path)
-        logging.info(f"Loaded batch transform data with shape: {df.shape}")
-    elif os.path.exists(training_predict_path):
+        return batch_transform_path
+    if training_predict_path:
         # Training job mode - data is in /opt/ml/input/data/predict/
-        df = pd.read_csv(training_predict_path)
-        logging.info(f"Loaded training job prediction data with shape: {df.shape}")
-    else:
-        # Fallback - try to find any csv file
-        import glob
-        csv_files = glob.glob("/opt/ml/input/data/**/*.csv", recursive=True)
-        if csv_files:
-            df = pd.read_csv(csv_files[0])
-            logging.info(f"Loaded fallback data from {csv_files[0]} with shape: {df.shape}")
-        else:
-            raise FileNotFoundError("No csv file found in SageMaker input data directory")
-    
+        return training_predict_path
+
+    # Fallback - try to find any parquet or csv file
+    import glob
+    data_files = (glob.glob("/opt/ml/input/data/**/*.parquet", recursive=True)
+                  + glob.glob("/opt/ml/input/data/**/*.csv", recursive=True))
+    if data_files:
+        logging.info(f"Using fallback data file {data_files[0]}")
+        return data_files[0]
+    raise FileNotFoundError("No csv or parquet file found in SageMaker input data directory")
+
+def load_prediction_data_from_sagemaker():
+    """Load data for prediction from SageMaker input path"""
+    logging.info("Loading prediction data from SageMaker...")
+    path = find_prediction_input()
+    df = read_table(path)
+    logging.info(f"Loaded prediction data from {path} with shape: {df.shape}")
     return df
 
+def iter_prediction_data_from_sagemaker(chunksize=100_000):
+    """Stream prediction data from SageMaker input path in chunks of at most `chunksize` rows"""
+    path = find_prediction_input()
+    logging.info(f"Streaming prediction data from {path} in chunks of {chunksize} rows")
+    return iter_table(path, chunksize=chunksize)
+
 class ModelPromotion:
     """Handles model registration and promotion logic using tags instead of stages"""
     
@@ -81,26 +103,30 @@ class ModelPromotion:
     def get_production_model(self):
         """Get current production model and its metrics using tags"""
         try:
-            # Search for models with production tag
-            model_versions = self.client.search_model_versions(
-                filter_string=f"name='{self.model_name}' and tag.{self.production_tag}='true'"
-            )
-            
-            if model_versions:
-                # Get the latest production model (highest version number)
-                prod_version = max(model_versions, key=lambda x: int(x.version))
-                
-                # Get production model metrics
-                run = self.client.get_run(prod_version.run_id)
-                prod_f1 = run.data.metrics.get("test_avg_f1", 0.0)
-                logging.info(f"Found production model version {prod_version.version} with F1: {prod_f1}")
-                return prod_version, prod_f1
-            else:
-                logging.info("No production model found")
-                return None, None
+            return self.find_production_model()
         except Exception as e:
             logging.warning(f"Error retrieving production model: {e}")
             return None, None
+
+    def find_production_model(self):
+        """Like get_production_model, but errors reaching MLflow are raised to the caller"""
+        # Search for models with production tag
+        model_versions = self.client.search_model_versions(
+            filter_string=f"name='{self.model_name}' and tag.{self.production_tag}='true'"
+        )
+
+        if not model_versions:
+            logging.info("No production model found")
+            return None, None
+
+        # Get the latest production model (highest version number)
+        prod_version = max(model_versions, key=lambda x: int(x.version))
+
+        # Get production model metrics
+        run = self.client.get_run(prod_version.run_id)
+        prod_f1 = run.data.metrics.get("test_avg_f1", 0.0)
+        logging.info(f"Found production model version {prod_version.version} with F1: {prod_f1}")
+        return prod_version, prod_f1
     
     def remove_production_tag_from_all(self):
         """Remove production tag from all existing models"""
@@ -243,4 +269,136 @@ def load_production_model():
     model = mlflow.sklearn.load_model(model_uri)
     logging.info(f"Successfully loaded production model (version {prod_model.version}, F1: {prod_f1:.4f})")
 
-    return model, prod_model
\ No newline at end of file
+    return model, prod_model
+
+
+class ModelCache:
+    """Process-level cache of the production model with background refresh.
+
+    The cached (model, prod_model) pair is replaced as a single reference, so
+    requests always see a consistent model while a new version is being loaded.
+    `on_load`, if given, converts each newly loaded model before it is served, e.g.
+    into a compiled inference engine.
+    """
+
+    def __init__(self, model_name="agglomeration-classifier", refresh_interval=300, on_load=None):
+        self.model_name = model_name
+        self.refresh_interval = refresh_interval
+        self.on_load = on_load
+        self._entry = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.hits = 0
+        self.loads = 0
+        self.checks = 0
+        self.last_check_seconds = None
+        self.last_load_seconds = None
+        self.last_refresh_at = None
+        self.last_error = None
+
+    def get(self):
+        """Return the cached (model, prod_model), loading it on first use"""
+        entry = self._entry
+        if entry is None:
+            self.refresh()
+            entry = self._entry
+            if entry is None:
+                raise ValueError("No production model found! Train a model first.")
+        else:
+            self.hits += 1
+        return entry
+
+    def refresh(self):
+        """Load the production model if the production tag moved to another version
+
+        Failures to reach MLflow or to load the model are recorded in `last_error` and
+        raised; the previously cached model stays in place and is still served.
+
+        Returns:
+            bool: True if a new model version was loaded.
+        """
+        with self._refresh_lock:
+            try:
+                return self._refresh()
+            except Exception as e:
+                self.last_error = str(e)
+                raise
+
+    def _refresh(self):
+        start = time.perf_counter()
+        prod_model, prod_f1 = ModelPromotion(model_name=self.model_name).find_production_model()
+        self.checks += 1
+        self.last_check_seconds = time.perf_counter() - start
+        self.last_refresh_at = pd.Timestamp.now().isoformat()
+
+        if prod_model is None:
+            self.last_error = "No production model found"
+            return False
+        self.last_error = None
+        current = self._entry
+        if current is not None and current[1].version == prod_model.version:
+            return False
+
+        model_uri = f"models:/{self.model_name}/{prod_model.version}"
+        logging.info(f"Loading production model from: {model_uri}")
+        start = time.perf_counter()
+        model = mlflow.sklearn.load_model(model_uri)
+        if self.on_load is not None:
+            model = self.on_load(model)
+        self.last_load_seconds = time.perf_counter() - start
+
+        self._entry = (model, prod_model)
+        self.loads += 1
+        logging.info(f"Serving production model version {prod_model.version} "
+                     f"(F1: {prod_f1:.4f}, loaded in {self.last_load_seconds:.2f}s)")
+        return True
+
+    def start(self):
+        """Start the background refresh thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="model-refresh", daemon=True)
+        self._thread.start()
+
+    def after_fork(self):
+        """Re-create the locks and the refresh thread in a forked child process
+
+        Threads do not survive a fork and a lock may have been copied while held. The
+        cached model is kept, so the child shares its memory with the parent
+        copy-on-write until a refresh loads a new version.
+        """
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.start()
+
+    def stop(self):
+        """Stop the background refresh thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the current model until the next attempt
+                logging.warning(f"Production model refresh failed: {e}")
+
+    def stats(self):
+        """Cache counters, refresh timings and the active model version"""
+        entry = self._entry
+        return {
+            "model_version": entry[1].version if entry is not None else None,
+            "hits": self.hits,
+            "loads": self.loads,
+            "checks": self.checks,
+            "last_check_seconds": self.last_check_seconds,
+            "last_load_seconds": self.last_load_seconds,
+            "last_refresh_at": self.last_refresh_at,
+            "last_error": self.last_error,
+        }
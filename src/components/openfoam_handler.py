@@ -6,13 +6,34 @@ This module provides a class `OpenFoamHandler` to manage OpenFOAM simulations.
 
 import glob
 import os
+import re
+import shutil
 import subprocess
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 
 import pandas as pd
 
+from src.components.probe_reader import read_last_line, read_probe_series
+from src.components.simulation_cache import SimulationCache
 from src.logger import logging
 from src.utility import get_cfg, get_root
 
+# Case sub-directories whose templates feed the mesher (blockMeshDict, geometry, ...)
+MESH_DIRECTORIES = ("system", "constant")
+TEMPLATE_EXTENSIONS = (".template", ".postTemplate", ".finalTemplate")
+# PyFoam template expressions: inline |-expr-| and $$-prefixed assignment lines
+TEMPLATE_EXPRESSION = re.compile(r"\|-(.*?)-\||^\$\$(.*)$", re.MULTILINE)
+
+# Initial value of a field: "internalField uniform 0;" or a nonuniform List(...) block
+INTERNAL_FIELD = re.compile(r"^internalField\s.*?;", re.MULTILINE | re.DOTALL)
+
+# Handler owned by a pool worker process, bound to that worker's private case copy
+_WORKER_HANDLER = None
+
 
 class OpenFoamHandler:  # pylint: disable=R0903
     """
@@ -32,12 +53,23 @@ class OpenFoamHandler:  # pylint: disable=R0903
         self.case_path = os.path.join(get_root(), "openfoam_case")
         self.input_df = input_df
         self.config = get_cfg("components/openfoam_handler.yaml")
+        self.mesh_parameters = set()
+        self.stage_timings = defaultdict(list)
+        self.solver_iterations = {}
+        self.probe_histories = defaultdict(dict)
+        self._meshed_geometry = None
+        self._parameter_scale = {}
+        self._solved_fields = defaultdict(list)
 
     def simulate(self) -> pd.DataFrame:
         """
         Run OpenFOAM simulations for the provided input data.
         This method processes each row of the input DataFrame (UIn and p),
         runs the OpenFOAM simulation, and appends the results as new columns to the DataFrame.
+        With more than one worker configured, variants run in a process pool, each worker
+        on its own copy of the case, and results are gathered back in the original row order.
+        Variants found in the result cache (if enabled) are not simulated again. In warm-start
+        mode variants are solved in (UIn, p) order, each seeded from the nearest solved one.
 
         Returns:
             pd.DataFrame: A DataFrame containing the input data along with simulation results.
@@ -51,22 +83,280 @@ class OpenFoamHandler:  # pylint: disable=R0903
         main_params_dict = self.config["main"]
         output_dict = self.config["simulation_output"]
 
+        cache = self._create_cache(main_params_dict, output_dict)
+        results = self._lookup_cached(cache, simulation_inputs)
+
+        pending = simulation_inputs[~simulation_inputs.index.isin(list(results))]
+        self.mesh_parameters = find_mesh_parameters(self.case_path, input_columns)
+        logging.info(f"Parameters affecting the mesh: {sorted(self.mesh_parameters)}")
+        warm_start = self._warm_start_enabled()
+        if warm_start:
+            pending = pending.sort_values(input_columns)
+            self._parameter_scale = {
+                name: float(value) or 1.0
+                for name, value in (pending.max() - pending.min()).items()
+            }
+
+        n_workers = min(self._worker_count(), len(pending))
+        results.update(
+            self._simulate_pending(
+                pending, main_params_dict, output_dict, n_workers, cache
+            )
+        )
+
         results_df = simulation_inputs.copy()
-        for index, row in simulation_inputs.iterrows():
-            logging.info(f"Processing simulation for row {index}")
-            result = self._process_variant(index, row, main_params_dict, output_dict)
-            for key, value in result.items():
+        for index in simulation_inputs.index:
+            for key, value in results[index].items():
                 results_df.loc[index, key] = value
 
         logging.info(
             "Processing simulations completed. Initiating cleanup and saving results to a variable"
         )
 
-        self._cleanup()
+        self._log_stage_timings()
+        if warm_start:
+            self._log_solver_iterations()
+        if cache is not None:
+            cache.evict()
+        if len(pending) and n_workers <= 1:
+            self._cleanup()
+
+        return pd.concat([results_df, other_columns], axis=1)
+
+    def _lookup_cached(self, cache, simulation_inputs) -> dict:
+        """
+        Collect the results of the variants already present in the cache.
+
+        Args:
+            cache (SimulationCache or None): The result cache, if enabled.
+            simulation_inputs (pd.DataFrame): The UIn and p values to simulate.
+
+        Returns:
+            dict: Row index to cached results; empty when caching is disabled.
+        """
+        results = {}
+        if cache is None:
+            return results
+        for index, row in simulation_inputs.iterrows():
+            cached_result = cache.get(row)
+            if cached_result is not None:
+                results[index] = cached_result
+        logging.info(f"Simulation cache: {cache.stats()}")
+        return results
+
+    def _simulate_pending(  # pylint: disable=R0913,R0917
+        self, pending, main_params_dict, output_dict, n_workers, cache
+    ) -> dict:
+        """
+        Simulate the variants missing from the cache, in a process pool if configured.
+
+        Args:
+            pending (pd.DataFrame): The UIn and p values still to simulate.
+            main_params_dict (dict): Configuration parameters for the simulation.
+            output_dict (dict): Dictionary specifying output file paths and keys.
+            n_workers (int): Number of variants simulated at once.
+            cache (SimulationCache or None): The result cache new results are stored in.
+
+        Returns:
+            dict: Row index to simulation results.
+        """
+        if n_workers > 1:
+            pending_results = self._simulate_parallel(
+                pending, main_params_dict, output_dict, n_workers
+            )
+        else:
+            pending_results = [
+                self._process_variant(index, row, main_params_dict, output_dict)
+                for index, row in pending.iterrows()
+            ]
+
+        results = {}
+        for (index, row), result in zip(pending.iterrows(), pending_results):
+            results[index] = result
+            if cache is not None:
+                cache.put(row, result)
+        return results
+
+    def _create_cache(self, main_params_dict, output_dict) -> Optional[SimulationCache]:
+        """
+        Create the simulation result cache if it is enabled in the configuration.
+
+        Args:
+            main_params_dict (dict): Configuration parameters for the simulation.
+            output_dict (dict): Dictionary specifying output file paths and keys.
+
+        Returns:
+            SimulationCache or None: The cache, or None when caching is disabled.
+        """
+        cache_config = self.config.get("cache", {})
+        if not cache_config.get("enabled"):
+            return None
+        return SimulationCache(
+            cache_config["location"],
+            self.case_path,
+            {"main": main_params_dict, "simulation_output": output_dict},
+            cache_config["max_entries"],
+        )
+
+    def _warm_start_enabled(self) -> bool:
+        """
+        Check whether solves are seeded from previously solved operating points.
+
+        Returns:
+            bool: True if warm start is enabled in the configuration.
+        """
+        return bool(self.config.get("warm_start", {}).get("enabled"))
+
+    def _worker_count(self) -> int:
+        """
+        Resolve the number of variants to simulate at once.
+
+        Returns:
+            int: The configured worker count, or the number of CPUs available to the process.
+        """
+        workers = self.config.get("parallel", {}).get("workers")
+        if workers:
+            return int(workers)
+        if hasattr(os, "sched_getaffinity"):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+
+    def _simulate_parallel(
+        self, simulation_inputs, main_params_dict, output_dict, n_workers
+    ) -> list:
+        """
+        Run the variants in a process pool, each worker owning a private copy of the case.
+
+        Args:
+            simulation_inputs (pd.DataFrame): The UIn and p values to simulate.
+            main_params_dict (dict): Configuration parameters for the simulation.
+            output_dict (dict): Dictionary specifying output file paths and keys.
+            n_workers (int): Number of worker processes.
+
+        Returns:
+            list: The simulation results, in the row order of `simulation_inputs`.
+        """
+        logging.info(
+            f"Running {len(simulation_inputs)} variants on {n_workers} workers"
+        )
+        workspace_root = self.config["parallel"]["workspace"]
+        os.makedirs(workspace_root, exist_ok=True)
+        workspace = tempfile.mkdtemp(prefix="run_", dir=workspace_root)
+
+        indices = list(simulation_inputs.index)
+        rows = [row for _, row in simulation_inputs.iterrows()]
+        # With warm start each worker gets a contiguous slice of the sorted variants,
+        # so its neighbours are solved in the same case directory
+        chunksize = -(-len(rows) // n_workers) if self._warm_start_enabled() else 1
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_worker,
+                initargs=(self, workspace),
+            ) as executor:
+                outcomes = list(
+                    executor.map(
+                        _run_worker_variant,
+                        indices,
+                        rows,
+                        [main_params_dict] * len(rows),
+                        [output_dict] * len(rows),
+                        chunksize=chunksize,
+                    )
+                )
+        finally:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+        results = []
+        for index, (result, diagnostics) in zip(indices, outcomes):
+            results.append(result)
+            for stage, stage_timings in diagnostics["stage_timings"].items():
+                self.stage_timings[stage].extend(stage_timings)
+            if diagnostics["solver_iterations"] is not None:
+                self.solver_iterations[index] = diagnostics["solver_iterations"]
+            if diagnostics["probe_history"]:
+                self.probe_histories[index] = diagnostics["probe_history"]
+        return results
+
+    def _run_stage(self, stage: str, command: list) -> None:
+        """
+        Run one subprocess of the simulation chain and record its wall-clock time.
+
+        Args:
+            stage (str): Name of the stage the timing is recorded under.
+            command (list): The command to run.
+        """
+        start = time.perf_counter()
+        subprocess.run(command, check=True)
+        self.stage_timings[stage].append(time.perf_counter() - start)
+
+    def _log_stage_timings(self) -> None:
+        """
+        Log the per-stage timings of this run and the mesh time saved by reusing meshes.
+        """
+        for stage, timings in self.stage_timings.items():
+            if stage == "mesh_reused" or not timings:
+                continue
+            logging.info(
+                f"Stage {stage}: {len(timings)} runs, total {sum(timings):.1f}s, "
+                f"mean {sum(timings) / len(timings):.2f}s"
+            )
+
+        mesh_timings = self.stage_timings["mesh"]
+        n_reused = len(self.stage_timings["mesh_reused"])
+        if mesh_timings and n_reused:
+            saved = n_reused * sum(mesh_timings) / len(mesh_timings)
+            logging.info(
+                f"Mesh reused for {n_reused} of {n_reused + len(mesh_timings)} variants, "
+                f"saving about {saved:.1f}s of mesh time"
+            )
+
+    def _log_solver_iterations(self) -> None:
+        """
+        Log the solver iteration counts of cold- and warm-started variants.
+        """
+        for warm in (False, True):
+            counts = [
+                record["iterations"]
+                for record in self.solver_iterations.values()
+                if record["warm_start"] is warm
+            ]
+            if counts:
+                label = "Warm-started" if warm else "Cold-started"
+                logging.info(
+                    f"{label} solves: {len(counts)}, "
+                    f"mean iterations {sum(counts) / len(counts):.0f}"
+                )
+
+    def _seed_from_nearest(self, row, geometry) -> bool:
+        """
+        Replace the initial internal fields with those of the nearest solved variant.
 
-        final_df = pd.concat([results_df, other_columns], axis=1)
+        Only variants solved on the same mesh are considered, and the boundary conditions
+        generated for the current variant are left untouched.
 
-        return final_df
+        Args:
+            row: The parameters of the variant about to be solved.
+            geometry (tuple): Values of the mesh-affecting parameters.
+
+        Returns:
+            bool: True if the case was seeded, False if it starts from 0.org.
+        """
+        candidates = self._solved_fields[(self.case_path, geometry)]
+        if not candidates:
+            return False
+
+        def distance(candidate):
+            params, _ = candidate
+            return sum(
+                ((float(row[name]) - value) / self._parameter_scale.get(name, 1.0)) ** 2
+                for name, value in params.items()
+            )
+
+        params, fields = min(candidates, key=distance)
+        logging.info(f"Warm-starting from solved variant {params}")
+        write_internal_fields(os.path.join(self.case_path, "0"), fields)
+        return True
 
     def _process_variant(  # pylint: disable=R0914
         self, index, row, main_params_dict, output_dict
@@ -74,6 +364,10 @@ class OpenFoamHandler:  # pylint: disable=R0903
         """
         Process a single simulation variant.
 
+        The mesher only runs when the variant's mesh-affecting parameters differ from
+        the mesh already present in the case; otherwise only the boundary conditions are
+        regenerated and the solver re-run.
+
         Args:
             index: Index of the row being processed.
             row: A row from the DataFrame containing input data for the simulation.
@@ -92,29 +386,66 @@ class OpenFoamHandler:  # pylint: disable=R0903
                 line = f"{key} {value};\n"
                 parameter_file.write(line)
 
-        subprocess.run(["pyFoamClearCase.py", self.case_path], check=True)
-        parameter_arg = f"--parameter-file={parameter_file_name}"
-        subprocess.run(
-            ["pyFoamPrepareCase.py", self.case_path, parameter_arg], check=True
-        )
+        geometry = tuple(row[name] for name in sorted(self.mesh_parameters))
+        reuse_mesh = self._meshed_geometry == (self.case_path, geometry)
+
+        # The mesher is run explicitly below, so PyFoam never creates the mesh itself.
+        # The clear stage still runs for every variant to drop the previous variant's time
+        # directories and probes; PyFoam's clearing never removes constant/polyMesh, so a
+        # reused mesh survives it. Prepare skips its own clear then, as that would also
+        # run a clearCase.sh script of the case, which may delete the mesh.
+        prepare_command = [
+            "pyFoamPrepareCase.py",
+            self.case_path,
+            f"--parameter-file={parameter_file_name}",
+            "--no-mesh-create",
+        ]
+        if reuse_mesh:
+            prepare_command.append("--no-clear")
+
+        self._run_stage("clear", ["pyFoamClearCase.py", self.case_path])
+        self._run_stage("prepare", prepare_command)
         os.remove(parameter_file_name)
 
         logging.info("Running OpenFOAM simulation")
         mesher = main_params_dict["mesher"]
         solver = main_params_dict["solver"]
-        subprocess.run([mesher, "-case", self.case_path], check=True)
-        subprocess.run([solver, "-case", self.case_path], check=True)
+        if reuse_mesh:
+            logging.info(f"Reusing {mesher} output for geometry {geometry}")
+            self.stage_timings["mesh_reused"].append(0.0)
+        else:
+            self._meshed_geometry = None
+            self._run_stage("mesh", [mesher, "-case", self.case_path])
+            self._meshed_geometry = (self.case_path, geometry)
+
+        warm_start = self._warm_start_enabled()
+        seeded = warm_start and self._seed_from_nearest(row, geometry)
+        self._run_stage("solve", [solver, "-case", self.case_path])
+
+        if warm_start:
+            final_time, final_dir = latest_time_directory(self.case_path)
+            self.solver_iterations[index] = {
+                "iterations": solver_iteration_count(self.case_path, final_time),
+                "warm_start": seeded,
+            }
+            field_names = os.listdir(os.path.join(self.case_path, "0"))
+            self._solved_fields[(self.case_path, geometry)].append(
+                (
+                    {name: float(value) for name, value in row.items()},
+                    read_internal_fields(final_dir, field_names),
+                )
+            )
 
         logging.info("Simulation completed. Extracting results")
+        start = time.perf_counter()
 
         output_results = {}
         for key, value in output_dict.items():
             output_file_path = self.case_path + value
 
-            with open(output_file_path, encoding="utf-8") as result_file:
-                for line in result_file:
-                    pass
-                last_line = line.strip()
+            last_line = read_last_line(output_file_path)
+            if self.config.get("probe_history", {}).get("enabled"):
+                self.probe_histories[index][key] = read_probe_series(output_file_path)
 
             output_values = last_line.split()
 
@@ -124,6 +455,7 @@ class OpenFoamHandler:  # pylint: disable=R0903
                 formatted_key = f"OUT_{key}_{idx}"
                 output_results[formatted_key] = val
 
+        self.stage_timings["extract"].append(time.perf_counter() - start)
         return output_results
 
     def _cleanup(self):
@@ -147,3 +479,162 @@ class OpenFoamHandler:  # pylint: disable=R0903
             os.remove(rm_string_3)
         except OSError:
             pass
+
+
+def _init_worker(handler: OpenFoamHandler, workspace: str):
+    """
+    Pool initializer: clone the case template into a directory owned by this worker.
+
+    Args:
+        handler (OpenFoamHandler): The handler whose case template and config are used.
+        workspace (str): Parent directory for the worker case copies.
+    """
+    global _WORKER_HANDLER  # pylint: disable=global-statement
+    worker_dir = tempfile.mkdtemp(prefix="worker_", dir=workspace)
+    case_path = os.path.join(worker_dir, os.path.basename(handler.case_path))
+    shutil.copytree(handler.case_path, case_path)
+    handler.case_path = case_path
+    _WORKER_HANDLER = handler
+
+
+def _run_worker_variant(index, row, main_params_dict, output_dict) -> tuple:
+    """
+    Simulate one variant inside a pool worker.
+
+    Returns:
+        tuple: (simulation results, diagnostics recorded for this variant)
+    """
+    handler = _WORKER_HANDLER
+    handler.stage_timings = defaultdict(list)
+    result = handler._process_variant(  # pylint: disable=protected-access
+        index, row, main_params_dict, output_dict
+    )
+    diagnostics = {
+        "stage_timings": dict(handler.stage_timings),
+        "solver_iterations": handler.solver_iterations.pop(index, None),
+        "probe_history": handler.probe_histories.pop(index, None),
+    }
+    return result, diagnostics
+
+
+def find_mesh_parameters(case_path: str, parameter_names) -> set:
+    """
+    Find the parameters that are referenced by templates feeding the mesher.
+
+    Only templates under `system/` and `constant/` can change the mesh; parameters used
+    solely in `0.org` (boundary conditions) leave it untouched.
+
+    Args:
+        case_path (str): Path to the OpenFOAM case template.
+        parameter_names (list): Names of the variant parameters.
+
+    Returns:
+        set: The parameter names used by mesh-related templates.
+    """
+    expressions = []
+    for directory in MESH_DIRECTORIES:
+        pattern = os.path.join(case_path, directory, "**", "*")
+        for path in glob.glob(pattern, recursive=True):
+            if os.path.isfile(path) and path.endswith(TEMPLATE_EXTENSIONS):
+                with open(path, encoding="utf-8") as template_file:
+                    expressions.extend(
+                        "".join(groups)
+                        for groups in TEMPLATE_EXPRESSION.findall(template_file.read())
+                    )
+
+    used_names = set()
+    for expression in expressions:
+        used_names.update(re.findall(r"[A-Za-z_]\w*", expression))
+    return {name for name in parameter_names if name in used_names}
+
+
+def latest_time_directory(case_path: str) -> tuple:
+    """
+    Find the latest time directory written by the solver.
+
+    Args:
+        case_path (str): Path to the OpenFOAM case.
+
+    Returns:
+        tuple: (time value, path of the time directory)
+    """
+    times = []
+    for name in os.listdir(case_path):
+        path = os.path.join(case_path, name)
+        try:
+            times.append((float(name), path))
+        except ValueError:
+            continue
+    return max(times) if times else (0.0, os.path.join(case_path, "0"))
+
+
+def solver_iteration_count(case_path: str, final_time: float) -> int:
+    """
+    Number of solver time steps taken to reach the final time directory.
+
+    Steady solvers advance by `deltaT` per iteration from `startTime`, both read from
+    system/controlDict (defaults 1 and 0). The final time is always written when the
+    solver converges or stops, independently of `writeInterval`.
+
+    Args:
+        case_path (str): Path to the OpenFOAM case.
+        final_time (float): Time value of the latest time directory.
+
+    Returns:
+        int: The iteration count.
+    """
+    with open(
+        os.path.join(case_path, "system", "controlDict"), encoding="utf-8"
+    ) as control_file:
+        control = control_file.read()
+
+    def entry(name, default):
+        match = re.search(rf"^\s*{name}\s+([^;\s]+)\s*;", control, re.MULTILINE)
+        return float(match.group(1)) if match else default
+
+    return round((final_time - entry("startTime", 0.0)) / entry("deltaT", 1.0))
+
+
+def read_internal_fields(time_dir: str, field_names) -> dict:
+    """
+    Read the internalField entries of the given fields from a time directory.
+
+    Args:
+        time_dir (str): Path of the time directory.
+        field_names (list): Names of the field files to read.
+
+    Returns:
+        dict: Field name to its full `internalField ...;` entry.
+    """
+    fields = {}
+    for name in field_names:
+        path = os.path.join(time_dir, name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, encoding="utf-8", errors="ignore") as field_file:
+            match = INTERNAL_FIELD.search(field_file.read())
+        if match:
+            fields[name] = match.group(0)
+    return fields
+
+
+def write_internal_fields(time_dir: str, fields: dict) -> None:
+    """
+    Replace the internalField entries of field files, keeping their boundary conditions.
+
+    Args:
+        time_dir (str): Path of the time directory holding the field files.
+        fields (dict): Field name to the `internalField ...;` entry to write.
+    """
+    for name, internal_field in fields.items():
+        path = os.path.join(time_dir, name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, encoding="utf-8") as field_file:
+            content = field_file.read()
+        # A function replacement keeps backslashes in the entry from being expanded
+        content = INTERNAL_FIELD.sub(
+            lambda _, entry=internal_field: entry, content, count=1
+        )
+        with open(path, "w", encoding="utf-8") as field_file:
+            field_file.write(content)
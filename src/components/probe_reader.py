@@ -0,0 +1,77 @@
+"""
+Module for reading OpenFOAM probe output.
+
+Probe files under `postProcessing/probes/<time>/` grow by one line per written time step.
+This module provides a reader that fetches only the final record by seeking from the end
+of the file, and a vectorized parser for the full time series when convergence history
+is needed.
+"""
+
+import os
+
+import numpy as np
+
+BLOCK_SIZE = 8192
+
+
+def read_last_line(path: str, block_size: int = BLOCK_SIZE) -> str:
+    """
+    Read the last non-empty line of a file by reading backwards in blocks.
+
+    Args:
+        path (str): Path to the file.
+        block_size (int, optional): Number of bytes read per step. Defaults to 8192.
+
+    Returns:
+        str: The last non-empty line, stripped of surrounding whitespace.
+    """
+    with open(path, "rb") as probe_file:
+        position = probe_file.seek(0, os.SEEK_END)
+        tail = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            probe_file.seek(position)
+            tail = probe_file.read(step) + tail
+
+            stripped = tail.rstrip()
+            newline = stripped.rfind(b"\n")
+            if newline != -1:
+                return stripped[newline + 1 :].strip().decode("utf-8")
+
+    return tail.strip().decode("utf-8")
+
+
+def read_probe_series(path: str) -> np.ndarray:
+    """
+    Parse a whole probe file into a 2D array in one vectorized call.
+
+    Header lines starting with `#` are skipped and vector values such as `(1 0 0)` are
+    flattened into separate columns.
+
+    Args:
+        path (str): Path to the probe file.
+
+    Returns:
+        np.ndarray: Array of shape (n_times, n_columns); column 0 holds the time.
+    """
+    with open(path, "rb") as probe_file:
+        raw = probe_file.read()
+
+    body_start = 0
+    while raw.startswith(b"#", body_start):
+        newline = raw.find(b"\n", body_start)
+        if newline == -1:
+            return np.empty((0, 0))
+        body_start = newline + 1
+
+    body = raw[body_start:].translate(None, b"()")
+    first_line = body.split(b"\n", 1)[0]
+    n_columns = len(first_line.split())
+    if n_columns == 0:
+        return np.empty((0, 0))
+
+    values = np.fromstring(body.decode("utf-8"), dtype=np.float64, sep=" ")
+    # Drop a partially written last record
+    n_rows = len(values) // n_columns
+    return values[: n_rows * n_columns].reshape(n_rows, n_columns)
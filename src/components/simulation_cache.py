@@ -0,0 +1,375 @@
+"""
+Module for caching OpenFOAM simulation results.
+
+This module provides a class `SimulationCache` that stores the extracted results of a
+simulation variant under a content address built from the variant parameters, a hash of
+the case template and the solver configuration. Entries live in a local directory or under
+an S3 prefix, so repeated operating points skip the mesh and solve entirely.
+"""
+
+import hashlib
+import json
+import os
+from typing import Optional
+
+import pandas as pd
+
+from src.components.aws_clients import get_client
+from src.logger import logging
+
+# Directories and files produced by a run rather than belonging to the case template
+GENERATED_DIRS = {"postProcessing", "dynamicCode", "VTK"}
+GENERATED_PREFIXES = ("PyFoam", "processor", "log.")
+GENERATED_SUFFIXES = (".foam", ".log")
+# PyFoam templates; the file rendered from one is generated per variant
+TEMPLATE_EXTENSIONS = (".template", ".postTemplate", ".finalTemplate")
+
+
+def hash_case_template(case_path: str) -> str:
+    """
+    Compute a content hash of an OpenFOAM case template.
+
+    Solver output (time directories, postProcessing, the generated mesh and PyFoam files)
+    and files rendered from a PyFoam template (e.g. `0.org/U` next to `0.org/U.template`)
+    are skipped, so the hash only changes when the inputs of the case change and not
+    with the variant that last ran in the case directory.
+
+    Args:
+        case_path (str): Path to the OpenFOAM case directory.
+
+    Returns:
+        str: Hex digest of the template files and their relative paths.
+    """
+    has_original_zero = os.path.isdir(os.path.join(case_path, "0.org"))
+    digest = hashlib.sha256()
+
+    for root, dirs, files in os.walk(case_path):
+        rel_root = os.path.relpath(root, case_path)
+        dirs[:] = sorted(
+            d
+            for d in dirs
+            if not _is_generated(
+                os.path.normpath(os.path.join(rel_root, d)), has_original_zero
+            )
+        )
+        rendered = {
+            name[: -len(extension)]
+            for name in files
+            for extension in TEMPLATE_EXTENSIONS
+            if name.endswith(extension)
+        }
+        for name in sorted(files):
+            rel_path = os.path.normpath(os.path.join(rel_root, name))
+            if name.startswith(GENERATED_PREFIXES) or name.endswith(GENERATED_SUFFIXES):
+                continue
+            if name in rendered:
+                continue
+            digest.update(rel_path.encode("utf-8"))
+            with open(os.path.join(root, name), "rb") as case_file:
+                digest.update(hashlib.sha256(case_file.read()).digest())
+
+    return digest.hexdigest()
+
+
+def _is_generated(rel_dir: str, has_original_zero: bool) -> bool:
+    """
+    Check whether a case sub-directory is produced by a run.
+
+    Args:
+        rel_dir (str): Directory path relative to the case root.
+        has_original_zero (bool): Whether the case keeps its initial fields in 0.org.
+
+    Returns:
+        bool: True if the directory should not contribute to the template hash.
+    """
+    if rel_dir in GENERATED_DIRS or rel_dir.startswith(GENERATED_PREFIXES):
+        return True
+    if rel_dir == os.path.join("constant", "polyMesh"):
+        return True
+    try:
+        time_value = float(rel_dir)
+    except ValueError:
+        return False
+    return has_original_zero or time_value != 0
+
+
+class SimulationCache:
+    """
+    Persistent, content-addressed cache of simulation results.
+
+    Attributes:
+        location (str): Local directory or `s3://bucket/prefix` holding the entries.
+        max_entries (int): Number of entries above which the store is evicted.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that required a simulation.
+    """
+
+    def __init__(
+        self, location: str, case_path: str, solver_config: dict, max_entries: int
+    ):
+        """
+        Initialize the SimulationCache instance.
+
+        Args:
+            location (str): Local directory or `s3://bucket/prefix` for the entries.
+            case_path (str): Path to the OpenFOAM case template.
+            solver_config (dict): Solver settings that influence the results.
+            max_entries (int): Number of entries above which the store is evicted.
+        """
+        self.location = location
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Entries in the store, counted on the first write and tracked from then on
+        self._entries = None
+
+        config_blob = json.dumps(solver_config, sort_keys=True, default=str)
+        self.namespace = hashlib.sha256(
+            (hash_case_template(case_path) + config_blob).encode("utf-8")
+        ).hexdigest()
+
+        if location.startswith("s3://"):
+            self.store = _S3Store(location)
+        else:
+            self.store = _LocalStore(location)
+
+    def key(self, row: pd.Series) -> str:
+        """
+        Build the content address of a variant.
+
+        Args:
+            row (pd.Series): The variant parameters, e.g. UIn and p.
+
+        Returns:
+            str: Hex digest identifying the variant for this template and config.
+        """
+        params = {str(name): _normalize(value) for name, value in row.items()}
+        blob = json.dumps(
+            {"namespace": self.namespace, "params": params}, sort_keys=True
+        )
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, row: pd.Series) -> Optional[dict]:
+        """
+        Look up the results of a variant.
+
+        Args:
+            row (pd.Series): The variant parameters.
+
+        Returns:
+            dict or None: The cached simulation results, or None on a miss.
+        """
+        try:
+            entry = self.store.read(self.key(row))
+        except Exception as e:  # pylint: disable=broad-except
+            logging.warning(f"Simulation cache lookup failed: {e}")
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry["result"]
+
+    def put(self, row: pd.Series, result: dict) -> None:
+        """
+        Store the results of a variant.
+
+        Args:
+            row (pd.Series): The variant parameters.
+            result (dict): The simulation results to cache.
+        """
+        entry = {
+            "params": {str(name): _normalize(value) for name, value in row.items()},
+            "result": result,
+        }
+        try:
+            self.store.write(self.key(row), entry)
+            if self._entries is None:
+                self._entries = self.store.count()
+            else:
+                self._entries += 1
+        except Exception as e:  # pylint: disable=broad-except
+            logging.warning(f"Simulation cache write failed: {e}")
+
+    def evict(self) -> int:
+        """
+        Remove entries above `max_entries`.
+
+        A local store removes the least recently used entries; an S3 store has no
+        access times and removes the oldest written ones. The store is only listed
+        when writes of this instance pushed it over the limit, so runs answered
+        entirely from the cache never scan it.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        if self._entries is None or self._entries <= self.max_entries:
+            return 0
+        try:
+            removed = self.store.evict(self.max_entries)
+        except Exception as e:  # pylint: disable=broad-except
+            logging.warning(f"Simulation cache eviction failed: {e}")
+            return 0
+        self._entries -= removed
+        if removed:
+            logging.info(f"Evicted {removed} simulation cache entries")
+        return removed
+
+    def stats(self) -> dict:
+        """
+        Return the hit and miss counters.
+
+        Returns:
+            dict: Hits, misses and hit ratio of this cache instance.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _normalize(value):
+    """
+    Convert a parameter value into a stable, JSON-serializable form.
+    """
+    try:
+        return repr(float(value))
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class _LocalStore:
+    """
+    Cache entries stored as JSON files in a local directory.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def read(self, key: str) -> Optional[dict]:
+        """
+        Return the entry stored under `key`, or None if there is none.
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+        except FileNotFoundError:
+            return None
+        # Refresh the modification time so eviction is least-recently-used
+        os.utime(path)
+        return entry
+
+    def write(self, key: str, entry: dict) -> None:
+        """
+        Store an entry atomically under `key`.
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as entry_file:
+            json.dump(entry, entry_file)
+        os.replace(tmp_path, path)
+
+    def _scan(self) -> list:
+        return [
+            entry
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(".json")
+        ]
+
+    def count(self) -> int:
+        """
+        Return the number of stored entries.
+        """
+        return len(self._scan())
+
+    def evict(self, max_entries: int) -> int:
+        """
+        Remove the least recently read or written entries above `max_entries`.
+        """
+        entries = self._scan()
+        if len(entries) <= max_entries:
+            return 0
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        stale = entries[: len(entries) - max_entries]
+        for entry in stale:
+            os.remove(entry.path)
+        return len(stale)
+
+
+class _S3Store:
+    """
+    Cache entries stored as JSON objects under an S3 prefix.
+    """
+
+    def __init__(self, uri: str):
+        bucket, _, prefix = uri[len("s3://") :].partition("/")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.s3_client = get_client("s3")
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}.json" if self.prefix else f"{key}.json"
+
+    def read(self, key: str) -> Optional[dict]:
+        """
+        Return the entry stored under `key`, or None if there is none.
+        """
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self._key(key))
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        return json.loads(response["Body"].read())
+
+    def write(self, key: str, entry: dict) -> None:
+        """
+        Store an entry under `key`.
+        """
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            Body=json.dumps(entry).encode("utf-8"),
+            ContentType="application/json",
+        )
+
+    def _objects(self) -> list:
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        prefix = f"{self.prefix}/" if self.prefix else ""
+        return [
+            obj
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+            if obj["Key"].endswith(".json")
+        ]
+
+    def count(self) -> int:
+        """
+        Return the number of stored entries.
+        """
+        return len(self._objects())
+
+    def evict(self, max_entries: int) -> int:
+        """
+        Remove the oldest written entries above `max_entries`.
+        """
+        # S3 has no access time, so entries are evicted in write order
+        objects = self._objects()
+        if len(objects) <= max_entries:
+            return 0
+        objects.sort(key=lambda obj: obj["LastModified"])
+        stale = objects[: len(objects) - max_entries]
+        for start in range(0, len(stale), 1000):
+            batch = stale[start : start + 1000]
+            self.s3_client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": obj["Key"]} for obj in batch]},
+            )
+        return len(stale)
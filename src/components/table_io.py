@@ -0,0 +1,249 @@
+"""
+Table I/O Module.
+
+Reads and writes the tabular artifacts exchanged between pipeline stages (splits/,
+simulated/ and combined/) in either CSV or Parquet. Parquet files are written with an
+explicit Arrow schema and compression, CSV stays available for back-compatibility.
+
+Example:
+    from src.components.table_io import read_table, write_table
+
+    write_table(df, "/tmp/chunk_001.parquet", "parquet")
+    df = read_table("/tmp/chunk_001.parquet")
+"""
+
+import io
+from typing import Iterator, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+FORMATS = {
+    "csv": {"extension": ".csv", "content_type": "text/csv"},
+    "parquet": {"extension": ".parquet", "content_type": "application/x-parquet"},
+}
+
+
+def file_extension(file_format: str) -> str:
+    """
+    Return the file extension for a table format.
+
+    Args:
+        file_format (str): "csv" or "parquet".
+
+    Returns:
+        str: The extension including the leading dot.
+    """
+    return FORMATS[file_format]["extension"]
+
+
+def content_type(file_format: str) -> str:
+    """
+    Return the HTTP content type for a table format.
+
+    Args:
+        file_format (str): "csv" or "parquet".
+
+    Returns:
+        str: The MIME type used for S3 objects and SageMaker requests.
+    """
+    return FORMATS[file_format]["content_type"]
+
+
+def format_from_name(name: str) -> str:
+    """
+    Infer the table format from a file name or S3 key.
+
+    Args:
+        name (str): File name, path or S3 key.
+
+    Returns:
+        str: "parquet" for .parquet files, otherwise "csv".
+    """
+    return "parquet" if name.endswith(".parquet") else "csv"
+
+
+def arrow_schema(df: pd.DataFrame) -> pa.Schema:
+    """
+    Build an explicit Arrow schema for a DataFrame.
+
+    Integer, float and boolean columns keep 64-bit numeric types; any other column
+    is stored as a string.
+
+    Args:
+        df (pd.DataFrame): The data to describe.
+
+    Returns:
+        pa.Schema: One field per column, in column order.
+    """
+    fields = []
+    for name, dtype in df.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            arrow_type = pa.bool_()
+        elif pd.api.types.is_integer_dtype(dtype):
+            arrow_type = pa.int64()
+        elif pd.api.types.is_float_dtype(dtype):
+            arrow_type = pa.float64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(str(name), arrow_type))
+    return pa.schema(fields)
+
+
+def write_table(
+    df: pd.DataFrame,
+    target: Union[str, io.BytesIO],
+    file_format: str,
+    compression: str = "zstd",
+) -> None:
+    """
+    Write a DataFrame without its index as CSV or Parquet.
+
+    Text columns holding only numbers, such as probe values parsed from OpenFOAM
+    output, are stored as numbers in Parquet, matching what a CSV reader infers.
+
+    Args:
+        df (pd.DataFrame): The data to write.
+        target (str or BytesIO): Local path or in-memory buffer.
+        file_format (str): "csv" or "parquet".
+        compression (str, optional): Parquet compression codec. Defaults to "zstd".
+    """
+    if file_format == "parquet":
+        df = df.apply(_numeric_or_text)
+        schema = arrow_schema(df)
+        pq.write_table(_to_arrow(df, schema), target, compression=compression)
+    else:
+        if isinstance(target, io.BytesIO):
+            target.write(df.to_csv(index=False).encode("utf-8"))
+        else:
+            df.to_csv(target, index=False)
+
+
+class TableWriter:
+    """
+    Incremental writer that appends DataFrame chunks to one CSV or Parquet file.
+
+    The column types of the first chunk fix the Parquet schema; later chunks are cast
+    to it. Use as a context manager so the file is closed when writing ends.
+    """
+
+    def __init__(self, path: str, file_format: str, compression: str = "zstd"):
+        """
+        Initialize the TableWriter instance.
+
+        Args:
+            path (str): Local path of the output file.
+            file_format (str): "csv" or "parquet".
+            compression (str, optional): Parquet compression codec. Defaults to "zstd".
+        """
+        self.path = path
+        self.file_format = file_format
+        self.compression = compression
+        self.rows = 0
+        self._schema: Optional[pa.Schema] = None
+        self._writer: Optional[pq.ParquetWriter] = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        """
+        Append a chunk of rows to the file.
+
+        Args:
+            df (pd.DataFrame): The chunk, with the same columns as previous chunks.
+        """
+        if self.file_format == "parquet":
+            df = df.apply(_numeric_or_text)
+            if self._writer is None:
+                self._schema = arrow_schema(df)
+                self._writer = pq.ParquetWriter(
+                    self.path, self._schema, compression=self.compression
+                )
+            self._writer.write_table(_to_arrow(df, self._schema))
+        else:
+            first = self.rows == 0
+            df.to_csv(self.path, mode="w" if first else "a", header=first, index=False)
+        self.rows += len(df)
+
+    def close(self) -> None:
+        """
+        Finish the file.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _to_arrow(df: pd.DataFrame, schema: pa.Schema) -> pa.Table:
+    """
+    Convert a DataFrame to an Arrow table with the given schema.
+    """
+    df = df.copy()
+    df.columns = schema.names
+    for field in schema:
+        if field.type == pa.string():
+            column = df[field.name]
+            df[field.name] = column.where(column.isna(), column.astype(str))
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def _numeric_or_text(column: pd.Series) -> pd.Series:
+    """
+    Convert an object column to numbers if every value parses as one.
+    """
+    if column.dtype != object:
+        return column
+    try:
+        return pd.to_numeric(column)
+    except (ValueError, TypeError):
+        return column
+
+
+def read_table(source, name: str = "") -> pd.DataFrame:
+    """
+    Read a CSV or Parquet table.
+
+    Args:
+        source: Local path or file-like object.
+        name (str, optional): File name or S3 key used to infer the format when
+            `source` is not a path. Defaults to "".
+
+    Returns:
+        pd.DataFrame: The loaded data.
+    """
+    name = name or (source if isinstance(source, str) else "")
+    if format_from_name(name) == "parquet":
+        if not isinstance(source, str):
+            # Parquet footers are read first, which needs a seekable file
+            source = io.BytesIO(source.read())
+        return pq.read_table(source).to_pandas()
+    return pd.read_csv(source)
+
+
+def iter_table(
+    source, name: str = "", chunksize: int = 100_000
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Parquet table as DataFrame chunks.
+
+    Args:
+        source: Local path or file-like object.
+        name (str, optional): File name or S3 key used to infer the format. Defaults to "".
+        chunksize (int, optional): Number of rows per chunk. Defaults to 100000.
+
+    Yields:
+        pd.DataFrame: Consecutive row chunks of the table.
+    """
+    name = name or (source if isinstance(source, str) else "")
+    if format_from_name(name) == "parquet":
+        if not isinstance(source, str):
+            source = io.BytesIO(source.read())
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize)
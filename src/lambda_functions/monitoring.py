@@ -1,20 +1,63 @@
 import json
 import os
+import shutil
+import tempfile
+import time
 import traceback
-import boto3
+import numpy as np
 import pandas as pd
 import mlflow
 
 from src.logger import logging
+from src.components.aws_clients import get_client
+from src.components.drift_stats import BASELINE_ARTIFACT, BASELINE_TAG, DriftAccumulator, drift_statistics
+from src.components.table_io import iter_table
 from src.components.mlflow_utils import setup_mlflow
+from src.utility import get_cfg
+
+
+BASELINE_CACHE_DIR = os.environ.get("BASELINE_CACHE_DIR", "/tmp/baseline_stats")
+
+# Newest baseline run found and when, kept across warm invocations of the Lambda
+_baseline_lookup = {"run_id": None, "checked_at": None}
 
 
 def get_latest_run_with_baseline():
+    """Id of the newest finished run with baseline statistics
+
+    Training tags such runs, so one filtered search finds them; runs from before the
+    tag existed are found by scanning artifacts as a fallback. The result is reused
+    for BASELINE_LOOKUP_TTL seconds, so warm invocations skip the search entirely.
+    A baseline trained within that window is therefore picked up only once it ends,
+    up to BASELINE_LOOKUP_TTL seconds late; BASELINE_LOOKUP_TTL=0 searches on every
+    invocation. The cached run is dropped when its baseline fails to load (see
+    lambda_handler), so a deleted run is not retried for the rest of the window.
+    """
+    ttl = float(os.environ.get("BASELINE_LOOKUP_TTL", "300"))
+    checked_at = _baseline_lookup["checked_at"]
+    if checked_at is not None and time.monotonic() - checked_at < ttl:
+        logging.info(f"Using cached baseline run {_baseline_lookup['run_id']}")
+        return _baseline_lookup["run_id"]
+
     client = mlflow.tracking.MlflowClient()
 
     experiment = client.get_experiment_by_name("Default")
     experiment_id = experiment.experiment_id
 
+    runs = client.search_runs(
+        experiment_ids=[experiment_id],
+        filter_string=f"attributes.status = 'FINISHED' and tags.{BASELINE_TAG} = 'true'",
+        order_by=["start_time DESC"],
+        max_results=1,
+    )
+    run_id = runs[0].info.run_id if runs else find_untagged_run_with_baseline(client, experiment_id)
+
+    _baseline_lookup.update(run_id=run_id, checked_at=time.monotonic())
+    return run_id
+
+def find_untagged_run_with_baseline(client, experiment_id):
+    """Scan the artifacts of recent runs for baseline statistics, for runs trained before tagging"""
+    logging.info(f"No run tagged with {BASELINE_TAG}; scanning artifacts of recent runs")
     runs = client.search_runs(
         experiment_ids=[experiment_id],
         filter_string="attributes.status = 'FINISHED'",
@@ -26,45 +69,91 @@ def get_latest_run_with_baseline():
         try:
             files = client.list_artifacts(run.info.run_id)
             filenames = [f.path for f in files]
-            if "baseline_stats.json" in filenames:
+            if BASELINE_ARTIFACT in filenames:
                 return run.info.run_id
         except Exception as e:
             logging.warning(f"Skipping run {run.info.run_id}: {e}")
 
-    raise Exception("No MLflow run found with baseline_stats.json artifact")
+    raise Exception(f"No MLflow run found with {BASELINE_ARTIFACT} artifact")
 
 def load_baseline_stats_from_mlflow(run_id):
-    with mlflow.start_run(run_id=run_id):
-        local_path = mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path="baseline_stats.json")
-        with open(local_path, "r") as f:
-            return json.load(f)
+    """Baseline statistics of a run, downloaded once and then read from the local cache
+
+    Artifacts of a run do not change, so the cache is keyed by run id only.
+    """
+    cache_path = os.path.join(BASELINE_CACHE_DIR, f"{run_id}.json")
+    if not os.path.exists(cache_path):
+        os.makedirs(BASELINE_CACHE_DIR, exist_ok=True)
+        download_dir = tempfile.mkdtemp(dir=BASELINE_CACHE_DIR)
+        try:
+            local_path = mlflow.artifacts.download_artifacts(
+                run_id=run_id, artifact_path=BASELINE_ARTIFACT, dst_path=download_dir
+            )
+            # Renamed into place so concurrent readers never see a partial file
+            os.replace(local_path, cache_path)
+        finally:
+            shutil.rmtree(download_dir, ignore_errors=True)
+        logging.info(f"Cached baseline statistics of run {run_id} at {cache_path}")
+    else:
+        logging.info(f"Loading baseline statistics of run {run_id} from {cache_path}")
+
+    with open(cache_path, "r") as f:
+        return json.load(f)
 
 def load_prediction_data(s3_bucket, s3_key):
-    s3 = boto3.client("s3")
+    s3 = get_client("s3")
     obj = s3.get_object(Bucket=s3_bucket, Key=s3_key)
     df = pd.read_csv(obj["Body"])
     logging.info(f"Loaded prediction data: {df.shape}")
     return df
 
+def iter_prediction_data(s3_bucket, s3_key, chunksize=100_000):
+    """Stream the prediction output from S3 as DataFrame chunks instead of loading it at once"""
+    s3 = get_client("s3")
+    obj = s3.get_object(Bucket=s3_bucket, Key=s3_key)
+    logging.info(f"Streaming prediction data: {obj.get('ContentLength')} bytes in chunks of {chunksize} rows")
+    return iter_table(obj["Body"], s3_key, chunksize=chunksize)
 
-def compare_distributions(baseline_stats, pred_df, feature_names, drift_threshold=2.0):
-    drifted_features = []
-    drift_report = []
-    for i, feat in enumerate(feature_names):
-        baseline_mean = baseline_stats["mean"][i]
-        baseline_std = baseline_stats["std"][i]
-        pred_mean = pred_df[feat].mean()
-        z_score = abs(pred_mean - baseline_mean) / (baseline_std + 1e-8) if baseline_std > 0 else 0
-        logging.info(
-            f"Feature: {feat}, baseline_mean: {baseline_mean}, pred_mean: {pred_mean}, z_score: {z_score}"
-        )
-        if z_score > drift_threshold:
-            drifted_features.append(feat)
-            drift_report.append(
-                f"Feature '{feat}' drift: baseline_mean={baseline_mean:.3f}, "
-                f"pred_mean={pred_mean:.3f}, z_score={z_score:.2f}"
-            )
-    return drifted_features, drift_report
+
+def compare_distributions(baseline_stats, pred_df, feature_names, drift_threshold=2.0, psi_threshold=None):
+    """Flag features whose mean z-score, or PSI if psi_threshold is set, exceeds its threshold
+
+    All features are compared in one vectorized pass (see src.components.drift_stats).
+    Baselines without histograms are compared on the z-score only.
+
+    Returns:
+        tuple: (drifted feature names, one report line per drifted feature, per-feature statistics)
+    """
+    start = time.perf_counter()
+    stats = drift_statistics(baseline_stats, pred_df[feature_names].to_numpy(dtype="float64"))
+    logging.info(f"Compared {len(stats)} features over {len(pred_df)} rows in "
+                 f"{(time.perf_counter() - start) * 1000:.0f} ms")
+    drifted_features, drift_report = flag_drift(stats, drift_threshold, psi_threshold)
+    return drifted_features, drift_report, stats
+
+
+def flag_drift(stats, drift_threshold=2.0, psi_threshold=None):
+    """Drifted features and their report lines from the per-feature drift statistics
+
+    Features drift when their z-score exceeds drift_threshold. The PSI alert is off
+    unless psi_threshold is given, so by default the decisions are the z-score ones;
+    PSI is still computed and reported either way.
+    """
+    drifted_mask = stats["z_score"] > drift_threshold
+    if psi_threshold is not None:
+        drifted_mask |= stats["psi"] > psi_threshold
+    drifted = stats[drifted_mask]
+    logging.info(
+        f"{len(drifted)} of {len(stats)} features drifted, "
+        f"max z_score {stats['z_score'].max():.2f}, max psi {stats['psi'].max():.3f}"
+    )
+
+    drift_report = [
+        f"Feature '{feat}' drift: baseline_mean={row['baseline_mean']:.3f}, "
+        f"pred_mean={row['mean']:.3f}, z_score={row['z_score']:.2f}, psi={row['psi']:.3f}, ks={row['ks']:.3f}"
+        for feat, row in drifted.iterrows()
+    ]
+    return drifted.index.tolist(), drift_report
 
 
 def check_confidence(pred_df, threshold=0.7, ratio_threshold=0.9):
@@ -76,8 +165,63 @@ def check_confidence(pred_df, threshold=0.7, ratio_threshold=0.9):
     return low_conf_ratio >= ratio_threshold, low_conf_ratio
 
 
+class ConfidenceAccumulator:
+    """Running count of low-confidence predictions and a histogram of all confidences
+
+    Mergeable like DriftAccumulator; `check` takes the same decision as check_confidence.
+    """
+
+    def __init__(self, threshold=0.7, n_bins=20):
+        self.threshold = threshold
+        self.n_bins = n_bins
+        self.rows = 0
+        self.low = 0
+        self.histogram = np.zeros(n_bins, dtype=np.int64)
+
+    def update(self, chunk):
+        if "Confidence" not in chunk.columns:
+            raise Exception("Prediction data missing 'Confidence' column")
+        confidence = chunk["Confidence"].to_numpy(dtype="float64")
+        self.rows += len(confidence)
+        self.low += int((confidence < self.threshold).sum())
+        self.histogram += np.histogram(confidence, bins=self.n_bins, range=(0.0, 1.0))[0]
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.low += other.low
+        self.histogram += other.histogram
+        return self
+
+    def check(self, ratio_threshold=0.9):
+        low_conf_ratio = self.low / self.rows if self.rows else float("nan")
+        logging.info(f"Low confidence ratio: {low_conf_ratio}")
+        return low_conf_ratio >= ratio_threshold, low_conf_ratio
+
+
+def stream_statistics(baseline_stats, chunks, feature_names, threshold=0.7):
+    """Drift statistics and confidence counts over prediction chunks, one chunk in memory at a time
+
+    Returns:
+        tuple: (per-feature statistics as from compare_distributions, ConfidenceAccumulator)
+    """
+    start = time.perf_counter()
+    features = DriftAccumulator.for_baseline(baseline_stats)
+    confidence = ConfidenceAccumulator(threshold)
+    for chunk in chunks:
+        features.update(chunk[feature_names].to_numpy(dtype="float64"))
+        confidence.update(chunk)
+    if features.rows == 0:
+        raise Exception("Prediction data is empty or None")
+
+    stats = drift_statistics(baseline_stats, features)
+    logging.info(f"Streamed {features.rows} rows over {len(stats)} features in "
+                 f"{(time.perf_counter() - start) * 1000:.0f} ms")
+    return stats, confidence
+
+
 def send_sns_alert(topic_arn, subject, message):
-    sns = boto3.client("sns")
+    sns = get_client("sns")
     sns.publish(TopicArn=topic_arn, Subject=subject, Message=message)
     logging.info("SNS alert sent.")
 
@@ -98,20 +242,40 @@ def lambda_handler(event, context):
         run_id = get_latest_run_with_baseline()
         logging.info(f"Baseline run ID: {run_id}")
 
-        baseline_stats = load_baseline_stats_from_mlflow(run_id)
+        try:
+            baseline_stats = load_baseline_stats_from_mlflow(run_id)
+        except Exception:
+            # The next invocation searches again instead of reusing a run that fails
+            _baseline_lookup.update(run_id=None, checked_at=None)
+            raise
         if not baseline_stats or "feature_names" not in baseline_stats or baseline_stats["feature_names"] is None:
             raise Exception("Baseline stats missing or feature_names is None")
         feature_names = baseline_stats["feature_names"]
 
-        pred_df = load_prediction_data(s3_bucket, s3_key)
-        if pred_df is None or len(pred_df) == 0:
-            raise Exception("Prediction data is empty or None")
+        # Thresholds come from .cfg/lambda/monitoring.yaml unless the event overrides them
+        cfg = get_cfg("lambda/monitoring.yaml")
+        drift_threshold = event.get("drift_threshold", cfg["drift_threshold"])
+        psi_threshold = event.get("psi_threshold", cfg["psi_threshold"])
+        confidence_histogram = None
+        if event.get("monitoring_mode", "full") == "stream":
+            # Bounded memory: the object is read in row chunks into mergeable statistics
+            chunks = iter_prediction_data(s3_bucket, s3_key, chunksize=event.get("chunk_size", 100_000))
+            drift_stats, confidence = stream_statistics(baseline_stats, chunks, feature_names, threshold=0.7)
+            drifted_features, drift_report = flag_drift(drift_stats, drift_threshold, psi_threshold)
+            low_conf_detected, low_conf_ratio = confidence.check(ratio_threshold=0.9)
+            confidence_histogram = confidence.histogram.tolist()
+        else:
+            pred_df = load_prediction_data(s3_bucket, s3_key)
+            if pred_df is None or len(pred_df) == 0:
+                raise Exception("Prediction data is empty or None")
 
-        drifted_features, drift_report = compare_distributions(baseline_stats, pred_df, feature_names)
+            drifted_features, drift_report, drift_stats = compare_distributions(
+                baseline_stats, pred_df, feature_names,
+                drift_threshold=drift_threshold, psi_threshold=psi_threshold,
+            )
+            low_conf_detected, low_conf_ratio = check_confidence(pred_df, threshold=0.7, ratio_threshold=0.9)
         drift_detected = len(drifted_features) > 0
 
-        low_conf_detected, low_conf_ratio = check_confidence(pred_df, threshold=0.7, ratio_threshold=0.9)
-
         alerts = []
         if drift_detected:
             alerts.append("🚨 Data drift detected in features:\n" + "\n".join(drift_report))
@@ -131,8 +295,10 @@ def lambda_handler(event, context):
             "statusCode": 200,
             "drift_detected": bool(drift_detected),
             "drifted_features": drifted_features,
+            "max_psi": float(drift_stats["psi"].max()) if drift_stats["psi"].notna().any() else None,
             "low_confidence_detected": bool(low_conf_detected),
             "low_confidence_ratio": float(low_conf_ratio),
+            "confidence_histogram": confidence_histogram,
             "alerts": alerts
         }
 
@@ -11,11 +11,12 @@ import logging
 import os
 from typing import Any, Dict, List
 
-import boto3
 import pandas as pd
 
 from src.components.data_management import DataManagement
+from src.components.table_io import content_type
 from src.lambda_functions.common import check_missing_params
+from src.utility import get_cfg
 
 
 def lambda_handler(event, context) -> Dict[str, Any]:  # pylint: disable=unused-argument
@@ -37,8 +38,10 @@ def lambda_handler(event, context) -> Dict[str, Any]:  # pylint: disable=unused-
     run_id = params["run_id"]
     version_id = params["version_id"]
 
+    data_management = DataManagement()
+
     try:
-        result_keys = list_simulation_results(bucket, run_id)
+        result_keys = list_simulation_results(data_management, bucket, run_id)
         logging.info("Found %d result files: %s", len(result_keys), result_keys)
 
         if not result_keys:
@@ -49,14 +52,14 @@ def lambda_handler(event, context) -> Dict[str, Any]:  # pylint: disable=unused-
                 "run_id": run_id,
             }
 
-        data_management = DataManagement()
         combined_df = combine_csv_files(data_management, bucket, result_keys)
 
-        local_output_path = f"/tmp/combined_results_{run_id}.csv"
-        combined_df.to_csv(local_output_path, index=False)
+        output_file = f"combined_results{data_management.file_extension}"
+        local_output_path = f"/tmp/{run_id}_{output_file}"
+        data_management.write_dataframe(combined_df, local_output_path)
 
         s3_prefix = f"combined/{run_id}/"
-        output_key = os.path.join(s3_prefix, "combined_results.csv")
+        output_key = os.path.join(s3_prefix, output_file)
         data_management.upload_csv(local_output_path, bucket, output_key, version_id)
         logging.info("Uploaded combined results to %s", output_key)
 
@@ -67,6 +70,8 @@ def lambda_handler(event, context) -> Dict[str, Any]:  # pylint: disable=unused-
             "run_id": run_id,
             "files_combined": result_keys,
             "output_path": f"s3://{bucket}/{s3_prefix}",
+            "output_file": output_file,
+            "content_type": content_type(data_management.intermediate_format),
         }
 
     except Exception as e:  # pylint: disable=broad-except
@@ -74,33 +79,35 @@ def lambda_handler(event, context) -> Dict[str, Any]:  # pylint: disable=unused-
         raise
 
 
-def list_simulation_results(bucket: str, run_id: str) -> List[str]:
+def list_simulation_results(
+    data_management: DataManagement, bucket: str, run_id: str
+) -> List[str]:
     """
     List all simulation result files for a specific run.
 
+    Only files in the configured intermediate format are returned.
+
     Args:
+        data_management: DataManagement instance
         bucket: S3 bucket name
         run_id: Run identifier
 
     Returns:
         List of S3 keys for simulation result files
     """
-    s3_client = boto3.client("s3")
     prefix = f"simulated/{run_id}/"
     logging.info("Listing objects with prefix %s", prefix)
 
     try:
-        response = s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
+        result_keys = data_management.list_s3_keys(
+            bucket, prefix, suffix=data_management.file_extension
+        )
 
-        if "Contents" not in response:
+        if not result_keys:
             logging.warning("No objects found with prefix %s", prefix)
             return []
 
-        result_keys = [
-            obj["Key"] for obj in response["Contents"] if obj["Key"].endswith(".csv")
-        ]
-
-        logging.info("Found %d csv files", len(result_keys))
+        logging.info("Found %d result files", len(result_keys))
         return result_keys
 
     except Exception as e:
@@ -112,34 +119,36 @@ def combine_csv_files(
     data_management: DataManagement, bucket: str, file_keys: List[str]
 ) -> pd.DataFrame:
     """
-    Load multiple csv files and combine them into a single DataFrame.
+    Load multiple csv or parquet files concurrently and combine them into a single DataFrame.
+
+    Files are fetched by a bounded thread pool and concatenated in the order of
+    `file_keys`, regardless of the order in which the downloads finish.
 
     Args:
         data_management: DataManagement instance
         bucket: S3 bucket name
         file_keys: List of S3 object keys
-        version_id: Version ID for consistency
 
     Returns:
-        Combined DataFrame of all simulationW results
+        Combined DataFrame of all simulation results
     """
-    dataframes = []
-    success_count = 0
-
-    for key in file_keys:
-        try:
-            logging.info("Loading file: %s", key)
-            df, _ = data_management.load_s3_file(bucket, key)
-            logging.info("Successfully loaded %s, shape: %s", key, df.shape)
-            dataframes.append(df)
-            success_count += 1
-        except Exception as e:  # pylint: disable=broad-except
-            logging.error("Failed to load file %s: %s", key, str(e), exc_info=True)
+    cfg = get_cfg("lambda/post_processing.yaml")
+    logging.info(
+        "Loading %d files with up to %d workers", len(file_keys), cfg["max_workers"]
+    )
+
+    loaded, failed = data_management.load_s3_files(
+        bucket, file_keys, max_workers=cfg["max_workers"]
+    )
+
+    for key, error in failed.items():
+        logging.error("Failed to load file %s: %s", key, str(error), exc_info=error)
 
+    dataframes = [loaded[key] for key in file_keys if key in loaded]
     if not dataframes:
         raise ValueError(f"Could not load any of the {len(file_keys)} data files")
 
-    logging.info("Successfully loaded %d of %d files", success_count, len(file_keys))
+    logging.info("Successfully loaded %d of %d files", len(dataframes), len(file_keys))
 
     combined_df = pd.concat(dataframes, ignore_index=True)
     logging.info("Combined DataFrame shape: %s", combined_df.shape)
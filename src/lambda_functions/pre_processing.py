@@ -5,7 +5,7 @@ This module handles the initial preprocessing of data files uploaded to S3:
 - Extracts data from Excel files
 - Transforms the data into the required format
 - Splits data into manageable chunks for batch processing
-- Uploads split chunks back to S3
+- Uploads split chunks back to S3 as CSV or Parquet
 """
 
 import logging
@@ -74,20 +74,19 @@ def process_file(data_manager, bucket, key, run_id, version_id):
     transformed_data = transform_data(df)
 
     num_chunks = math.ceil(len(transformed_data) / chunk_size)
-    chunk_keys = []
-
-    for i in range(num_chunks):
-        chunk = transformed_data.iloc[i * chunk_size : (i + 1) * chunk_size]
-        chunk_path = f"/tmp/chunk_{i+1:03d}.csv"
-        chunk.to_csv(chunk_path, index=False)
-
-        chunk_s3_key = f"splits/{run_id}/chunk_{i+1:03d}.csv"
-        data_manager.upload_csv(
-            chunk_path,
-            bucket_name=bucket,
-            object_name=chunk_s3_key,
-            version_id=version_id,
-        )
-        chunk_keys.append(chunk_s3_key)
+    extension = data_manager.file_extension
 
-    return chunk_keys
+    # Chunks are serialized in memory and uploaded concurrently, tagged in the same PUT
+    chunks = [
+        (
+            transformed_data.iloc[i * chunk_size : (i + 1) * chunk_size],
+            f"splits/{run_id}/chunk_{i+1:03d}{extension}",
+        )
+        for i in range(num_chunks)
+    ]
+    return data_manager.upload_dataframes(
+        chunks,
+        bucket_name=bucket,
+        version_id=version_id,
+        max_workers=cfg.get("upload_max_workers", 32),
+    )
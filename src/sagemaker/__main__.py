@@ -25,10 +25,18 @@ def main():
             from src.sagemaker.train import run_training
             run_training()
         elif program == 'predict':
-            from src.sagemaker.predict import app
-            app.run(host="0.0.0.0", port=8080)
+            if os.environ.get('SERVING_MODE', 'gunicorn') == 'flask':
+                from src.sagemaker.predict import app, init_model_cache
+                init_model_cache()
+                app.run(host="0.0.0.0", port=8080)
+            else:
+                from src.sagemaker.serve import run_server
+                run_server()
+        elif program == 'predict_stream':
+            from src.sagemaker.predict import run_streaming_prediction
+            run_streaming_prediction()
         else:
-            logging.error(f"Unknown program: {program}. Expected 'train' or 'predict'")
+            logging.error(f"Unknown program: {program}. Expected 'train', 'predict' or 'predict_stream'")
             raise ValueError(f"Unknown program: {program}")
     except Exception as e:
         logging.error(f"Execution failed: {e}")
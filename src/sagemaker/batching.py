@@ -0,0 +1,110 @@
+"""
+Micro-batching for the predict server.
+
+Concurrent /invocations requests handled by the threads of one worker are queued and
+merged into a single model call: the first request opens a batch, which is closed when
+it holds `max_batch_size` rows or `max_wait_ms` has passed.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+
+from src.logger import logging
+
+
+class MicroBatcher:
+    """Merges concurrent prediction requests into one call of `predict_fn`
+
+    `predict_fn` takes a DataFrame and returns one result per row (an array or a
+    DataFrame), which is split back into the slices belonging to each request.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=256, max_wait_ms=5.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+
+    def submit(self, df):
+        """Queue a DataFrame and block until its predictions are available"""
+        if self.max_wait <= 0:
+            return self.predict_fn(df)
+
+        self._ensure_thread()
+        future = Future()
+        self._queue.put((df, future))
+        return future.result()
+
+    def _ensure_thread(self):
+        # Started lazily so that it runs in the serving process, not a pre-fork parent
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._batch_loop, name="micro-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _batch_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            rows = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while rows < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                rows += len(item[0])
+
+            # Only requests with the same columns can share one model call
+            groups = {}
+            for item in batch:
+                groups.setdefault(tuple(item[0].columns), []).append(item)
+            for items in groups.values():
+                self._run(items)
+
+    def _run(self, items):
+        self.batches += 1
+        self.requests += len(items)
+        try:
+            combined = pd.concat([df for df, _ in items], ignore_index=True)
+            results = self.predict_fn(combined)
+        # Whatever the model raises belongs to the waiting requests, so it is handed to
+        # their futures instead of ending the batch thread
+        except Exception as e:  # pylint: disable=broad-except
+            logging.error(f"Batched prediction failed: {e}")
+            for _, future in items:
+                future.set_exception(e)
+            return
+
+        offset = 0
+        for df, future in items:
+            end = offset + len(df)
+            if isinstance(results, pd.DataFrame):
+                part = results.iloc[offset:end].reset_index(drop=True)
+            else:
+                part = results[offset:end]
+            future.set_result(part)
+            offset = end
+
+    def stats(self):
+        """Number of model calls and of requests served through them"""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_requests": (
+                self.requests / self.batches if self.batches else 0.0
+            ),
+        }
@@ -1,45 +1,189 @@
+import numpy as np
 import pandas as pd
 from flask import Flask, request, jsonify
 from src.logger import logging
-from src.components.mlflow_utils import setup_mlflow, load_production_model
+from src.components.mlflow_utils import setup_mlflow, ModelCache, iter_prediction_data_from_sagemaker
+from src.components.table_io import TableWriter, format_from_name, read_table, write_table
+from src.sagemaker.batching import MicroBatcher
+from src.sagemaker.forest_engine import compile_forest
 import io
+import os
+import resource
+import threading
+import time
 
 app = Flask(__name__)
 
+CONTENT_TYPES = ['text/csv', 'application/x-parquet', 'application/x-npy']
+
+# INFERENCE_ENGINE=compiled scores with flat node arrays built once per loaded model
+# instead of sklearn's per-tree loop; both give identical probabilities
+INFERENCE_ENGINE = os.environ.get("INFERENCE_ENGINE", "sklearn")
+
+model_cache = ModelCache(
+    refresh_interval=int(os.environ.get("MODEL_REFRESH_INTERVAL", "300")),
+    on_load=compile_forest if INFERENCE_ENGINE == "compiled" else None,
+)
+_init_lock = threading.Lock()
+_initialized = False
+
+def preload_model():
+    """Set up MLflow and load the production model before gunicorn forks its workers
+
+    A failed load does not stop the server: it is kept in the cache's last_error, so
+    /ping reports "degraded", and the workers keep retrying.
+    """
+    setup_mlflow()
+    try:
+        model_cache.refresh()
+    except Exception as e:  # pylint: disable=broad-except
+        logging.error(f"Preloading the production model failed: {e}")
+
+def init_worker():
+    """Start the model refresh in a forked worker, serving the model preloaded by the master"""
+    global _init_lock, _initialized
+    _init_lock = threading.Lock()
+    model_cache.after_fork()
+    _initialized = True
+
+def init_model_cache():
+    """Set up MLflow once, load the production model and start the background refresh"""
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        setup_mlflow()
+        model_cache.refresh()
+        model_cache.start()
+        _initialized = True
+
+def predict_batch(df):
+    """Predict one DataFrame, possibly merged from several requests, with the cached model"""
+    model, _ = model_cache.get()
+    return score(model, df)
+
+def score(model, df):
+    """Predicted class, confidence and per-class probabilities for every row of df"""
+    # One forest traversal: the predicted class is the argmax of the probabilities,
+    # which is what predict() computes internally for sklearn classifiers
+    prediction_probs = model.predict_proba(df)
+    predictions = model.classes_[prediction_probs.argmax(axis=1)]
+
+    results = pd.DataFrame({'Predicted_Class': predictions, 'Confidence': prediction_probs.max(axis=1)})
+    for i, class_name in enumerate(model.classes_):
+        results[f'Prob_Class_{class_name}'] = prediction_probs[:, i]
+    return results
+
+batcher = MicroBatcher(
+    predict_batch,
+    max_batch_size=int(os.environ.get("BATCH_MAX_SIZE", "256")),
+    max_wait_ms=float(os.environ.get("BATCH_MAX_WAIT_MS", "5")),
+)
+
+def parse_request(data, content_type):
+    """Parse a request body into a DataFrame according to its content type"""
+    if content_type == 'text/csv':
+        return pd.read_csv(io.BytesIO(data))
+    if content_type == 'application/x-parquet':
+        return read_table(io.BytesIO(data), "request.parquet")
+    # A 2D array of features in training column order, as the model was fit on arrays
+    array = np.load(io.BytesIO(data), allow_pickle=False)
+    return pd.DataFrame(np.atleast_2d(array))
+
+def format_response(df, accept):
+    """Serialize the input rows with their predictions in the accepted format"""
+    if accept == 'application/x-parquet':
+        buffer = io.BytesIO()
+        write_table(df, buffer, "parquet")
+        return buffer.getvalue()
+    if accept == 'application/x-npy':
+        # Same column order as the CSV response, as a float64 matrix
+        buffer = io.BytesIO()
+        np.save(buffer, df.to_numpy(dtype=np.float64), allow_pickle=False)
+        return buffer.getvalue()
+    return df.to_csv(index=False)
+
+def npy_compatible(df, model):
+    """Whether the input rows and the model's class labels can form a float64 npy response"""
+    return (all(pd.api.types.is_numeric_dtype(t) for t in df.dtypes)
+            and pd.api.types.is_numeric_dtype(model.classes_.dtype))
+
 @app.route('/ping', methods=['GET'])
 def ping():
-    """Health check endpoint"""
-    return jsonify({"status": "ok"}), 200
+    """Health check endpoint with model cache and batching statistics
+
+    The status is "degraded" while the last model refresh failed; the cached model,
+    if any, is still served, so the endpoint keeps answering 200.
+    """
+    cache_stats = model_cache.stats()
+    status = "ok" if cache_stats["last_error"] is None else "degraded"
+    return jsonify({"status": status, "inference_engine": INFERENCE_ENGINE,
+                    "model_cache": cache_stats, "batching": batcher.stats()}), 200
 
 @app.route('/invocations', methods=['POST'])
 def invocations():
     """Handle prediction requests"""
     try:
-        if request.content_type != 'text/csv':
-            return jsonify({"error": "Invalid content type. Expected 'text/csv'"}), 415
+        if request.mimetype not in CONTENT_TYPES:
+            return jsonify({"error": f"Invalid content type. Expected one of {CONTENT_TYPES}"}), 415
+        accept = request.accept_mimetypes.best_match(CONTENT_TYPES, default='text/csv')
+        
+        df = parse_request(request.get_data(), request.mimetype)
         
-        input_data = request.data.decode('utf-8')
-        df = pd.read_csv(io.StringIO(input_data))
         logging.info(f"Received input data with shape: {df.shape}")
         
-        setup_mlflow()
+        init_model_cache()
 
-        model, prod_model = load_production_model()
-        
-        predictions = model.predict(df)
-        prediction_probs = model.predict_proba(df)
-        
-        df['Predicted_Class'] = predictions
-        df['Confidence'] = prediction_probs.max(axis=1) 
-        
-        for i, class_name in enumerate(model.classes_):
-            df[f'Prob_Class_{class_name}'] = prediction_probs[:, i]
+        # Checked before scoring, so that an unservable Accept does not cost a model call
+        if accept == 'application/x-npy' and not npy_compatible(df, model_cache.get()[0]):
+            return jsonify({"error": "application/x-npy responses need numeric features and class labels"}), 406
+
+        results = batcher.submit(df)
+        df = pd.concat([df.reset_index(drop=True), results], axis=1)
         
-        response_csv = df.to_csv(index=False)
+        response = format_response(df, accept)
         
         logging.info("Predictions completed successfully")
-        return response_csv, 200, {'Content-Type': 'text/csv'}
+        return response, 200, {'Content-Type': accept}
     
     except Exception as e:
         logging.error(f"Prediction failed: {e}")
-        raise e
\ No newline at end of file
+        raise e
+
+def predict_stream(chunks, output_path, model=None):
+    """Score an iterable of DataFrame chunks, appending each scored chunk to output_path
+
+    Only one chunk is held in memory at a time, so peak memory does not grow with
+    the size of the input. The output format follows the extension of output_path.
+
+    Returns:
+        dict: Rows scored, elapsed seconds, rows per second and peak RSS in MB.
+    """
+    if model is None:
+        init_model_cache()
+        model, _ = model_cache.get()
+
+    start = time.perf_counter()
+    with TableWriter(output_path, format_from_name(output_path)) as writer:
+        for chunk in chunks:
+            results = score(model, chunk)
+            writer.write(pd.concat([chunk.reset_index(drop=True), results], axis=1))
+            logging.info(f"Scored {writer.rows} rows")
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "rows": writer.rows,
+        "seconds": elapsed,
+        "rows_per_second": writer.rows / elapsed if elapsed else 0.0,
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+    logging.info(f"Streaming prediction finished: {stats}")
+    return stats
+
+def run_streaming_prediction():
+    """Streaming prediction over the SageMaker input data, for inputs too large for /invocations"""
+    chunksize = int(os.environ.get("PREDICT_CHUNK_SIZE", "100000"))
+    output_path = os.environ.get("PREDICT_OUTPUT_PATH", "/opt/ml/output/data/predictions.csv")
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    return predict_stream(iter_prediction_data_from_sagemaker(chunksize), output_path)
@@ -0,0 +1,62 @@
+"""
+Production serving of the predict app with gunicorn.
+
+The app and the production model are loaded once in the gunicorn master
+(`preload_app`), so the forked workers share the model pages copy-on-write. Each
+worker runs several threads, which lets the micro-batcher merge their requests.
+After the fork each worker only re-creates the model cache's locks and background
+refresh thread, because threads do not survive it. A model version published later
+is loaded by every worker's own refresh.
+"""
+
+import os
+
+from gunicorn.app.base import BaseApplication
+
+from src.logger import logging
+from src.sagemaker import predict
+
+
+class PredictServer(BaseApplication):
+    """Gunicorn application serving src.sagemaker.predict.app"""
+
+    def __init__(self, app, options=None):
+        self.application = app
+        self.options = options or {}
+        super().__init__()
+
+    def init(self, parser, opts, args):
+        """Configuration comes from `options` in load_config, not the command line"""
+        return None
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key.lower(), value)
+
+    def load(self):
+        return self.application
+
+
+def _post_fork(server, worker):  # pylint: disable=unused-argument
+    predict.init_worker()
+
+
+def run_server():
+    """Preload the model and serve it with gunicorn on port 8080"""
+    predict.preload_model()
+
+    options = {
+        "bind": "0.0.0.0:8080",
+        "workers": int(os.environ.get("SERVING_WORKERS", os.cpu_count() or 1)),
+        "worker_class": "gthread",
+        "threads": int(os.environ.get("SERVING_THREADS", "8")),
+        "timeout": int(os.environ.get("SERVING_TIMEOUT", "120")),
+        "preload_app": True,
+        "post_fork": _post_fork,
+    }
+    logging.info(
+        f"Starting gunicorn with {options['workers']} workers "
+        f"x {options['threads']} threads"
+    )
+    PredictServer(predict.app, options).run()
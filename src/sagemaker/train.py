@@ -1,21 +1,42 @@
+import glob
+import hashlib
 import json
 import os
 import pandas as pd
 import numpy as np
 import mlflow
 import mlflow.sklearn
+from mlflow.exceptions import MlflowException
 from mlflow.models.signature import infer_signature
 import optuna
+import sklearn
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import f1_score, accuracy_score, precision_score, recall_score, confusion_matrix, classification_report
 from sklearn.model_selection import train_test_split, StratifiedKFold
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 import warnings
 warnings.filterwarnings('ignore')
 from src.logger import logging
-from src.components.mlflow_utils import setup_mlflow, load_data_from_sagemaker, ModelPromotion
+from src.components.mlflow_utils import setup_mlflow, load_data_from_sagemaker, find_training_input, ModelPromotion
+from src.components.drift_stats import BASELINE_ARTIFACT, BASELINE_TAG, baseline_statistics, extend_baseline_statistics
+
+# Hyperparameter search space: name -> (suggest type, arguments)
+SEARCH_SPACE = {
+    "n_estimators": ("int", 2, 10),
+    "max_depth": ("int", 2, 5),
+    "min_samples_split": ("int", 2, 30),
+    "min_samples_leaf": ("int", 1, 15),
+    "max_features": ("float", 0.1, 1),
+    "bootstrap": ("categorical", [True, False]),
+}
+
+FINGERPRINT_TAG = "training_fingerprint"
+BEST_PARAMS_TAG = "best_params"
+TRAINING_MODE_TAG = "training_mode"
+RUNS_SINCE_FULL_TAG = "runs_since_full"
 
 @dataclass
 class TrainTestData:
@@ -25,175 +46,172 @@ class TrainTestData:
     y_test: np.ndarray
     feature_names: list
 
+@dataclass
+class CVFold:
+    x_train: np.ndarray
+    y_train: np.ndarray
+    x_val: np.ndarray
+    y_val: np.ndarray
+
+def precompute_folds(x, y, n_splits=5, random_state=42):
+    """Split x and y into stratified CV folds once, for reuse by every Optuna trial
+
+    Feature matrices are stored as float32, the dtype the tree builder works in, so
+    fitting does not convert or copy them again. Training matrices are Fortran-ordered
+    because the splitter scans one feature column at a time; validation matrices stay
+    C-ordered for row-wise prediction.
+    """
+    skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    x = np.asarray(x, dtype=np.float32)
+    return [
+        CVFold(
+            x_train=np.asfortranarray(x[train_idx]),
+            y_train=y[train_idx],
+            x_val=np.ascontiguousarray(x[val_idx]),
+            y_val=y[val_idx],
+        )
+        for train_idx, val_idx in skf.split(x, y)
+    ]
+
 class ModelTrainer:
-    def upload_baseline_stats(self):
-        """Calculate and upload baseline statistics as MLflow artifact"""
+    def upload_baseline_stats(self, base_baseline=None):
+        """Calculate and upload baseline statistics as MLflow artifact
+
+        When a model is extended incrementally, base_baseline holds the statistics of
+        the data it was trained on so far, and the new baseline covers that data
+        together with this run's training data.
+        """
         logging.info("Saving baseline statistics as MLflow artifact...")
-        stats = {
-            'mean': np.mean(self.data.x_train, axis=0).tolist(),
-            'std': np.std(self.data.x_train, axis=0).tolist(),
-            'min': np.min(self.data.x_train, axis=0).tolist(),
-            'max': np.max(self.data.x_train, axis=0).tolist(),
-            'shape': list(self.data.x_train.shape),
-            'feature_names': self.data.feature_names,
-            'timestamp': pd.Timestamp.now().isoformat()
-        }
+        # Moments, quantiles and histograms the monitoring Lambda compares predictions against
+        if base_baseline is not None:
+            stats = extend_baseline_statistics(base_baseline, self.data.x_train)
+        else:
+            stats = baseline_statistics(self.data.x_train, self.data.feature_names)
+        stats['timestamp'] = pd.Timestamp.now().isoformat()
 
         os.makedirs("artifacts", exist_ok=True)
-        stats_path = "artifacts/baseline_stats.json"
+        stats_path = f"artifacts/{BASELINE_ARTIFACT}"
         with open(stats_path, "w") as f:
             json.dump(stats, f, indent=2)
 
         mlflow.log_artifact(stats_path)
+        # Lets monitoring find the latest baseline with one filtered search
+        mlflow.set_tag(BASELINE_TAG, "true")
 
-    def __init__(self, data: TrainTestData):
+    def __init__(self, data: TrainTestData, n_trials=None, n_jobs=None, fold_workers=None):
         logging.info("Initializing ModelTrainer...")
         self.data = data
         self.label_names = sorted(np.unique(np.concatenate([data.y_train, data.y_test])))
         logging.info(f"Found {len(self.label_names)} classes: {self.label_names}")
+        # Folds of a trial are fitted fold_workers at a time, and n_jobs trials run at
+        # once, so together they use about n_jobs * fold_workers cores
+        self.n_trials = n_trials or int(os.environ.get("OPTUNA_N_TRIALS", "100"))
+        self.fold_workers = fold_workers or int(os.environ.get("CV_FOLD_WORKERS", "2"))
+        self.n_jobs = n_jobs or int(os.environ.get(
+            "OPTUNA_N_JOBS", max(1, (os.cpu_count() or 1) // self.fold_workers)))
+        # Built by run_study, so runs without a hyperparameter search never split folds
+        self.folds = None
+        self.incremental_trees = int(os.environ.get("INCREMENTAL_TREES", "5"))
+        self.plot_dpi = int(os.environ.get("PLOT_DPI", "300"))
+        self.plot_format = os.environ.get("PLOT_FORMAT", "png")
+        # PLOT_WORKERS=0 renders the plots inline, before the model is logged
+        self.plot_workers = int(os.environ.get("PLOT_WORKERS", min(5, os.cpu_count() or 1)))
+        self.plot_pool = None
 
     def objective(self, trial):
         logging.info("Starting Optuna trial...")
-        params = {
-            "n_estimators": trial.suggest_int("n_estimators", 2, 10),
-            "max_depth": trial.suggest_int("max_depth", 2, 5),
-            "min_samples_split": trial.suggest_int("min_samples_split", 2, 30),
-            "min_samples_leaf": trial.suggest_int("min_samples_leaf", 1, 15),
-            "max_features": trial.suggest_float("max_features", 0.1, 1),
-            "bootstrap": trial.suggest_categorical("bootstrap", [True, False]),
-            "random_state": 42,
-        }
+        params = suggest_params(trial)
+        params["random_state"] = 42
         
-        skf = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+        folds = self.folds
         f1_scores = []
-        for fold, (train_idx, val_idx) in enumerate(skf.split(self.data.x_train, self.data.y_train)):
-            x_tr, x_val = self.data.x_train[train_idx], self.data.x_train[val_idx]
-            y_tr, y_val = self.data.y_train[train_idx], self.data.y_train[val_idx]
-            model = RandomForestClassifier(**params)
-            model.fit(x_tr, y_tr)
-            preds = model.predict(x_val)
-            f1 = f1_score(y_val, preds, average='macro')
-            f1_scores.append(f1)
+        with ThreadPoolExecutor(max_workers=self.fold_workers) as executor:
+            # Folds run concurrently in waves; after each wave the running mean is
+            # reported so the pruner can stop hopeless trials early
+            for start in range(0, len(folds), self.fold_workers):
+                wave = folds[start:start + self.fold_workers]
+                f1_scores.extend(executor.map(lambda fold: self.fit_fold(params, fold), wave))
+                trial.report(np.mean(f1_scores), step=len(f1_scores))
+                if trial.should_prune():
+                    logging.info(f"Trial pruned after {len(f1_scores)} folds with mean F1: {np.mean(f1_scores):.4f}")
+                    raise optuna.TrialPruned()
         mean_f1 = np.mean(f1_scores)
         logging.info(f"Trial completed with mean F1: {mean_f1:.4f}")
         return mean_f1
 
+    def fit_fold(self, params, fold):
+        """Fit one precomputed cross-validation fold and return its macro F1"""
+        model = RandomForestClassifier(**params)
+        model.fit(fold.x_train, fold.y_train)
+        preds = model.predict(fold.x_val)
+        return f1_score(fold.y_val, preds, average='macro')
+
+    def extend_model(self, base_model):
+        """Add incremental_trees trees fitted on the training data to a fitted forest"""
+        logging.info(f"Adding {self.incremental_trees} trees to a forest of {base_model.n_estimators}...")
+        base_model.set_params(warm_start=True, n_estimators=base_model.n_estimators + self.incremental_trees)
+        base_model.fit(self.data.x_train, self.data.y_train)
+        base_model.set_params(warm_start=False)
+        return base_model
+
+    def run_study(self, callbacks=None):
+        """Run the Optuna search with parallel trials and median pruning"""
+        if self.folds is None:
+            self.folds = precompute_folds(self.data.x_train, self.data.y_train)
+        logging.info(f"Starting Optuna study: {self.n_trials} trials, {self.n_jobs} parallel, "
+                     f"{self.fold_workers} concurrent folds per trial")
+        study = optuna.create_study(
+            direction="maximize",
+            pruner=optuna.pruners.MedianPruner(n_startup_trials=10, n_warmup_steps=0),
+        )
+        study.optimize(self.objective, n_trials=self.n_trials, n_jobs=self.n_jobs, callbacks=callbacks)
+        return study
+
     def create_visualizations(self, model, y_true, y_pred):
-        """Create comprehensive visualizations"""
-        logging.info("Creating visualizations...")
+        """Start rendering the evaluation plots into artifacts/
+
+        With PLOT_WORKERS > 0 the plots render in a background process pool so the
+        caller can log and promote the model meanwhile; otherwise they render inline.
+
+        Returns:
+            list: Futures resolving to the paths of the rendered plots
+        """
+        logging.info(f"Creating visualizations ({self.plot_format}, {self.plot_dpi} dpi)...")
         os.makedirs("artifacts", exist_ok=True)
-        
-        # 1. Feature Importance Plot
-        self.feature_importance_plot(model)
-        
-        # 2. Confusion Matrix
-        self.confusion_matrix_plot(y_true, y_pred)
-        
-        # 3. Classification Report Heatmap
-        self.classification_report_plot(y_true, y_pred)
-        
-        # 4. Class Distribution Plot
-        self.class_distribution_plot()
-        
-        # 5. Model Performance Summary
-        self.performance_summary_plot(y_true, y_pred)
+        self.plot_pool = ProcessPoolExecutor(self.plot_workers) if self.plot_workers > 0 else None
 
-    def feature_importance_plot(self, model):
-        logging.info("Creating feature importance plot...")
-        importances = model.feature_importances_
-        indices = np.argsort(importances)[::-1]
-        
-        plt.figure(figsize=(12, 8))
-        plt.title("Random Forest Feature Importance")
-        
-        # Create horizontal bar plot
-        y_pos = np.arange(len(self.data.feature_names))
-        plt.barh(y_pos, importances[indices[::-1]], alpha=0.7)
-        plt.yticks(y_pos, [self.data.feature_names[i] for i in indices[::-1]])
-        plt.xlabel("Feature Importance")
-        plt.tight_layout()
-        plt.savefig("artifacts/feature_importance.png", dpi=300, bbox_inches='tight')
-        plt.close()
-
-    def confusion_matrix_plot(self, y_true, y_pred):
-        logging.info("Creating confusion matrix...")
-        cm = confusion_matrix(y_true, y_pred)
-        
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
-                   xticklabels=self.label_names, 
-                   yticklabels=self.label_names)
-        plt.title('Confusion Matrix')
-        plt.xlabel('Predicted Label')
-        plt.ylabel('True Label')
-        plt.tight_layout()
-        plt.savefig("artifacts/confusion_matrix.png", dpi=300, bbox_inches='tight')
-        plt.close()
-
-    def classification_report_plot(self, y_true, y_pred):
-        logging.info("Creating classification report heatmap...")
-        report = classification_report(y_true, y_pred, target_names=self.label_names, output_dict=True)
-        
-        # Convert to DataFrame for easier plotting
-        df_report = pd.DataFrame(report).iloc[:-1, :-1].T  # Remove support and avg rows
-
-        df_report = df_report.drop(['accuracy', 'macro avg'], errors='ignore')
-        df_report = df_report.drop('support', axis=1, errors='ignore')
-
-        plt.figure(figsize=(10, 6))
-        sns.heatmap(df_report, annot=True, 
-                cmap='viridis',  # Sequential colormap: dark (bad) to bright (good)
-                vmin=0, vmax=1,  # Explicit range from 0 to 1
-                fmt='.3f', 
-                cbar_kws={'label': 'Performance Score'})
-        plt.title('Classification Report Heatmap')
-        plt.tight_layout()
-        plt.savefig("artifacts/classification_report.png", dpi=300, bbox_inches='tight')
-        plt.close()
-
-    def class_distribution_plot(self):
-        logging.info("Creating class distribution plot...")
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-        
-        # Training set distribution
-        unique_train, counts_train = np.unique(self.data.y_train, return_counts=True)
-        ax1.pie(counts_train, labels=unique_train, autopct='%1.1f%%', startangle=90)
-        ax1.set_title('Training Set Class Distribution')
-        
-        # Test set distribution  
-        unique_test, counts_test = np.unique(self.data.y_test, return_counts=True)
-        ax2.pie(counts_test, labels=unique_test, autopct='%1.1f%%', startangle=90)
-        ax2.set_title('Test Set Class Distribution')
-        
-        plt.tight_layout()
-        plt.savefig("artifacts/class_distribution.png", dpi=300, bbox_inches='tight')
-        plt.close()
-
-    def performance_summary_plot(self, y_true, y_pred):
-        logging.info("Creating performance summary...")
-        # Calculate metrics per class
-        precision_per_class = precision_score(y_true, y_pred, average=None, labels=self.label_names)
-        recall_per_class = recall_score(y_true, y_pred, average=None, labels=self.label_names)
-        f1_per_class = f1_score(y_true, y_pred, average=None, labels=self.label_names)
-        
-        # Create DataFrame
-        metrics_df = pd.DataFrame({
-            'Precision': precision_per_class,
-            'Recall': recall_per_class,
-            'F1-Score': f1_per_class
-        }, index=self.label_names)
-        
-        # Plot
-        plt.figure(figsize=(12, 6))
-        metrics_df.plot(kind='bar', ax=plt.gca())
-        plt.title('Performance Metrics by Class')
-        plt.xlabel('Class')
-        plt.ylabel('Score')
-        plt.legend()
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig("artifacts/performance_summary.png", dpi=300, bbox_inches='tight')
-        plt.close()
+        def path(name):
+            return f"artifacts/{name}.{self.plot_format}"
+
+        plots = [
+            # 1. Feature Importance Plot
+            (feature_importance_plot, path("feature_importance"), model.feature_importances_, self.data.feature_names),
+            # 2. Confusion Matrix
+            (confusion_matrix_plot, path("confusion_matrix"), y_true, y_pred, self.label_names),
+            # 3. Classification Report Heatmap
+            (classification_report_plot, path("classification_report"), y_true, y_pred, self.label_names),
+            # 4. Class Distribution Plot
+            (class_distribution_plot, path("class_distribution"), self.data.y_train, self.data.y_test),
+            # 5. Model Performance Summary
+            (performance_summary_plot, path("performance_summary"), y_true, y_pred, self.label_names),
+        ]
+        return [submit_plot(self.plot_pool, func, *args, dpi=self.plot_dpi) for func, *args in plots]
+
+    def log_visualizations(self, plots):
+        """Wait for the plots started by create_visualizations and log them to the active run
+
+        A failing plot is logged as a warning and does not fail the training run.
+        """
+        try:
+            for future in plots:
+                try:
+                    mlflow.log_artifact(future.result())
+                except Exception as e:
+                    logging.warning(f"Rendering a visualization failed: {e}")
+        finally:
+            if self.plot_pool is not None:
+                self.plot_pool.shutdown()
+                self.plot_pool = None
 
     def calculate_comprehensive_metrics(self, y_true, y_pred):
         """Calculate and return comprehensive metrics"""
@@ -219,7 +237,16 @@ class ModelTrainer:
         
         return metrics
 
-    def train_and_log(self):
+    def train_and_log(self, fingerprint=None, best_params=None, reused_run_id=None,
+                      base_model=None, runs_since_full=0, base_baseline=None):
+        """Search hyperparameters, train, evaluate, log and promote the model
+
+        When best_params is given the Optuna search is skipped and the parameters are
+        reused, e.g. from a previous run with the same training fingerprint. When
+        base_model is given, no search or full fit happens: trees fitted on this run's
+        data are added to it instead (incremental training), and the baseline
+        statistics of its training data, base_baseline, are extended with this run's.
+        """
         logging.info("Setting up MLflow...")
         setup_mlflow()
                 
@@ -235,23 +262,40 @@ class ModelTrainer:
             mlflow.log_param("n_classes", len(self.label_names))
             mlflow.log_param("class_labels", self.label_names)
             
-            # Save baseline statistics as MLflow artifact for future monitoring
-            self.upload_baseline_stats()
-            
-            logging.info("Starting Optuna study...")
-            study = optuna.create_study(direction="maximize")
-            study.optimize(self.objective, n_trials=100)
-            best_params = study.best_params
-            logging.info(f"Best params found: {best_params}")
-            mlflow.log_params(best_params)
+            if fingerprint is not None:
+                mlflow.set_tag(FINGERPRINT_TAG, fingerprint)
             
-            # Log Optuna study info
-            mlflow.log_metric("best_cv_f1", study.best_value)
-            mlflow.log_param("n_trials", len(study.trials))
+            # Save baseline statistics as MLflow artifact for future monitoring
+            self.upload_baseline_stats(base_baseline)
             
-            logging.info("Training final model with best params...")
-            model = RandomForestClassifier(**best_params, random_state=42)
-            model.fit(self.data.x_train, self.data.y_train)
+            if base_model is not None:
+                model = self.extend_model(base_model)
+                mlflow.set_tag(TRAINING_MODE_TAG, "incremental")
+                mlflow.set_tag(RUNS_SINCE_FULL_TAG, str(runs_since_full))
+                mlflow.log_param("trees_added", self.incremental_trees)
+                mlflow.log_param("n_estimators_total", model.n_estimators)
+            else:
+                if best_params is None:
+                    study = self.run_study()
+                    best_params = study.best_params
+                    logging.info(f"Best params found: {best_params}")
+                    
+                    # Log Optuna study info
+                    mlflow.log_metric("best_cv_f1", study.best_value)
+                    mlflow.log_param("n_trials", len(study.trials))
+                    mlflow.log_param("n_trials_pruned", sum(t.state == optuna.trial.TrialState.PRUNED for t in study.trials))
+                    mlflow.log_param("optuna_n_jobs", self.n_jobs)
+                else:
+                    logging.info(f"Reusing best params from run {reused_run_id}: {best_params}")
+                    mlflow.log_param("params_reused_from", reused_run_id)
+                mlflow.log_params(best_params)
+                mlflow.set_tag(BEST_PARAMS_TAG, json.dumps(best_params))
+
+                logging.info("Training final model with best params...")
+                model = RandomForestClassifier(**best_params, random_state=42)
+                model.fit(self.data.x_train, self.data.y_train)
+                mlflow.set_tag(TRAINING_MODE_TAG, "full")
+                mlflow.set_tag(RUNS_SINCE_FULL_TAG, "0")
             
             # Predictions
             preds = model.predict(self.data.x_test)
@@ -264,40 +308,141 @@ class ModelTrainer:
                 mlflow.log_metric(metric_name, metric_value)
                 logging.info(f"{metric_name}: {metric_value:.4f}")
             
-            # Create and log visualizations
-            self.create_visualizations(model, self.data.y_test, preds)
-            
-            # Log all artifacts
-            for artifact in ["feature_importance.png", "confusion_matrix.png", 
-                           "classification_report.png", "class_distribution.png", 
-                           "performance_summary.png"]:
-                mlflow.log_artifact(f"artifacts/{artifact}")
-            
-            # Create model signature
-            signature = infer_signature(self.data.x_train, model.predict(self.data.x_train))
-            
-            # Log model
-            model_info = mlflow.sklearn.log_model(
-                model, 
-                "model",
-                signature=signature,
-            )
-            
-            # Handle model promotion
-            promoted, promotion_message = promotion_handler.compare_and_promote(
-                model_info.model_uri, 
-                metrics["test_avg_f1"],
-                mlflow.active_run().info.run_id
-            )
-            
-            # Log promotion info
-            mlflow.log_param("promoted_to_production", promoted)
-            mlflow.log_param("promotion_reason", promotion_message)
+            # Visualizations render in the background while the model is logged and
+            # promoted, and are added to the run afterwards
+            plots = self.create_visualizations(model, self.data.y_test, preds)
+            try:
+                # Create model signature
+                signature = infer_signature(self.data.x_train, model.predict(self.data.x_train))
+                
+                # Log model
+                model_info = mlflow.sklearn.log_model(
+                    model, 
+                    "model",
+                    signature=signature,
+                )
+                
+                # Handle model promotion
+                promoted, promotion_message = promotion_handler.compare_and_promote(
+                    model_info.model_uri, 
+                    metrics["test_avg_f1"],
+                    mlflow.active_run().info.run_id
+                )
+                
+                # Log promotion info
+                mlflow.log_param("promoted_to_production", promoted)
+                mlflow.log_param("promotion_reason", promotion_message)
+            finally:
+                self.log_visualizations(plots)
             
             logging.info("MLflow logging complete.")
             logging.info(f"Model promotion: {promotion_message}")
             logging.info(f"Final metrics: {metrics}")
 
+def submit_plot(pool, func, *args, **kwargs):
+    """Run a plot function in pool, or inline when pool is None, and return its future"""
+    if pool is not None:
+        return pool.submit(func, *args, **kwargs)
+    future = Future()
+    try:
+        future.set_result(func(*args, **kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+def save_figure(path, dpi):
+    """Save and close the current figure; plot functions return the saved path"""
+    plt.tight_layout()
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+    return path
+
+def feature_importance_plot(path, importances, feature_names, dpi=300):
+    logging.info("Creating feature importance plot...")
+    indices = np.argsort(importances)[::-1]
+    
+    plt.figure(figsize=(12, 8))
+    plt.title("Random Forest Feature Importance")
+    
+    # Create horizontal bar plot
+    y_pos = np.arange(len(feature_names))
+    plt.barh(y_pos, importances[indices[::-1]], alpha=0.7)
+    plt.yticks(y_pos, [feature_names[i] for i in indices[::-1]])
+    plt.xlabel("Feature Importance")
+    return save_figure(path, dpi)
+
+def confusion_matrix_plot(path, y_true, y_pred, label_names, dpi=300):
+    logging.info("Creating confusion matrix...")
+    cm = confusion_matrix(y_true, y_pred)
+    
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
+               xticklabels=label_names, 
+               yticklabels=label_names)
+    plt.title('Confusion Matrix')
+    plt.xlabel('Predicted Label')
+    plt.ylabel('True Label')
+    return save_figure(path, dpi)
+
+def classification_report_plot(path, y_true, y_pred, label_names, dpi=300):
+    logging.info("Creating classification report heatmap...")
+    report = classification_report(y_true, y_pred, target_names=label_names, output_dict=True)
+    
+    # Convert to DataFrame for easier plotting
+    df_report = pd.DataFrame(report).iloc[:-1, :-1].T  # Remove support and avg rows
+
+    df_report = df_report.drop(['accuracy', 'macro avg'], errors='ignore')
+    df_report = df_report.drop('support', axis=1, errors='ignore')
+
+    plt.figure(figsize=(10, 6))
+    sns.heatmap(df_report, annot=True, 
+            cmap='viridis',  # Sequential colormap: dark (bad) to bright (good)
+            vmin=0, vmax=1,  # Explicit range from 0 to 1
+            fmt='.3f', 
+            cbar_kws={'label': 'Performance Score'})
+    plt.title('Classification Report Heatmap')
+    return save_figure(path, dpi)
+
+def class_distribution_plot(path, y_train, y_test, dpi=300):
+    logging.info("Creating class distribution plot...")
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    
+    # Training set distribution
+    unique_train, counts_train = np.unique(y_train, return_counts=True)
+    ax1.pie(counts_train, labels=unique_train, autopct='%1.1f%%', startangle=90)
+    ax1.set_title('Training Set Class Distribution')
+    
+    # Test set distribution  
+    unique_test, counts_test = np.unique(y_test, return_counts=True)
+    ax2.pie(counts_test, labels=unique_test, autopct='%1.1f%%', startangle=90)
+    ax2.set_title('Test Set Class Distribution')
+    
+    return save_figure(path, dpi)
+
+def performance_summary_plot(path, y_true, y_pred, label_names, dpi=300):
+    logging.info("Creating performance summary...")
+    # Calculate metrics per class
+    precision_per_class = precision_score(y_true, y_pred, average=None, labels=label_names)
+    recall_per_class = recall_score(y_true, y_pred, average=None, labels=label_names)
+    f1_per_class = f1_score(y_true, y_pred, average=None, labels=label_names)
+    
+    # Create DataFrame
+    metrics_df = pd.DataFrame({
+        'Precision': precision_per_class,
+        'Recall': recall_per_class,
+        'F1-Score': f1_per_class
+    }, index=label_names)
+    
+    # Plot
+    plt.figure(figsize=(12, 6))
+    metrics_df.plot(kind='bar', ax=plt.gca())
+    plt.title('Performance Metrics by Class')
+    plt.xlabel('Class')
+    plt.ylabel('Score')
+    plt.legend()
+    plt.xticks(rotation=45)
+    return save_figure(path, dpi)
+
 def load_data():
     logging.info("Loading data...")
     df = load_data_from_sagemaker()
@@ -316,14 +461,173 @@ def load_data():
     logging.info(f"Train set: {x_train.shape}, Test set: {x_test.shape}")
     return TrainTestData(x_train, x_test, y_train, y_test, feature_names)
 
+def suggest_params(trial):
+    """Sample one set of hyperparameters from SEARCH_SPACE"""
+    suggest = {
+        "int": trial.suggest_int,
+        "float": trial.suggest_float,
+        "categorical": trial.suggest_categorical,
+    }
+    return {name: suggest[kind](name, *args) for name, (kind, *args) in SEARCH_SPACE.items()}
+
+def code_files():
+    """Every module of the src package and the pinned requirements, in a stable order
+
+    Training imports modules from several subpackages (components, logger, utility,
+    ...), so the whole package is hashed rather than guessing which of them matter.
+    """
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = sorted(glob.glob(os.path.join(package_root, "**", "*.py"), recursive=True))
+    requirements = os.path.join(os.path.dirname(package_root), "requirements.txt")
+    if os.path.exists(requirements):
+        paths.append(requirements)
+    return [(os.path.relpath(path, package_root), path) for path in paths]
+
+def training_fingerprint(data_path):
+    """Hash of the training data, the search space and the training code version
+
+    The code version covers the sources of the whole src package, the pinned
+    requirements and the installed scikit-learn version. Two jobs with the same
+    fingerprint train on byte-identical data with the same search space and code, so
+    the second one cannot produce a better model.
+    """
+    digest = hashlib.sha256()
+    with open(data_path, "rb") as data_file:
+        for block in iter(lambda: data_file.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(json.dumps(SEARCH_SPACE, sort_keys=True).encode("utf-8"))
+    for name, path in code_files():
+        digest.update(name.encode("utf-8"))
+        with open(path, "rb") as code_file:
+            digest.update(code_file.read())
+    digest.update(sklearn.__version__.encode("utf-8"))
+    return digest.hexdigest()
+
+def find_run_by_fingerprint(fingerprint, max_candidates=20):
+    """Most recent finished MLflow run tagged with the given training fingerprint
+
+    Only runs that registered a model version count: a run that finished without
+    one (e.g. it failed before registration and was marked finished by hand) must not
+    make a later job skip training. Returns None as well when the "Default"
+    experiment does not exist yet, i.e. nothing was ever trained on this server.
+    """
+    client = mlflow.tracking.MlflowClient()
+    experiment = client.get_experiment_by_name("Default")
+    if experiment is None:
+        return None
+    runs = client.search_runs(
+        experiment_ids=[experiment.experiment_id],
+        filter_string=f"tags.{FINGERPRINT_TAG} = '{fingerprint}' and attributes.status = 'FINISHED'",
+        order_by=["start_time DESC"],
+        max_results=max_candidates,
+    )
+    for run in runs:
+        if client.search_model_versions(f"run_id = '{run.info.run_id}'"):
+            return run
+        logging.info(f"Run {run.info.run_id} has the same fingerprint but registered no model")
+    return None
+
+def load_run_baseline(run_id):
+    """Baseline statistics logged by an MLflow run, or None if it has none"""
+    try:
+        local_path = mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path=BASELINE_ARTIFACT)
+    except (MlflowException, OSError) as e:
+        logging.warning(f"No baseline statistics for run {run_id}: {e}")
+        return None
+    with open(local_path, "r") as f:
+        return json.load(f)
+
+def load_incremental_base(data):
+    """Production model to extend incrementally, or None when a full retrain is due
+
+    A full retrain is due when there is no production model, every
+    FULL_RETRAIN_EVERY runs, when the forest reached INCREMENTAL_MAX_TREES, when
+    this run's classes differ from the model's, since added trees must predict the
+    same classes as the existing ones, or when the model's run has no baseline
+    statistics with histograms for the same features to extend.
+
+    Returns:
+        tuple: (model or None, incremental runs since the last full retrain incl. this
+            one, baseline statistics of the model's training data or None)
+    """
+    full_every = int(os.environ.get("FULL_RETRAIN_EVERY", "5"))
+    max_trees = int(os.environ.get("INCREMENTAL_MAX_TREES", "200"))
+
+    promotion = ModelPromotion()
+    prod_version, _ = promotion.get_production_model()
+    if prod_version is None:
+        logging.info("No production model to extend; running a full retrain")
+        return None, 0, None
+
+    prod_run = promotion.client.get_run(prod_version.run_id)
+    runs_since_full = int(prod_run.data.tags.get(RUNS_SINCE_FULL_TAG, "0")) + 1
+    if runs_since_full >= full_every:
+        logging.info(f"{runs_since_full} runs since the last full retrain; running a full retrain")
+        return None, 0, None
+
+    model = mlflow.sklearn.load_model(f"models:/{promotion.model_name}/{prod_version.version}")
+    if not isinstance(model, RandomForestClassifier) or model.n_estimators >= max_trees:
+        logging.info("Production model cannot be extended further; running a full retrain")
+        return None, 0, None
+    if not np.array_equal(np.unique(np.concatenate([data.y_train, data.y_test])), model.classes_):
+        logging.info("Class labels changed since the production model; running a full retrain")
+        return None, 0, None
+
+    baseline = load_run_baseline(prod_run.info.run_id)
+    if baseline is None or "histogram" not in baseline or baseline["feature_names"] != data.feature_names:
+        logging.info("Production model has no baseline statistics to extend; running a full retrain")
+        return None, 0, None
+
+    logging.info(f"Extending production model version {prod_version.version} (incremental run {runs_since_full})")
+    return model, runs_since_full, baseline
+
 def run_training():
-    """Main training function to be called by __main__.py"""    
+    """Main training function to be called by __main__.py
+
+    TRAINING_CACHE_MODE controls what happens when a finished run with the same
+    training fingerprint exists: "skip" ends the job, "reuse_params" trains the final
+    model with that run's best params without a new search, "off" always retrains.
+
+    With TRAINING_MODE=incremental, trees fitted on this run's data are added to the
+    production model, and a full search and retrain happens every FULL_RETRAIN_EVERY
+    runs (see load_incremental_base).
+    """    
     logging.info("=== Starting training process ===")
     
     try:
+        cache_mode = os.environ.get("TRAINING_CACHE_MODE", "skip")
+        fingerprint = training_fingerprint(find_training_input())
+        logging.info(f"Training fingerprint: {fingerprint}")
+
+        previous_run = None
+        if cache_mode != "off":
+            setup_mlflow()
+            previous_run = find_run_by_fingerprint(fingerprint)
+
+        best_params = None
+        if previous_run is not None:
+            previous_id = previous_run.info.run_id
+            if cache_mode == "skip":
+                logging.info(f"Run {previous_id} already trained on identical data and config; skipping training")
+                return
+            if BEST_PARAMS_TAG in previous_run.data.tags:
+                best_params = json.loads(previous_run.data.tags[BEST_PARAMS_TAG])
+
         data = load_data()
+        base_model, runs_since_full, base_baseline = None, 0, None
+        if os.environ.get("TRAINING_MODE", "full") == "incremental":
+            setup_mlflow()
+            base_model, runs_since_full, base_baseline = load_incremental_base(data)
+
         trainer = ModelTrainer(data)
-        trainer.train_and_log()
+        trainer.train_and_log(
+            fingerprint=fingerprint,
+            best_params=best_params,
+            reused_run_id=previous_run.info.run_id if previous_run is not None else None,
+            base_model=base_model,
+            runs_since_full=runs_since_full,
+            base_baseline=base_baseline,
+        )
         logging.info("=== Training completed successfully ===")
     except Exception as e:
         logging.error(f"Training failed with error: {e}")
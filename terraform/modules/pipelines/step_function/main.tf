@@ -284,7 +284,7 @@ resource "aws_sfn_state_machine" "step_function" {
                 "S3DataDistributionType": "FullyReplicated"
               }
             },
-            "ContentType": "application/vnd.ms-excel"
+            "ContentType.$": "$.combined_data.content_type"
           }
         ],
         "OutputDataConfig": {
@@ -292,7 +292,10 @@ resource "aws_sfn_state_machine" "step_function" {
         },
         "Environment": {
           "MLFLOW_TRACKING_URI": "https://${var.mlflow_private_ip}",
-          "SAGEMAKER_PROGRAM": "train"
+          "SAGEMAKER_PROGRAM": "train",
+          "TRAINING_CACHE_MODE": "skip",
+          "TRAINING_MODE": "${var.training_mode}",
+          "FULL_RETRAIN_EVERY": "${var.full_retrain_every}"
         },
         "StoppingCondition": {
           "MaxRuntimeInSeconds": 7200
@@ -339,10 +342,11 @@ resource "aws_sfn_state_machine" "step_function" {
               "S3DataType": "S3Prefix"
             }
           },
-          "ContentType": "text/csv"
+          "ContentType.$": "$.combined_data.content_type"
         },
         "TransformOutput": {
-          "S3OutputPath.$": "States.Format('s3://{}/prediction-outputs/{}', '${var.s3_bucket_name}', $.split_result.run_id)"
+          "S3OutputPath.$": "States.Format('s3://{}/prediction-outputs/{}', '${var.s3_bucket_name}', $.split_result.run_id)",
+          "Accept": "text/csv"
         },
         "TransformResources": {
           "InstanceType": "ml.c7i.large",
@@ -382,9 +386,10 @@ resource "aws_sfn_state_machine" "step_function" {
       "Resource": "arn:aws:lambda:${var.aws_region}:${var.aws_account_id}:function:${var.monitoring_lambda_name}",
       "Parameters": {
         "s3_bucket": "${var.s3_bucket_name}",
-        "s3_key.$": "States.Format('prediction-outputs/{}/combined_results.csv.out', $.split_result.run_id)",
+        "s3_key.$": "States.Format('prediction-outputs/{}/{}.out', $.split_result.run_id, $.combined_data.output_file)",
         "mlflow_tracking_uri": "https://${var.mlflow_private_ip}",
-        "sns_topic_arn": "${var.alert_sns_topic_arn}"
+        "sns_topic_arn": "${var.alert_sns_topic_arn}",
+        "monitoring_mode": "${var.monitoring_mode}"
       },
       "ResultPath": "$.monitoring_result",
       "Catch": [
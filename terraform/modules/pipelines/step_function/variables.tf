@@ -82,4 +82,22 @@ variable "sagemaker_model_name" {
 variable "monitoring_lambda_name" {
   description = "Name of the Lambda function for monitoring predictions"
   type        = string
+}
+
+variable "training_mode" {
+  description = "Training mode of the SageMaker training job: \"full\" retrains from scratch, \"incremental\" adds trees to the production model"
+  type        = string
+  default     = "full"
+}
+
+variable "full_retrain_every" {
+  description = "With incremental training, number of runs after which a full retrain happens"
+  type        = number
+  default     = 5
+}
+
+variable "monitoring_mode" {
+  description = "How the monitoring Lambda reads predictions: \"full\" loads the whole file, \"stream\" accumulates statistics chunk by chunk"
+  type        = string
+  default     = "full"
 }
\ No newline at end of file
@@ -0,0 +1,52 @@
+import unittest
+from unittest import mock
+
+from src.components import aws_clients
+
+
+class TestAwsClients(unittest.TestCase):
+    def setUp(self):
+        aws_clients.clear()
+        patcher = mock.patch.object(aws_clients.boto3, "client")
+        self.boto3_client = patcher.start()
+        self.boto3_client.side_effect = lambda *args, **kwargs: mock.Mock()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(aws_clients.clear)
+
+    def test_client_reused_until_expiry(self):
+        """
+        A client is shared per configuration and rebuilt once its TTL has passed.
+        """
+        with mock.patch.object(aws_clients.time, "monotonic", return_value=0):
+            first = aws_clients.get_client("s3", ttl=10)
+            self.assertIs(aws_clients.get_client("s3", ttl=10), first)
+            self.assertIsNot(
+                aws_clients.get_client("s3", max_pool_connections=50), first
+            )
+
+        with mock.patch.object(aws_clients.time, "monotonic", return_value=11):
+            self.assertIsNot(aws_clients.get_client("s3", ttl=10), first)
+
+        self.assertEqual(self.boto3_client.call_count, 3)
+
+    def test_secret_fetched_once_per_ttl(self):
+        """
+        Secrets Manager is only called again after the secret expired.
+        """
+        with mock.patch.object(aws_clients.time, "monotonic", return_value=0):
+            client = aws_clients.get_client(
+                "secretsmanager", region_name="eu-central-1"
+            )
+            client.get_secret_value.return_value = {"SecretString": "{}"}
+
+            for _ in range(3):
+                aws_clients.get_secret("mlflow", region_name="eu-central-1", ttl=5)
+        with mock.patch.object(aws_clients.time, "monotonic", return_value=6):
+            aws_clients.get_secret("mlflow", region_name="eu-central-1", ttl=5)
+
+        self.assertEqual(client.get_secret_value.call_count, 2)
+        self.assertEqual(aws_clients.stats()["secret_hits"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import threading
+import unittest
+
+import pandas as pd
+
+from src.sagemaker.batching import MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_requests_share_one_call(self):
+        """
+        Concurrent requests are merged and each gets back its own rows.
+        """
+        calls = []
+        release = threading.Event()
+
+        def predict_fn(df):
+            calls.append(len(df))
+            return df["x"].to_numpy() * 2
+
+        batcher = MicroBatcher(predict_fn, max_batch_size=100, max_wait_ms=200)
+        results = {}
+
+        def request(i):
+            release.wait()
+            results[i] = batcher.submit(pd.DataFrame({"x": [i, i]}))
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(calls), 8)
+        self.assertLess(len(calls), 4)
+        for i in range(4):
+            self.assertEqual(list(results[i]), [2 * i, 2 * i])
+
+    def test_errors_reach_every_request(self):
+        """
+        A failing model call is raised in the submitting request.
+        """
+
+        def predict_fn(df):
+            raise RuntimeError("model failed")
+
+        batcher = MicroBatcher(predict_fn, max_wait_ms=1)
+        with self.assertRaises(RuntimeError):
+            batcher.submit(pd.DataFrame({"x": [1]}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,301 @@
+import io
+import time
+import unittest
+from unittest import mock
+
+import boto3
+import pandas as pd
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+from botocore.stub import ANY, Stubber
+
+from src.components import data_management
+from src.components.data_management import DataManagement
+from src.components.table_io import write_table
+from src.errors.data_management_errors import VersioningError
+
+
+def object_body(data: bytes) -> StreamingBody:
+    """
+    A get_object response body holding `data`.
+    """
+    return StreamingBody(io.BytesIO(data), len(data))
+
+
+class TestDataManagement(unittest.TestCase):
+    def setUp(self):
+        self.s3_client = boto3.client(
+            "s3",
+            region_name="eu-central-1",
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+        )
+        patcher = mock.patch.object(
+            data_management, "get_client", return_value=self.s3_client
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.stubber = Stubber(self.s3_client)
+        self.stubber.activate()
+        self.addCleanup(self.stubber.deactivate)
+
+        self.data_management = DataManagement()
+        self.df = pd.DataFrame(
+            {"UIn": [1.0, 2.0, 3.0], "p": [101325, 2e5, 3e5], "label": ["a", "b", "c"]}
+        )
+
+    def serialize(self, extension: str) -> bytes:
+        """
+        The test frame as the bytes of a file with the given extension.
+        """
+        buffer = io.BytesIO()
+        write_table(self.df, buffer, extension)
+        return buffer.getvalue()
+
+    def test_stream_matches_download(self):
+        """
+        Streaming the object body yields the same frame as the /tmp download mode.
+        """
+        for extension in ("csv", "parquet"):
+            data = self.serialize(extension)
+            key = f"splits/run/chunk_001.{extension}"
+
+            self.stubber.add_response(
+                "get_object",
+                {
+                    "Body": object_body(data),
+                    "VersionId": "v2",
+                    "ContentLength": len(data),
+                },
+                {"Bucket": "bucket", "Key": key},
+            )
+            streamed, streamed_version = self.data_management.load_s3_file(
+                "bucket", key
+            )
+
+            self.stubber.add_response(
+                "list_object_versions",
+                {"Versions": [{"Key": key, "VersionId": "v2"}]},
+                {"Bucket": "bucket", "Prefix": key},
+            )
+            self.data_management.management_config["s3_read_mode"] = "download"
+
+            def download_file(_bucket, _key, path, data=data, **kwargs):
+                self.assertEqual(kwargs["ExtraArgs"], {"VersionId": "v2"})
+                with open(path, "wb") as local_file:
+                    local_file.write(data)
+
+            with (
+                mock.patch.object(
+                    self.s3_client, "download_file", side_effect=download_file
+                ),
+                self.assertLogs(level="INFO") as logs,
+            ):
+                downloaded, downloaded_version = self.data_management.load_s3_file(
+                    "bucket", key
+                )
+            self.data_management.management_config["s3_read_mode"] = "stream"
+
+            pd.testing.assert_frame_equal(streamed, self.df)
+            pd.testing.assert_frame_equal(streamed, downloaded)
+            self.assertEqual(streamed_version, downloaded_version)
+            self.assertIn(f"Read {len(data)} bytes from {key}", logs.output[-1])
+        self.stubber.assert_no_pending_responses()
+
+    def test_stream_with_version_id(self):
+        """
+        A known version id is requested directly, without listing versions.
+        """
+        data = self.serialize("csv")
+        self.stubber.add_response(
+            "get_object",
+            {"Body": object_body(data), "VersionId": "v1", "ContentLength": len(data)},
+            {"Bucket": "bucket", "Key": "raw/data.csv", "VersionId": "v1"},
+        )
+
+        df, version_id = self.data_management.load_s3_file(
+            "bucket", "raw/data.csv", "v1"
+        )
+
+        pd.testing.assert_frame_equal(df, self.df)
+        self.assertEqual(version_id, "v1")
+        self.stubber.assert_no_pending_responses()
+
+    def test_iter_s3_file_chunks(self):
+        """
+        Chunked reads yield consecutive row chunks of at most `chunksize` rows.
+        """
+        self.df = pd.DataFrame({"UIn": range(250), "p": [float(i) for i in range(250)]})
+        for extension in ("csv", "parquet"):
+            data = self.serialize(extension)
+            key = f"splits/run/chunk_001.{extension}"
+            self.stubber.add_response(
+                "get_object",
+                {
+                    "Body": object_body(data),
+                    "VersionId": "v3",
+                    "ContentLength": len(data),
+                },
+                {"Bucket": "bucket", "Key": key},
+            )
+
+            chunks, version_id = self.data_management.iter_s3_file(
+                "bucket", key, chunksize=64
+            )
+            chunks = list(chunks)
+
+            self.assertEqual(version_id, "v3")
+            self.assertEqual([len(chunk) for chunk in chunks], [64, 64, 64, 58])
+            pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), self.df)
+        self.stubber.assert_no_pending_responses()
+
+    def test_stream_errors(self):
+        """
+        Missing objects and unversioned buckets raise the documented errors.
+        """
+        self.stubber.add_client_error("get_object", "NoSuchKey", http_status_code=404)
+        with self.assertRaises(FileNotFoundError):
+            self.data_management.load_s3_file("bucket", "raw/missing.csv")
+
+        data = self.serialize("csv")
+        self.stubber.add_response(
+            "get_object", {"Body": object_body(data), "ContentLength": len(data)}
+        )
+        with self.assertRaises(VersioningError):
+            self.data_management.load_s3_file("bucket", "raw/data.csv")
+
+    def test_load_s3_files_collects_failures(self):
+        """
+        A failing file is reported per key and does not stop the other loads.
+        """
+        keys = [f"simulated/run/job_{i}.csv" for i in range(8)]
+
+        def load_s3_file(_bucket, key):
+            if key.endswith(("_3.csv", "_6.csv")):
+                raise FileNotFoundError(key)
+            return self.df.assign(job=key), "v1"
+
+        with mock.patch.object(
+            self.data_management, "load_s3_file", side_effect=load_s3_file
+        ):
+            loaded, failed = self.data_management.load_s3_files(
+                "bucket", keys, max_workers=4
+            )
+
+        self.assertEqual(sorted(failed), [keys[3], keys[6]])
+        self.assertIsInstance(failed[keys[3]], FileNotFoundError)
+        self.assertEqual(sorted(loaded), [k for k in keys if k not in failed])
+        for key, df in loaded.items():
+            self.assertEqual(set(df["job"]), {key})
+        self.assertEqual(self.data_management.load_s3_files("bucket", []), ({}, {}))
+
+    def test_upload_tags_inline(self):
+        """
+        Each upload is one put_object with the version tag URL-encoded in Tagging.
+        """
+        version_id = "3/L4kqtJl+x=v"
+        for name in ("chunk_0.csv", "chunk_1.csv"):
+            self.stubber.add_response(
+                "put_object",
+                {},
+                {
+                    "Bucket": "bucket",
+                    "Key": name,
+                    "Body": ANY,
+                    "ContentType": "text/csv",
+                    "Tagging": "source_raw_version_id=3%2FL4kqtJl%2Bx%3Dv",
+                },
+            )
+
+        # One worker, so that the stubbed responses are consumed in order; any
+        # put_object_tagging call would fail as an unstubbed request
+        keys = self.data_management.upload_dataframes(
+            [(self.df, "chunk_0.csv"), (self.df, "chunk_1.csv")],
+            "bucket",
+            version_id,
+            max_workers=1,
+        )
+
+        self.assertEqual(keys, ["chunk_0.csv", "chunk_1.csv"])
+        self.stubber.assert_no_pending_responses()
+
+    def test_upload_keys_keep_order(self):
+        """
+        Keys are returned in the order of the chunks, not of finished uploads.
+        """
+        names = [f"chunk_{i}.csv" for i in range(8)]
+        bodies = {}
+
+        def put_object(**kwargs):
+            # Earlier chunks finish last
+            time.sleep(0.01 * (len(names) - names.index(kwargs["Key"])))
+            bodies[kwargs["Key"]] = kwargs["Body"]
+
+        with mock.patch.object(self.s3_client, "put_object", side_effect=put_object):
+            keys = self.data_management.upload_dataframes(
+                [(self.df, name) for name in names], "bucket", "v1", max_workers=8
+            )
+
+        self.assertEqual(keys, names)
+        self.assertEqual(set(bodies.values()), {self.serialize("csv")})
+
+    def test_upload_failure_propagates(self):
+        """
+        A failed upload raises its error after the other uploads.
+        """
+        names = [f"chunk_{i}.csv" for i in range(4)]
+        error = ClientError(
+            {"Error": {"Code": "AccessDenied", "Message": "denied"}}, "PutObject"
+        )
+
+        def put_object(**kwargs):
+            if kwargs["Key"] == names[2]:
+                raise error
+
+        with mock.patch.object(
+            self.s3_client, "put_object", side_effect=put_object
+        ) as put:
+            with self.assertRaises(ClientError) as raised:
+                self.data_management.upload_dataframes(
+                    [(self.df, name) for name in names], "bucket", "v1", max_workers=2
+                )
+
+        self.assertIs(raised.exception, error)
+        self.assertEqual(put.call_count, len(names))
+
+    def test_list_s3_keys_paginates(self):
+        """
+        Listings beyond 1000 keys follow the continuation token to the last page.
+        """
+        prefix = "simulated/run/"
+        keys = [f"{prefix}job_{i:04d}.csv" for i in range(2500)]
+        pages = [keys[:1000], keys[1000:2000], keys[2000:]]
+        for number, page in enumerate(pages):
+            response = {
+                "Contents": [{"Key": key} for key in page],
+                "KeyCount": len(page),
+                "IsTruncated": number < len(pages) - 1,
+            }
+            expected_params = {"Bucket": "bucket", "Prefix": prefix}
+            if number < len(pages) - 1:
+                response["NextContinuationToken"] = f"token-{number}"
+            if number > 0:
+                expected_params["ContinuationToken"] = f"token-{number - 1}"
+            self.stubber.add_response("list_objects_v2", response, expected_params)
+        self.stubber.add_response(
+            "list_objects_v2",
+            {"Contents": [{"Key": f"{prefix}_SUCCESS"}], "IsTruncated": False},
+        )
+
+        self.assertEqual(
+            self.data_management.list_s3_keys("bucket", prefix, suffix=".csv"), keys
+        )
+        self.assertEqual(
+            self.data_management.list_s3_keys("bucket", prefix), [f"{prefix}_SUCCESS"]
+        )
+        self.stubber.assert_no_pending_responses()
+
+
+if __name__ == "__main__":
+    unittest.main()
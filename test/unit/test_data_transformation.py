@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.components.data_transformation import transform_data
+
+COLUMNS = (
+    ["Sample", "Stream"]
+    + [f"Feature {i}" for i in range(7)]
+    + ["Velocity Input Sim l/min", "Pressure Input Sim bar", "Agglomeration class"]
+)
+
+
+def make_sheet(targets):
+    """
+    Build a raw experiment sheet with a units row and one triplet per target.
+    """
+    rows = [["unit"] * len(COLUMNS)]
+    for sample, target in enumerate(targets):
+        for stream in range(3):
+            values = [float(sample * 10 + stream + i) for i in range(7)]
+            label = target if stream == 2 else np.nan
+            rows.append([f"S{sample}", stream] + values + [sample + 1, 1.5, label])
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+class TestTransformData(unittest.TestCase):
+    def test_wide_layout(self):
+        """
+        Each triplet becomes one row with Feed, Permeat and Retentat blocks.
+        """
+        result = transform_data(make_sheet([0, 2]))
+
+        self.assertEqual(result.shape, (2, 28))
+        self.assertEqual(result.columns[0], "Feed_Feature 0")
+        self.assertEqual(result.columns[9], "Permeat_Feature 0")
+        self.assertIn("UIn", result.columns)
+        self.assertIn("p", result.columns)
+        self.assertEqual(result.loc[1, "Retentat_Feature 0"], 12.0)
+        self.assertEqual(result["UIn"].dtype, np.int64)
+        self.assertEqual(result["Feed_Feature 3"].dtype, np.float64)
+        self.assertEqual(result["Agglomeration class"].tolist(), [0, 2])
+        self.assertEqual(result["Agglomeration class"].dtype, np.int64)
+
+    def test_missing_target(self):
+        """
+        Triplets without a label keep NaN in a float target column.
+        """
+        result = transform_data(make_sheet([1, np.nan]))
+
+        self.assertEqual(result["Agglomeration class"].dtype, np.float64)
+        self.assertEqual(result.loc[0, "Agglomeration class"], 1.0)
+        self.assertTrue(np.isnan(result.loc[1, "Agglomeration class"]))
+
+    def test_prediction_sheet(self):
+        """
+        Sheets without a target column produce only feature columns.
+        """
+        result = transform_data(make_sheet([0, 1]).iloc[:, :11])
+
+        self.assertEqual(result.shape, (2, 27))
+
+    def test_incomplete_triplet(self):
+        """
+        A trailing partial triplet is rejected.
+        """
+        with self.assertRaises(ValueError):
+            transform_data(make_sheet([0, 1]).iloc[:-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
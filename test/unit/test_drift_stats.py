@@ -0,0 +1,120 @@
+import json
+import unittest
+
+import numpy as np
+
+from src.components.drift_stats import (
+    DriftAccumulator,
+    baseline_statistics,
+    drift_statistics,
+    extend_baseline_statistics,
+)
+
+
+class TestDriftStats(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.names = ["UIn", "p", "T"]
+        self.x_train = rng.normal(size=(20_000, 3))
+        # Baselines are stored as JSON artifacts
+        self.baseline = json.loads(
+            json.dumps(baseline_statistics(self.x_train, self.names))
+        )
+        self.x_pred = rng.normal(size=(20_000, 3))
+
+    def test_baseline_moments(self):
+        """
+        Baseline moments match NumPy and histograms sum to one.
+        """
+        np.testing.assert_allclose(self.baseline["mean"], self.x_train.mean(axis=0))
+        np.testing.assert_allclose(self.baseline["std"], self.x_train.std(axis=0))
+        np.testing.assert_allclose(
+            np.sum(self.baseline["histogram"]["proportions"], axis=1), 1.0
+        )
+
+    def test_detects_shift_and_scale(self):
+        """
+        A shifted mean and a widened spread raise PSI and KS; unchanged features do not.
+        """
+        self.x_pred[:, 1] += 1.0
+        self.x_pred[:, 2] *= 2.0
+        stats = drift_statistics(self.baseline, self.x_pred)
+
+        self.assertLess(stats.loc["UIn", "psi"], 0.05)
+        self.assertGreater(stats.loc["p", "psi"], 0.2)
+        self.assertGreater(stats.loc["p", "z_score"], 0.9)
+        self.assertGreater(stats.loc["T", "psi"], 0.2)
+        self.assertLess(stats.loc["T", "z_score"], 0.1)
+        self.assertGreater(stats.loc["p", "ks"], stats.loc["UIn", "ks"])
+
+    def test_quantiles_and_missing_values(self):
+        """
+        Histogram quantiles approximate exact ones and NaN is counted as missing.
+        """
+        self.x_pred[::10, 0] = np.nan
+        stats = drift_statistics(self.baseline, self.x_pred)
+
+        expected = np.nanquantile(self.x_pred[:, 0], [0.05, 0.5, 0.95])
+        np.testing.assert_allclose(
+            stats.loc["UIn", ["q5", "q50", "q95"]].to_numpy(dtype=float),
+            expected,
+            atol=0.05,
+        )
+        self.assertAlmostEqual(stats.loc["UIn", "missing_ratio"], 0.1)
+        self.assertAlmostEqual(
+            stats.loc["UIn", "mean"], np.nanmean(self.x_pred[:, 0]), places=10
+        )
+
+    def test_merged_chunks_match_single_pass(self):
+        """
+        Statistics merged from uneven chunks equal those of the whole array.
+        """
+        self.x_pred[::7, 2] = np.nan
+        parts = [
+            DriftAccumulator.for_baseline(self.baseline, chunk_size=500).update(
+                self.x_pred[start : start + 3_000]
+            )
+            for start in range(0, len(self.x_pred), 3_000)
+        ]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+
+        np.testing.assert_allclose(
+            drift_statistics(self.baseline, merged).to_numpy(dtype=float),
+            drift_statistics(self.baseline, self.x_pred).to_numpy(dtype=float),
+            rtol=1e-10,
+        )
+
+    def test_extended_baseline_covers_all_rows(self):
+        """
+        A baseline extended with new rows describes the old and new rows together.
+        """
+        first, second = self.x_train[:12_000], self.x_pred
+        extended = extend_baseline_statistics(
+            json.loads(json.dumps(baseline_statistics(first, self.names))), second
+        )
+        combined = np.concatenate([first, second])
+
+        self.assertEqual(extended["shape"], [len(combined), 3])
+        self.assertEqual(extended["feature_names"], self.names)
+        np.testing.assert_allclose(extended["mean"], combined.mean(axis=0))
+        np.testing.assert_allclose(extended["std"], combined.std(axis=0))
+        np.testing.assert_allclose(extended["min"], combined.min(axis=0))
+        np.testing.assert_allclose(extended["max"], combined.max(axis=0))
+
+        expected = DriftAccumulator.for_baseline(extended).update(combined).summary()
+        np.testing.assert_allclose(
+            extended["histogram"]["proportions"],
+            expected["counts"] / len(combined),
+            atol=1e-12,
+        )
+        np.testing.assert_allclose(
+            extended["quantiles"]["values"],
+            np.quantile(combined, extended["quantiles"]["levels"], axis=0).T,
+            atol=0.1,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
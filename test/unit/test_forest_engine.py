@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from src.sagemaker.forest_engine import CompiledForest, compile_forest
+
+
+class TestCompiledForest(unittest.TestCase):
+    def setUp(self):
+        self.x, y = make_classification(
+            n_samples=500, n_features=8, n_informative=5, n_classes=3, random_state=0
+        )
+        self.y = np.array(["low", "mid", "high"])[y]
+
+    def test_matches_sklearn(self):
+        """
+        Probabilities and classes are identical to sklearn, also across chunks.
+        """
+        model = RandomForestClassifier(n_estimators=6, max_depth=5, random_state=42)
+        model.fit(self.x, self.y)
+        compiled = CompiledForest(model, chunk_size=64)
+
+        np.testing.assert_array_equal(
+            compiled.predict_proba(self.x), model.predict_proba(self.x)
+        )
+        np.testing.assert_array_equal(compiled.predict(self.x), model.predict(self.x))
+        np.testing.assert_array_equal(
+            compiled.predict_proba(self.x[:1]), model.predict_proba(self.x[:1])
+        )
+
+    def test_missing_values(self):
+        """
+        Rows with NaN features follow the same branches as in sklearn.
+        """
+        x = self.x.copy()
+        x[::4, 2] = np.nan
+        model = RandomForestClassifier(n_estimators=4, random_state=42).fit(x, self.y)
+
+        np.testing.assert_array_equal(
+            CompiledForest(model).predict_proba(x), model.predict_proba(x)
+        )
+
+    def test_unsupported_model_is_returned_unchanged(self):
+        """
+        Models other than forest classifiers are served by sklearn.
+        """
+        model = DecisionTreeClassifier(max_depth=3).fit(self.x, self.y)
+        self.assertIs(compile_forest(model), model)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import time
+import types
+import unittest
+from unittest import mock
+
+from src.components import mlflow_utils
+from src.components.mlflow_utils import ModelCache
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met before the timeout")
+        time.sleep(0.01)
+
+
+class TestModelCache(unittest.TestCase):
+    def setUp(self):
+        self.production_version = "1"
+        self.lookup_error = None
+
+        def find_production_model(_promotion):
+            if self.lookup_error is not None:
+                raise self.lookup_error
+            if self.production_version is None:
+                return None, None
+            return types.SimpleNamespace(version=self.production_version), 0.9
+
+        for target, attribute, kwargs in [
+            (mlflow_utils.mlflow, "MlflowClient", {}),
+            (
+                mlflow_utils.ModelPromotion,
+                "find_production_model",
+                {"autospec": True, "side_effect": find_production_model},
+            ),
+            (
+                mlflow_utils.mlflow.sklearn,
+                "load_model",
+                {"side_effect": lambda uri: f"model from {uri}"},
+            ),
+        ]:
+            patcher = mock.patch.object(target, attribute, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.cache = ModelCache(model_name="model", refresh_interval=0.02)
+        self.addCleanup(self.cache.stop)
+
+    def test_refresh_loads_new_versions_only(self):
+        """
+        The model is loaded once per production version and reused in between.
+        """
+        model, prod_model = self.cache.get()
+        self.assertEqual(model, "model from models:/model/1")
+        self.assertEqual(prod_model.version, "1")
+
+        self.assertFalse(self.cache.refresh())
+        self.assertIs(self.cache.get()[0], model)
+
+        self.production_version = "2"
+        self.assertTrue(self.cache.refresh())
+        self.assertEqual(self.cache.get()[0], "model from models:/model/2")
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["loads"], stats["checks"]), (2, 3))
+        self.assertEqual(stats["model_version"], "2")
+        self.assertIsNone(stats["last_error"])
+
+    def test_background_refresh_after_interval(self):
+        """
+        Once the refresh interval has passed, the background thread picks up a new version.
+        """
+        self.cache.get()
+        self.cache.start()
+        self.production_version = "2"
+
+        wait_for(lambda: self.cache.stats()["model_version"] == "2")
+        self.assertEqual(self.cache.get()[0], "model from models:/model/2")
+
+    def test_stale_model_served_on_error(self):
+        """
+        Failed refreshes keep the cached model and are reported until one succeeds.
+        """
+        model, _ = self.cache.get()
+        self.lookup_error = ConnectionError("MLflow unreachable")
+
+        with self.assertRaises(ConnectionError):
+            self.cache.refresh()
+        self.assertEqual(self.cache.stats()["last_error"], "MLflow unreachable")
+        self.assertIs(self.cache.get()[0], model)
+
+        self.cache.start()
+        self.lookup_error = None
+        self.production_version = None
+        wait_for(
+            lambda: self.cache.stats()["last_error"] == "No production model found"
+        )
+        self.assertIs(self.cache.get()[0], model)
+
+        self.production_version = "1"
+        wait_for(lambda: self.cache.stats()["last_error"] is None)
+        self.assertIs(self.cache.get()[0], model)
+
+    def test_after_fork_keeps_model(self):
+        """
+        A forked child keeps the cached model and gets fresh locks and a refresh thread.
+        """
+        model, _ = self.cache.get()
+        # A lock copied while held by another thread of the parent stays held
+        self.cache._refresh_lock.acquire()  # pylint: disable=protected-access,R1732
+
+        self.cache.after_fork()
+
+        self.assertIs(self.cache.get()[0], model)
+        self.assertFalse(self.cache.refresh())
+        self.production_version = "2"
+        wait_for(lambda: self.cache.stats()["model_version"] == "2")
+
+    def test_first_load_without_model(self):
+        """
+        Requests fail while no production model exists yet.
+        """
+        self.production_version = None
+        with self.assertRaises(ValueError):
+            self.cache.get()
+        self.assertEqual(self.cache.stats()["last_error"], "No production model found")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+import json
+import os
+import shutil
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.components.drift_stats import (
+    BASELINE_ARTIFACT,
+    BASELINE_TAG,
+    baseline_statistics,
+)
+from src.lambda_functions import monitoring
+from src.utility import get_cfg
+
+
+class TestFlagDrift(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.names = ["UIn", "p", "T"]
+        x_train = rng.normal(size=(5_000, 3))
+        self.baseline = json.loads(json.dumps(baseline_statistics(x_train, self.names)))
+        x_pred = rng.normal(size=(5_000, 3))
+        # p drifts in its mean, T only in its spread, which the z-score does not see
+        x_pred[:, 1] += 3.0
+        x_pred[:, 2] *= 3.0
+        self.pred_df = pd.DataFrame(x_pred, columns=self.names)
+
+    def test_psi_off_keeps_z_score_decisions(self):
+        """
+        Without a PSI threshold exactly the features over the z-score threshold drift.
+        """
+        drifted, report, stats = monitoring.compare_distributions(
+            self.baseline, self.pred_df, self.names
+        )
+
+        self.assertEqual(drifted, stats.index[stats["z_score"] > 2.0].tolist())
+        self.assertEqual(drifted, ["p"])
+        self.assertEqual(len(report), 1)
+        self.assertGreater(stats.loc["T", "psi"], 0.2)
+
+    def test_psi_threshold(self):
+        """
+        With a PSI threshold a change in spread alone is flagged as well.
+        """
+        drifted, _, _ = monitoring.compare_distributions(
+            self.baseline, self.pred_df, self.names, psi_threshold=0.2
+        )
+
+        self.assertEqual(drifted, ["p", "T"])
+
+    def test_psi_disabled_by_default(self):
+        """
+        The monitoring config ships with the PSI alert off.
+        """
+        self.assertIsNone(get_cfg("lambda/monitoring.yaml")["psi_threshold"])
+
+
+def make_run(run_id):
+    """
+    Stand-in for an MLflow run with the given id.
+    """
+    return types.SimpleNamespace(info=types.SimpleNamespace(run_id=run_id))
+
+
+class TestBaselineLookup(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        for patcher in [
+            mock.patch.dict(
+                monitoring._baseline_lookup, {"run_id": None, "checked_at": None}
+            ),
+            mock.patch.object(monitoring.time, "monotonic", lambda: self.now),
+            mock.patch.object(monitoring, "BASELINE_CACHE_DIR", self.tmp_dir),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(monitoring.mlflow.tracking, "MlflowClient")
+        self.client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.client.get_experiment_by_name.return_value = types.SimpleNamespace(
+            experiment_id="0"
+        )
+
+    def test_tagged_run(self):
+        """
+        The newest tagged run is found with one filtered search, without listing artifacts.
+        """
+        self.client.search_runs.return_value = [make_run("tagged")]
+
+        self.assertEqual(monitoring.get_latest_run_with_baseline(), "tagged")
+        self.client.search_runs.assert_called_once()
+        self.assertIn(
+            f"tags.{BASELINE_TAG} = 'true'",
+            self.client.search_runs.call_args.kwargs["filter_string"],
+        )
+        self.client.list_artifacts.assert_not_called()
+
+    def test_untagged_fallback(self):
+        """
+        Without tagged runs the newest run with a baseline artifact is found by scanning.
+        """
+        self.client.search_runs.side_effect = [
+            [],
+            [make_run("no_baseline"), make_run("untagged"), make_run("older")],
+        ]
+        self.client.list_artifacts.side_effect = lambda run_id: [
+            types.SimpleNamespace(path="model"),
+            *(
+                [types.SimpleNamespace(path=BASELINE_ARTIFACT)]
+                if run_id != "no_baseline"
+                else []
+            ),
+        ]
+
+        self.assertEqual(monitoring.get_latest_run_with_baseline(), "untagged")
+        self.assertEqual(self.client.list_artifacts.call_count, 2)
+
+    def test_lookup_ttl(self):
+        """
+        The run found is reused for BASELINE_LOOKUP_TTL seconds, then searched again.
+        """
+        self.client.search_runs.return_value = [make_run("old")]
+        with mock.patch.dict(os.environ, {"BASELINE_LOOKUP_TTL": "300"}):
+            monitoring.get_latest_run_with_baseline()
+
+            self.client.search_runs.return_value = [make_run("new")]
+            self.now += 299
+            self.assertEqual(monitoring.get_latest_run_with_baseline(), "old")
+            self.client.search_runs.assert_called_once()
+
+            self.now += 2
+            self.assertEqual(monitoring.get_latest_run_with_baseline(), "new")
+            self.assertEqual(self.client.search_runs.call_count, 2)
+
+        with mock.patch.dict(os.environ, {"BASELINE_LOOKUP_TTL": "0"}):
+            monitoring.get_latest_run_with_baseline()
+            self.assertEqual(self.client.search_runs.call_count, 3)
+
+    def test_failed_load_drops_cached_run(self):
+        """
+        A baseline that fails to load makes the next invocation search again.
+        """
+        self.client.search_runs.return_value = [make_run("deleted")]
+        event = {
+            "mlflow_tracking_uri": "file:///tmp/mlruns",
+            "s3_bucket": "bucket",
+            "s3_key": "predictions.out",
+            "sns_topic_arn": "arn:aws:sns:eu-west-1:123456789012:alerts",
+        }
+        with (
+            mock.patch.object(monitoring, "setup_mlflow"),
+            mock.patch.object(
+                monitoring,
+                "load_baseline_stats_from_mlflow",
+                side_effect=OSError("run deleted"),
+            ),
+            mock.patch.dict(os.environ),
+        ):
+            with self.assertRaises(OSError):
+                monitoring.lambda_handler(event, None)
+
+        self.assertEqual(
+            monitoring._baseline_lookup, {"run_id": None, "checked_at": None}
+        )
+
+    def test_baseline_file_cache(self):
+        """
+        Baseline statistics are downloaded once per run id and then read from disk.
+        """
+        baseline = {"feature_names": ["UIn"], "mean": [1.0]}
+
+        def download_artifacts(run_id, artifact_path, dst_path):
+            path = os.path.join(dst_path, artifact_path)
+            with open(path, "w") as f:
+                json.dump({**baseline, "run_id": run_id}, f)
+            return path
+
+        with mock.patch.object(
+            monitoring.mlflow.artifacts,
+            "download_artifacts",
+            side_effect=download_artifacts,
+        ) as download:
+            first = monitoring.load_baseline_stats_from_mlflow("run1")
+            second = monitoring.load_baseline_stats_from_mlflow("run1")
+            other = monitoring.load_baseline_stats_from_mlflow("run2")
+
+        self.assertEqual(download.call_count, 2)
+        self.assertEqual(first, second)
+        self.assertEqual(other["run_id"], "run2")
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), ["run1.json", "run2.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
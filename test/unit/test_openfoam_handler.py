@@ -1,13 +1,71 @@
 import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
 import pandas as pd
 
-from src.components.openfoam_handler import OpenFoamHandler
+from src.components.openfoam_handler import (
+    OpenFoamHandler,
+    find_mesh_parameters,
+    read_internal_fields,
+    write_internal_fields,
+)
 from src.utility import get_root
 
 
+def fake_run_stage(handler, stage, command):
+    """
+    Stand-in for the OpenFOAM tools: the solve stage writes probe files whose last line
+    holds the variant's UIn, the worker's process id and the case it ran in.
+    """
+    handler.stage_timings[stage].append(0.0)
+    if stage == "prepare":
+        parameter_file = command[2].split("=", 1)[1]
+        with open(parameter_file, encoding="utf-8") as parameters:
+            handler.fake_parameters = dict(
+                line.rstrip(";\n").split() for line in parameters
+            )
+    elif stage == "solve":
+        probes = os.path.join(handler.case_path, "postProcessing", "probes", "0")
+        os.makedirs(probes, exist_ok=True)
+        for name in ("p", "mag(U)"):
+            with open(os.path.join(probes, name), "w", encoding="utf-8") as probe:
+                probe.write(
+                    f"1 {handler.fake_parameters['UIn']} {os.getpid()} "
+                    f"{handler.case_path}\n"
+                )
+
+
+def fake_solve_to_time(handler, stage, command):
+    """
+    Like fake_run_stage, but the solve stage also writes a final time directory 75 whose
+    velocity field holds the variant's UIn.
+    """
+    fake_run_stage(handler, stage, command)
+    if stage == "solve":
+        final_dir = os.path.join(handler.case_path, "75")
+        shutil.copytree(
+            os.path.join(handler.case_path, "0"), final_dir, dirs_exist_ok=True
+        )
+        velocity = handler.fake_parameters["UIn"]
+        write_internal_fields(
+            final_dir, {"U": f"internalField   uniform ({velocity} 0 0);"}
+        )
+
+
 class TestOpenFoamHandler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.case_path = os.path.join(self.tmp_dir, "case")
+        shutil.copytree(
+            os.path.join(get_root(), "test", "test_openfoam_case"), self.case_path
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
     def test_simulate(self):
         """
         Test the simulate method of OpenFoamHandler.
@@ -30,6 +88,184 @@ class TestOpenFoamHandler(unittest.TestCase):
         self.assertIn("OUT_p_1", results.columns)
         self.assertIn("OUT_magU_1", results.columns)
 
+    def test_find_mesh_parameters(self):
+        """
+        Only parameters used by templates under system/ or constant/ affect the mesh.
+        """
+        case_path = os.path.join(get_root(), "test", "test_openfoam_case")
+        self.assertEqual(find_mesh_parameters(case_path, ["UIn", "p"]), set())
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            case_copy = os.path.join(tmp_dir, "case")
+            shutil.copytree(case_path, case_copy)
+            with open(
+                os.path.join(case_copy, "system", "blockMeshDict.template"),
+                "w",
+                encoding="utf-8",
+            ) as template:
+                template.write("scale |-p / 1000-|;\n")
+
+            self.assertEqual(find_mesh_parameters(case_copy, ["UIn", "p"]), {"p"})
+
+    def test_mesh_reuse_stages(self):
+        """
+        The mesher only runs when the mesh-affecting parameters change.
+        """
+        handler = OpenFoamHandler(pd.DataFrame())
+        handler.case_path = self.case_path
+        handler.mesh_parameters = {"p"}
+        main_params_dict = handler.config["main"]
+        output_dict = handler.config["simulation_output"]
+
+        with mock.patch.object(
+            OpenFoamHandler, "_run_stage", autospec=True, side_effect=fake_run_stage
+        ) as run_stage:
+            for index, (velocity, pressure) in enumerate(
+                [(1, 1e5), (2, 1e5), (2, 2e5)]
+            ):
+                run_stage.reset_mock()
+                handler._process_variant(  # pylint: disable=protected-access
+                    index,
+                    pd.Series({"UIn": velocity, "p": pressure}),
+                    main_params_dict,
+                    output_dict,
+                )
+                stages = [call.args[1] for call in run_stage.call_args_list]
+                prepare = run_stage.call_args_list[1].args[2]
+                if index == 1:
+                    self.assertEqual(stages, ["clear", "prepare", "solve"])
+                    self.assertIn("--no-clear", prepare)
+                else:
+                    self.assertEqual(stages, ["clear", "prepare", "mesh", "solve"])
+                    self.assertNotIn("--no-clear", prepare)
+
+        self.assertEqual(len(handler.stage_timings["mesh_reused"]), 1)
+
+    @mock.patch.object(OpenFoamHandler, "_run_stage", fake_run_stage)
+    def test_simulate_parallel(self):
+        """
+        Pool workers each solve in their own case copy and results keep the row order.
+        """
+        velocities = [4.0, 1.0, 3.0, 2.0, 5.0, 0.5]
+        input_data = pd.DataFrame(
+            {"UIn": velocities, "p": [101325] * 6}, index=[5, 3, 0, 4, 1, 2]
+        )
+        handler = OpenFoamHandler(input_data)
+        handler.case_path = self.case_path
+        workspace = os.path.join(self.tmp_dir, "workers")
+        handler.config["parallel"] = {"workers": 2, "workspace": workspace}
+
+        results = handler.simulate()
+
+        self.assertEqual(list(results.index), [5, 3, 0, 4, 1, 2])
+        self.assertEqual(list(results["OUT_p_1"].astype(float)), velocities)
+        self.assertEqual(len(handler.stage_timings["solve"]), 6)
+
+        case_by_worker = {}
+        for pid, case_path in zip(results["OUT_p_2"], results["OUT_p_3"]):
+            self.assertTrue(case_path.startswith(workspace + os.sep))
+            self.assertEqual(case_by_worker.setdefault(pid, case_path), case_path)
+        self.assertEqual(len(set(case_by_worker.values())), len(case_by_worker))
+        self.assertFalse(os.path.exists(os.path.join(self.case_path, "postProcessing")))
+        self.assertEqual(os.listdir(workspace), [])
+
+    def test_internal_fields_round_trip(self):
+        """
+        Uniform and nonuniform internal fields are replaced without touching the rest.
+        """
+        time_dir = os.path.join(self.case_path, "0")
+        with open(os.path.join(time_dir, "U"), encoding="utf-8") as field_file:
+            original = field_file.read()
+
+        uniform = read_internal_fields(time_dir, ["U", "p", "missing"])
+        self.assertEqual(uniform["U"], "internalField   uniform (0 0 0);")
+        self.assertEqual(set(uniform), {"U", "p"})
+
+        nonuniform = (
+            "internalField   nonuniform List<vector> \n3\n(\n(1 0 0)\n"
+            "(0.5 -0.1 0)\n(2e-03 0 1)\n)\n;"
+        )
+        write_internal_fields(time_dir, {"U": nonuniform})
+        self.assertEqual(read_internal_fields(time_dir, ["U"]), {"U": nonuniform})
+        with open(os.path.join(time_dir, "U"), encoding="utf-8") as field_file:
+            self.assertEqual(
+                field_file.read(), original.replace(uniform["U"], nonuniform)
+            )
+
+        write_internal_fields(time_dir, uniform)
+        with open(os.path.join(time_dir, "U"), encoding="utf-8") as field_file:
+            self.assertEqual(field_file.read(), original)
+
+    def test_seed_from_nearest(self):
+        """
+        The nearest solved variant, in parameters scaled by their spread, seeds the case.
+        """
+        handler = OpenFoamHandler(pd.DataFrame())
+        handler.case_path = self.case_path
+        # pylint: disable=protected-access
+        handler._parameter_scale = {"UIn": 2.0, "p": 1e6}
+        handler._solved_fields[(self.case_path, ())] = [
+            ({"UIn": 1.0, "p": 1e5}, {"U": "internalField   uniform (1 0 0);"}),
+            ({"UIn": 3.0, "p": 1.5e5}, {"U": "internalField   uniform (3 0 0);"}),
+        ]
+
+        # Unscaled, the pressure difference would make the first variant the nearest
+        seeded = handler._seed_from_nearest(pd.Series({"UIn": 2.9, "p": 1e5}), ())
+
+        self.assertTrue(seeded)
+        fields = read_internal_fields(os.path.join(self.case_path, "0"), ["U"])
+        self.assertEqual(fields["U"], "internalField   uniform (3 0 0);")
+        self.assertFalse(handler._seed_from_nearest(pd.Series({"UIn": 1.0}), ("x",)))
+
+    def test_warm_start_without_previous_result(self):
+        """
+        The first variant starts from the initial fields and later ones are seeded;
+        iterations are counted in time steps of the case's deltaT.
+        """
+        control_dict = os.path.join(self.case_path, "system", "controlDict")
+        with open(control_dict, encoding="utf-8") as control_file:
+            control = control_file.read()
+        with open(control_dict, "w", encoding="utf-8") as control_file:
+            control_file.write(control.replace("deltaT          1;", "deltaT 0.5;"))
+
+        handler = OpenFoamHandler(pd.DataFrame())
+        handler.case_path = self.case_path
+        initial_dir = os.path.join(self.case_path, "0")
+        initial = read_internal_fields(initial_dir, ["U"])
+
+        with (
+            mock.patch.object(
+                OpenFoamHandler,
+                "_run_stage",
+                autospec=True,
+                side_effect=fake_solve_to_time,
+            ),
+            mock.patch.object(
+                OpenFoamHandler, "_warm_start_enabled", return_value=True
+            ),
+        ):
+            for index, velocity in enumerate([1.0, 2.0]):
+                handler._process_variant(  # pylint: disable=protected-access
+                    index,
+                    pd.Series({"UIn": velocity, "p": 1e5}),
+                    handler.config["main"],
+                    handler.config["simulation_output"],
+                )
+                if index == 0:
+                    self.assertEqual(read_internal_fields(initial_dir, ["U"]), initial)
+
+        self.assertEqual(
+            read_internal_fields(initial_dir, ["U"]),
+            {"U": "internalField   uniform (1.0 0 0);"},
+        )
+        self.assertEqual(
+            handler.solver_iterations,
+            {
+                0: {"iterations": 150, "warm_start": False},
+                1: {"iterations": 150, "warm_start": True},
+            },
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,185 @@
+import io
+import os
+import shutil
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from src.components import mlflow_utils
+from src.components.mlflow_utils import ModelCache, ModelPromotion
+from src.components.table_io import iter_table, read_table, write_table
+from src.sagemaker import predict
+
+
+def train_model(classes):
+    rng = np.random.default_rng(0)
+    features = pd.DataFrame(rng.random((60, 3)), columns=["a", "b", "c"])
+    model = RandomForestClassifier(n_estimators=5, random_state=0)
+    return model.fit(features, np.resize(classes, len(features)))
+
+
+class TestInvocations(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {"a": [0.1, 0.5, 0.9], "b": [0.2, 0.4, 0.6], "c": [0.3, 0.7, 0.1]}
+        )
+        self.use_model(train_model([0, 1, 2]))
+
+        patcher = mock.patch.object(predict, "_initialized", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = predict.app.test_client()
+
+    def use_model(self, model):
+        self.model = model
+        cache = mock.Mock()
+        cache.get.return_value = (model, types.SimpleNamespace(version="1"))
+        patcher = mock.patch.object(predict, "model_cache", cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, data, content_type, accept=None):
+        headers = {"Accept": accept} if accept else {}
+        return self.client.post(
+            "/invocations", data=data, content_type=content_type, headers=headers
+        )
+
+    def expected(self, df):
+        return pd.concat([df, predict.score(self.model, df)], axis=1)
+
+    def test_round_trips(self):
+        """
+        CSV, Parquet and npy requests are answered in the accepted format.
+        """
+        expected = self.expected(self.df)
+
+        response = self.post(self.df.to_csv(index=False), "text/csv")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/csv")
+        pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(response.data)), expected)
+
+        buffer = io.BytesIO()
+        write_table(self.df, buffer, "parquet")
+        response = self.post(
+            buffer.getvalue(), "application/x-parquet", "application/x-parquet"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-parquet")
+        pd.testing.assert_frame_equal(
+            read_table(io.BytesIO(response.data), "response.parquet"), expected
+        )
+
+        buffer = io.BytesIO()
+        np.save(buffer, self.df.to_numpy(), allow_pickle=False)
+        response = self.post(
+            buffer.getvalue(), "application/x-npy", "application/x-npy"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-npy")
+        np.testing.assert_array_equal(
+            np.load(io.BytesIO(response.data), allow_pickle=False),
+            expected.to_numpy(dtype=np.float64),
+        )
+
+    def test_unsupported_content_type(self):
+        """
+        Request bodies in other formats are rejected with 415.
+        """
+        response = self.post(self.df.to_json(), "application/json")
+        self.assertEqual(response.status_code, 415)
+
+    def test_npy_not_acceptable(self):
+        """
+        npy responses for text features or labels are rejected with 406 before scoring.
+        """
+        with mock.patch.object(predict.batcher, "submit") as submit:
+            response = self.post(
+                self.df.assign(c=["x", "y", "z"]).to_csv(index=False),
+                "text/csv",
+                "application/x-npy",
+            )
+            self.assertEqual(response.status_code, 406)
+
+            self.use_model(train_model(["low", "mid", "high"]))
+            response = self.post(
+                self.df.to_csv(index=False), "text/csv", "application/x-npy"
+            )
+            self.assertEqual(response.status_code, 406)
+
+            submit.assert_not_called()
+
+        response = self.post(self.df.to_csv(index=False), "text/csv", "text/csv")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Prob_Class_high", response.data.decode())
+
+
+class TestPreload(unittest.TestCase):
+    def setUp(self):
+        self.cache = ModelCache(refresh_interval=60)
+        self.addCleanup(self.cache.stop)
+        for target, attribute, kwargs in [
+            (predict, "model_cache", {"new": self.cache}),
+            (predict, "_initialized", {"new": False}),
+            (predict, "setup_mlflow", {}),
+            (mlflow_utils.mlflow, "MlflowClient", {}),
+            (
+                ModelPromotion,
+                "find_production_model",
+                {"side_effect": ConnectionError("MLflow unreachable")},
+            ),
+        ]:
+            patcher = mock.patch.object(target, attribute, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_failed_preload_reports_degraded(self):
+        """
+        A model that cannot be loaded before the fork leaves the worker up and degraded.
+        """
+        predict.preload_model()
+        predict.init_worker()
+        response = predict.app.test_client().get("/ping")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["status"], "degraded")
+        self.assertEqual(
+            response.json["model_cache"]["last_error"], "MLflow unreachable"
+        )
+
+
+class TestPredictStream(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(1)
+        self.df = pd.DataFrame(rng.random((250, 3)), columns=["a", "b", "c"])
+        self.model = train_model([0, 1, 2])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_chunks_match_single_batch(self):
+        """
+        Scoring in chunks writes the same table as scoring every row at once.
+        """
+        expected = pd.concat([self.df, predict.score(self.model, self.df)], axis=1)
+        input_path = os.path.join(self.tmp_dir, "input.csv")
+        self.df.to_csv(input_path, index=False)
+
+        for extension in ("csv", "parquet"):
+            output_path = os.path.join(self.tmp_dir, f"predictions.{extension}")
+            stats = predict.predict_stream(
+                iter_table(input_path, chunksize=64), output_path, model=self.model
+            )
+
+            self.assertEqual(stats["rows"], len(self.df))
+            pd.testing.assert_frame_equal(read_table(output_path), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
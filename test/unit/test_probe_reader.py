@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.components.probe_reader import read_last_line, read_probe_series
+
+PROBE_FILE = """# Probe 0 (0.1 0 0)
+# Probe 1 (0.2 0 0)
+#       Probe             0             1
+#        Time
+1    (1 0 0)    (2 0 0)
+2    (1.5 0 0)  (2.5 0.1 0)
+3    (1.75 0 0) (2.75 0.2 0)
+"""
+
+
+class TestProbeReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "U")
+        with open(self.path, "w", encoding="utf-8") as probe_file:
+            probe_file.write(PROBE_FILE)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_read_last_line(self):
+        """
+        The final record is found regardless of the block size.
+        """
+        for block_size in (1, 7, 8192):
+            self.assertEqual(
+                read_last_line(self.path, block_size=block_size),
+                "3    (1.75 0 0) (2.75 0.2 0)",
+            )
+
+    def test_read_last_line_matches_full_scan(self):
+        """
+        Tail reading returns the same line as iterating over the whole file.
+        """
+        path = os.path.join(self.tmp_dir, "p")
+        with open(path, "w", encoding="utf-8") as probe_file:
+            probe_file.write("# Time p\n")
+            for step in range(1, 5001):
+                probe_file.write(f"{step} {step * 0.5} {step * 0.25}\n")
+
+        with open(path, encoding="utf-8") as probe_file:
+            last_line = probe_file.readlines()[-1]
+        self.assertEqual(read_last_line(path), last_line.strip())
+
+    def test_read_probe_series(self):
+        """
+        The full series is parsed into one row per time step with vectors flattened.
+        """
+        series = read_probe_series(self.path)
+
+        self.assertEqual(series.shape, (3, 7))
+        np.testing.assert_array_equal(series[:, 0], [1, 2, 3])
+        np.testing.assert_array_equal(series[2], [3, 1.75, 0, 0, 2.75, 0.2, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
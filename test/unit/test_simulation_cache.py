@@ -0,0 +1,119 @@
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from src.components.simulation_cache import SimulationCache, hash_case_template
+from src.utility import get_root
+
+
+class TestSimulationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.case_path = os.path.join(self.tmp_dir, "case")
+        shutil.copytree(
+            os.path.join(get_root(), "test", "test_openfoam_case"), self.case_path
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def make_cache(self, max_entries=10):
+        return SimulationCache(
+            os.path.join(self.tmp_dir, "cache"),
+            self.case_path,
+            {"solver": "simpleFoam"},
+            max_entries,
+        )
+
+    def test_hit_and_miss(self):
+        """
+        Stored results are returned for the same parameters only.
+        """
+        cache = self.make_cache()
+        row = pd.Series({"UIn": 1.0, "p": 101325})
+
+        self.assertIsNone(cache.get(row))
+        cache.put(row, {"OUT_p_1": "0.5"})
+
+        self.assertEqual(cache.get(row), {"OUT_p_1": "0.5"})
+        self.assertIsNone(cache.get(pd.Series({"UIn": 2.0, "p": 101325})))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_template_hash_ignores_results(self):
+        """
+        Solver output does not change the template hash, template edits do.
+        """
+        original = hash_case_template(self.case_path)
+
+        os.makedirs(os.path.join(self.case_path, "postProcessing", "probes", "0"))
+        os.makedirs(os.path.join(self.case_path, "500"))
+        self.assertEqual(hash_case_template(self.case_path), original)
+
+        with open(
+            os.path.join(self.case_path, "0.org", "p.template"), "a", encoding="utf-8"
+        ) as template:
+            template.write("// changed\n")
+        self.assertNotEqual(hash_case_template(self.case_path), original)
+
+    def render_variant(self, params):
+        """
+        Render the 0.org templates the way pyFoamPrepareCase does for a variant.
+        """
+        zero_org = os.path.join(self.case_path, "0.org")
+        for name in os.listdir(zero_org):
+            if not name.endswith(".template"):
+                continue
+            with open(os.path.join(zero_org, name), encoding="utf-8") as template:
+                content = re.sub(
+                    r"\|-(\w+)-\|", lambda m: str(params[m.group(1)]), template.read()
+                )
+            with open(
+                os.path.join(zero_org, name[: -len(".template")]), "w", encoding="utf-8"
+            ) as rendered:
+                rendered.write(content)
+
+    def test_template_hash_ignores_rendered_files(self):
+        """
+        Files rendered from a template do not tie the hash to the last variant run.
+        """
+        self.render_variant({"UIn": 1.0, "p": 101325})
+        first = hash_case_template(self.case_path)
+        namespace = self.make_cache().namespace
+        self.render_variant({"UIn": 7.5, "p": 2e5})
+
+        self.assertEqual(hash_case_template(self.case_path), first)
+        self.assertEqual(self.make_cache().namespace, namespace)
+
+    def test_eviction(self):
+        """
+        Eviction keeps at most max_entries entries.
+        """
+        cache = self.make_cache(max_entries=2)
+        for velocity in range(4):
+            cache.put(pd.Series({"UIn": float(velocity), "p": 1.0}), {})
+
+        self.assertEqual(cache.evict(), 2)
+        self.assertEqual(len(os.listdir(os.path.join(self.tmp_dir, "cache"))), 2)
+
+    def test_eviction_only_after_writes(self):
+        """
+        The store is not scanned unless writes pushed it over the limit.
+        """
+        cache = self.make_cache(max_entries=2)
+        for velocity in range(2):
+            cache.put(pd.Series({"UIn": float(velocity), "p": 1.0}), {})
+
+        with mock.patch.object(type(cache.store), "evict") as store_evict:
+            self.assertEqual(cache.evict(), 0)
+            self.assertEqual(self.make_cache(max_entries=1).evict(), 0)
+        store_evict.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.components.table_io import iter_table, read_table, write_table
+
+
+class TestTableIO(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "UIn": [1, 2, 3],
+                "p": [0.5, np.nan, 1.5],
+                "OUT_p_1": ["0.1", "0.2", "0.3"],
+                "label": ["a", "b", "c"],
+            }
+        )
+
+    def test_parquet_matches_csv(self):
+        """
+        Parquet and CSV round-trips produce the same frame.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            frames = []
+            for extension in ("csv", "parquet"):
+                path = os.path.join(tmp_dir, f"chunk_001.{extension}")
+                write_table(self.df, path, extension)
+                frames.append(read_table(path))
+
+        pd.testing.assert_frame_equal(frames[0], frames[1])
+        self.assertEqual(frames[1]["OUT_p_1"].dtype, np.float64)
+        self.assertTrue(np.isnan(frames[1].loc[1, "p"]))
+
+    def test_iter_parquet_stream(self):
+        """
+        A non-seekable Parquet body is read in chunks of the requested size.
+        """
+        buffer = io.BytesIO()
+        write_table(self.df, buffer, "parquet")
+        buffer.seek(0)
+
+        chunks = list(iter_table(buffer, "simulated/run/job_1.parquet", chunksize=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        pd.testing.assert_frame_equal(
+            pd.concat(chunks, ignore_index=True), read_table(self._csv_copy())
+        )
+
+    def _csv_copy(self):
+        buffer = io.BytesIO()
+        write_table(self.df, buffer, "csv")
+        buffer.seek(0)
+        return io.TextIOWrapper(buffer, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,381 @@
+import json
+import os
+import shutil
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+import optuna
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold
+
+from src.sagemaker import train
+from src.sagemaker.train import ModelTrainer, TrainTestData, precompute_folds
+
+
+def make_data(rows=150, n_features=4, seed=0) -> TrainTestData:
+    """
+    Random features with three classes that depend on the first feature.
+    """
+    rng = np.random.default_rng(seed)
+    x = rng.random((rows, n_features))
+    y = np.digitize(x[:, 0], [1 / 3, 2 / 3])
+    split = int(rows * 0.8)
+    return TrainTestData(
+        x[:split], x[split:], y[:split], y[split:], [f"f{i}" for i in range(n_features)]
+    )
+
+
+class StubTrial:
+    """
+    Optuna trial stand-in suggesting the low end of every search range and
+    recording its reports.
+    """
+
+    def __init__(self, prune_after=None):
+        self.prune_after = prune_after
+        self.reports = []
+
+    def suggest_int(self, _name, low, _high):
+        """
+        The lower bound of the integer range.
+        """
+        return low
+
+    def suggest_float(self, _name, low, _high):
+        """
+        The lower bound of the float range.
+        """
+        return low
+
+    def suggest_categorical(self, _name, choices):
+        """
+        The first of the choices.
+        """
+        return choices[0]
+
+    def report(self, value, step):
+        """
+        Record an intermediate value.
+        """
+        self.reports.append((step, value))
+
+    def should_prune(self):
+        """
+        Whether `prune_after` reports were made.
+        """
+        return self.prune_after is not None and len(self.reports) >= self.prune_after
+
+
+class TestFolds(unittest.TestCase):
+    def setUp(self):
+        self.data = make_data()
+
+    def test_folds_match_stratified_k_fold(self):
+        """
+        Precomputed folds hold the rows of StratifiedKFold's splits, as float32.
+        """
+        x, y = self.data.x_train, self.data.y_train
+        folds = precompute_folds(x, y)
+        splits = list(
+            StratifiedKFold(n_splits=5, shuffle=True, random_state=42).split(x, y)
+        )
+
+        self.assertEqual(len(folds), len(splits))
+        for fold, (train_idx, val_idx) in zip(folds, splits):
+            np.testing.assert_array_equal(fold.x_train, x[train_idx].astype(np.float32))
+            np.testing.assert_array_equal(fold.y_train, y[train_idx])
+            np.testing.assert_array_equal(fold.x_val, x[val_idx].astype(np.float32))
+            np.testing.assert_array_equal(fold.y_val, y[val_idx])
+            self.assertTrue(fold.x_train.flags.f_contiguous)
+            self.assertTrue(fold.x_val.flags.c_contiguous)
+
+    def test_folds_built_only_for_a_study(self):
+        """
+        Folds are split when a study starts, not when the trainer is created.
+        """
+        with mock.patch.object(
+            train, "precompute_folds", wraps=precompute_folds
+        ) as precompute:
+            trainer = ModelTrainer(self.data, n_trials=2, n_jobs=1, fold_workers=1)
+            self.assertIsNone(trainer.folds)
+            precompute.assert_not_called()
+
+            trainer.run_study()
+            trainer.run_study()
+
+        precompute.assert_called_once()
+        self.assertEqual(len(trainer.folds), 5)
+
+
+class TestObjective(unittest.TestCase):
+    def setUp(self):
+        self.trainer = ModelTrainer(make_data(), n_trials=1, n_jobs=1, fold_workers=2)
+        self.trainer.folds = precompute_folds(
+            self.trainer.data.x_train, self.trainer.data.y_train
+        )
+        self.params = {
+            **train.suggest_params(StubTrial()),
+            "random_state": 42,
+        }
+
+    def test_pruned_after_first_wave(self):
+        """
+        A trial pruned after its first wave stops before fitting the other folds.
+        """
+        trial = StubTrial(prune_after=1)
+        with mock.patch.object(
+            self.trainer, "fit_fold", wraps=self.trainer.fit_fold
+        ) as fit_fold:
+            with self.assertRaises(optuna.TrialPruned):
+                self.trainer.objective(trial)
+
+        self.assertEqual(fit_fold.call_count, 2)
+        self.assertEqual([step for step, _ in trial.reports], [2])
+
+    def test_completed_trial_reports_mean_of_all_folds(self):
+        """
+        A completed trial reports the running mean after every wave and returns the
+        mean F1 over all folds.
+        """
+        trial = StubTrial()
+        score = self.trainer.objective(trial)
+
+        scores = [
+            self.trainer.fit_fold(self.params, fold) for fold in self.trainer.folds
+        ]
+        self.assertAlmostEqual(score, np.mean(scores))
+        self.assertEqual([step for step, _ in trial.reports], [2, 4, 5])
+        for step, value in trial.reports:
+            self.assertAlmostEqual(value, np.mean(scores[:step]))
+
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.data = make_data()
+        self.base_model = RandomForestClassifier(n_estimators=3, random_state=0)
+        self.base_model.fit(self.data.x_train, self.data.y_train)
+
+        patcher = mock.patch.object(train, "ModelPromotion")
+        self.promotion = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.promotion.get_production_model.return_value = (
+            types.SimpleNamespace(run_id="production", version="7"),
+            None,
+        )
+        self.set_runs_since_full("0")
+
+        self.mocks = {}
+        for target, attribute, kwargs in [
+            (train.mlflow.sklearn, "load_model", {"return_value": self.base_model}),
+            (
+                train,
+                "load_run_baseline",
+                {
+                    "return_value": {
+                        "histogram": {},
+                        "feature_names": self.data.feature_names,
+                    }
+                },
+            ),
+        ]:
+            patcher = mock.patch.object(target, attribute, **kwargs)
+            self.mocks[attribute] = patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def set_runs_since_full(self, runs):
+        """
+        Tag the production model's run with the incremental runs since a full retrain.
+        """
+        self.promotion.client.get_run.return_value = types.SimpleNamespace(
+            info=types.SimpleNamespace(run_id="production"),
+            data=types.SimpleNamespace(tags={train.RUNS_SINCE_FULL_TAG: runs}),
+        )
+
+    def test_extend_model_adds_trees(self):
+        """
+        The forest grows by incremental_trees and keeps its fitted trees.
+        """
+        trainer = ModelTrainer(self.data, n_trials=1, n_jobs=1, fold_workers=1)
+        trainer.incremental_trees = 4
+        old_trees = list(self.base_model.estimators_)
+
+        model = trainer.extend_model(self.base_model)
+
+        self.assertEqual(model.n_estimators, 7)
+        self.assertEqual(len(model.estimators_), 7)
+        for old, kept in zip(old_trees, model.estimators_):
+            self.assertIs(old, kept)
+        self.assertFalse(model.warm_start)
+
+    def test_extends_production_model(self):
+        """
+        The production model, its baseline and the run count are returned to extend.
+        """
+        model, runs_since_full, baseline = train.load_incremental_base(self.data)
+
+        self.assertIs(model, self.base_model)
+        self.assertEqual(runs_since_full, 1)
+        self.assertEqual(baseline["feature_names"], self.data.feature_names)
+
+    def test_no_production_model(self):
+        """
+        Without a production model the run falls back to a full retrain.
+        """
+        self.promotion.get_production_model.return_value = (None, None)
+
+        self.assertEqual(train.load_incremental_base(self.data), (None, 0, None))
+        self.mocks["load_model"].assert_not_called()
+
+    def test_full_retrain_due(self):
+        """
+        Every FULL_RETRAIN_EVERY runs the production model is not extended.
+        """
+        self.set_runs_since_full("4")
+        with mock.patch.dict(os.environ, {"FULL_RETRAIN_EVERY": "5"}):
+            self.assertEqual(train.load_incremental_base(self.data), (None, 0, None))
+        self.mocks["load_model"].assert_not_called()
+
+
+class TestFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_path = os.path.join(self.tmp_dir, "train.csv")
+        with open(self.data_path, "w") as f:
+            f.write("a,b,target\n0.1,0.2,0\n0.3,0.4,1\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_stable_for_unchanged_inputs(self):
+        """
+        The same data, search space and code give the same fingerprint.
+        """
+        self.assertEqual(
+            train.training_fingerprint(self.data_path),
+            train.training_fingerprint(self.data_path),
+        )
+
+    def test_changes_with_data_or_params(self):
+        """
+        Changing a data byte or the search space changes the fingerprint.
+        """
+        fingerprint = train.training_fingerprint(self.data_path)
+
+        with mock.patch.dict(train.SEARCH_SPACE, {"n_estimators": ("int", 2, 20)}):
+            self.assertNotEqual(train.training_fingerprint(self.data_path), fingerprint)
+
+        with open(self.data_path, "a") as f:
+            f.write("0.5,0.6,1\n")
+        self.assertNotEqual(train.training_fingerprint(self.data_path), fingerprint)
+
+    def test_no_default_experiment(self):
+        """
+        A tracking server without the "Default" experiment has no cached run.
+        """
+        with mock.patch.object(train.mlflow.tracking, "MlflowClient") as client_class:
+            client = client_class.return_value
+            client.get_experiment_by_name.return_value = None
+
+            self.assertIsNone(train.find_run_by_fingerprint("abc"))
+            client.search_runs.assert_not_called()
+
+
+class TestRunTraining(unittest.TestCase):
+    def setUp(self):
+        self.previous_run = types.SimpleNamespace(
+            info=types.SimpleNamespace(run_id="previous"),
+            data=types.SimpleNamespace(
+                tags={train.BEST_PARAMS_TAG: json.dumps({"max_depth": 4})}
+            ),
+        )
+        self.mocks = {}
+        for attribute in [
+            "find_training_input",
+            "training_fingerprint",
+            "setup_mlflow",
+            "find_run_by_fingerprint",
+            "load_data",
+            "load_incremental_base",
+            "ModelTrainer",
+        ]:
+            patcher = mock.patch.object(train, attribute)
+            self.mocks[attribute] = patcher.start()
+            self.addCleanup(patcher.stop)
+        self.mocks["training_fingerprint"].return_value = "abc"
+
+    def run_training(self, cache_mode, previous_run=None, training_mode="full"):
+        """
+        Run the training job with `previous_run` as the fingerprint match.
+        """
+        self.mocks["find_run_by_fingerprint"].return_value = previous_run
+        environ = {"TRAINING_CACHE_MODE": cache_mode, "TRAINING_MODE": training_mode}
+        with mock.patch.dict(os.environ, environ):
+            train.run_training()
+
+    def train_kwargs(self):
+        """
+        Keyword arguments of the single train_and_log call.
+        """
+        trainer = self.mocks["ModelTrainer"].return_value
+        trainer.train_and_log.assert_called_once()
+        return trainer.train_and_log.call_args.kwargs
+
+    def test_skip_on_hit(self):
+        """
+        A finished run with the same fingerprint ends the job before loading data.
+        """
+        self.run_training("skip", self.previous_run)
+
+        self.mocks["find_run_by_fingerprint"].assert_called_once_with("abc")
+        self.mocks["load_data"].assert_not_called()
+        self.mocks["ModelTrainer"].assert_not_called()
+
+    def test_reuse_params_on_hit(self):
+        """
+        reuse_params trains with the best params tagged on the previous run.
+        """
+        self.run_training("reuse_params", self.previous_run)
+
+        kwargs = self.train_kwargs()
+        self.assertEqual(kwargs["best_params"], {"max_depth": 4})
+        self.assertEqual(kwargs["reused_run_id"], "previous")
+        self.assertEqual(kwargs["fingerprint"], "abc")
+
+    def test_miss_trains_from_scratch(self):
+        """
+        Without a previous run the search runs and no run is reused.
+        """
+        self.run_training("skip")
+
+        kwargs = self.train_kwargs()
+        self.assertIsNone(kwargs["best_params"])
+        self.assertIsNone(kwargs["reused_run_id"])
+
+    def test_off_never_searches(self):
+        """
+        With the cache off the tracking server is not searched for a previous run.
+        """
+        self.run_training("off")
+
+        self.mocks["find_run_by_fingerprint"].assert_not_called()
+        self.assertIsNone(self.train_kwargs()["best_params"])
+
+    def test_incremental_without_base_model(self):
+        """
+        An incremental run without a model to extend trains a full model.
+        """
+        self.mocks["load_incremental_base"].return_value = (None, 0, None)
+        self.run_training("off", training_mode="incremental")
+
+        self.mocks["load_incremental_base"].assert_called_once()
+        kwargs = self.train_kwargs()
+        self.assertIsNone(kwargs["base_model"])
+        self.assertEqual(kwargs["runs_since_full"], 0)
+        self.assertIsNone(kwargs["base_baseline"])
+
+
+if __name__ == "__main__":
+    unittest.main()